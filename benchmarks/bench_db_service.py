@@ -0,0 +1,266 @@
+"""
+Benchmarks the DbService operations against the in-memory container stand-in.
+
+Each case runs in its own process so its peak RSS is its own. Results are written as JSON and can be compared
+against a stored baseline, failing the run if any case regressed past a threshold:
+
+    python -m benchmarks.bench_db_service --output bench.json
+    python -m benchmarks.bench_db_service --baseline bench.json --threshold 10
+"""
+
+import argparse
+import json
+import logging
+import math
+import subprocess
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError: # Not available on Windows.
+    resource = None
+
+from src.db_service.DbOptions import DbOptions
+from src.db_service.DbService import DbService
+from src.db_service.Query import Query
+from tests.mocks.InMemoryContainer import InMemoryContainer
+
+# The iterations each case runs by default.
+CASES = {
+    "get": 2000,
+    "query_10": 500,
+    "query_1k": 50,
+    "query_100k": 3,
+    "upsert": 2000,
+    "delete": 2000
+}
+
+# The sizes of the query cases' result sets.
+QUERY_SIZES = { "query_10": 10, "query_1k": 1000, "query_100k": 100000 }
+
+# The most iterations traced for allocations. Tracing slows every allocation, so it runs apart from the timed iterations.
+TRACED_ITERATIONS = 5
+
+
+def make_document(i: int, partition_key: str) -> dict:
+    """
+    Builds a document shaped like the app's documents.
+    """
+    return {
+        "id": "transaction::{0}".format(i),
+        "partition_key": partition_key,
+        "account": "account::{0}".format(i % 97),
+        "amount": round(i * 1.37, 2),
+        "currency": "USD",
+        "category": ["groceries", "rent", "travel", "salary"][i % 4],
+        "description": "Transaction number {0} for the benchmark.".format(i),
+        "tags": ["monthly", "card"] if i % 2 else ["one-off"],
+        "created": "2023-01-{0:02d}T12:00:00Z".format(i % 28 + 1)
+    }
+
+
+def setup(case: str, iterations: int) -> tuple:
+    """
+    Builds the service and the operation of a case.
+
+    Returns
+    -------
+    tuple
+        The service and a function running the operation for an iteration.
+    """
+    container = InMemoryContainer(partition_key_path="/partition_key", default_page_size=1000)
+    db_service = DbService(DbOptions("bench_endpoint", "bench_key", "bench_db", "bench_container", partition_key_path="/partition_key"))
+    db_service.container = container
+
+    if case == "get":
+        container.seed(make_document(i, "get") for i in range(1000))
+        return (db_service, lambda i: db_service.get("transaction::{0}".format(i % 1000), "get"))
+
+    if case in QUERY_SIZES:
+        container.seed(make_document(i, case) for i in range(QUERY_SIZES[case]))
+        query = Query("SELECT * FROM c WHERE c.partition_key = @pk", { "@pk": case })
+        return (db_service, lambda i: db_service.query(query))
+
+    if case == "upsert":
+        return (db_service, lambda i: db_service.upsert(make_document(i, "upsert")))
+
+    if case == "delete":
+        container.seed(make_document(i, "delete") for i in range(iterations + 1 + TRACED_ITERATIONS))
+        return (db_service, lambda i: db_service.delete("transaction::{0}".format(i), "delete"))
+
+    raise ValueError("Unknown case '{0}'.".format(case))
+
+
+def percentile(samples: list[int], p: float) -> float:
+    """
+    Gets a percentile of sorted samples by the nearest rank.
+    """
+    rank = max(1, math.ceil(p / 100 * len(samples)))
+    return samples[rank - 1]
+
+
+def peak_rss_bytes() -> int:
+    """
+    Gets the peak resident set size of this process, or 'None' where it cannot be measured.
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return peak if sys.platform == "darwin" else peak * 1024 # Bytes on macOS, kilobytes elsewhere.
+
+
+def run_case(case: str, iterations: int) -> dict:
+    """
+    Runs a case in this process.
+
+    Returns
+    -------
+    dict
+        The ops/sec, p50/p99 latency in microseconds, allocations and peak RSS of the case.
+    """
+    db_service, operation = setup(case, iterations)
+
+    operation(0) # Warm up.
+
+    samples = list()
+    started = time.perf_counter_ns()
+    for i in range(1, iterations + 1):
+        before = time.perf_counter_ns()
+        operation(i)
+        samples.append(time.perf_counter_ns() - before)
+
+    elapsed = time.perf_counter_ns() - started
+    samples.sort()
+
+    traced = min(TRACED_ITERATIONS, iterations)
+
+    tracemalloc.start()
+    allocated = 0
+    peak = 0
+    for i in range(iterations + 1, iterations + 1 + traced):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        operation(i)
+        _, op_peak = tracemalloc.get_traced_memory()
+        allocated += op_peak - before
+        peak = max(peak, op_peak - before)
+
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / (elapsed / 1e9), 2),
+        "p50_us": round(percentile(samples, 50) / 1000, 2),
+        "p99_us": round(percentile(samples, 99) / 1000, 2),
+        "alloc_bytes_per_op": allocated // traced,
+        "alloc_peak_bytes": peak,
+        "peak_rss_bytes": peak_rss_bytes()
+    }
+
+
+def run_isolated(case: str, iterations: int, log_level: str) -> dict:
+    """
+    Runs a case in a process of its own.
+    """
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_db_service", "--case", case, "--iterations", str(iterations), "--log-level", log_level, "--output", "-"],
+        check=True, capture_output=True, text=True)
+
+    return json.loads(output.stdout)[case]
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compares results against a baseline.
+
+    Parameters
+    ----------
+    results: dict
+        The results of this run.
+
+    baseline: dict
+        The results of the baseline run.
+
+    threshold: float
+        The percentage ops/sec may drop or p99 latency may grow before a case counts as regressed.
+
+    Returns
+    -------
+    list[str]
+        A description of each regression.
+    """
+    regressions = list()
+    for case, result in results.items():
+        base = baseline.get(case)
+
+        if base is None:
+            continue
+
+        ops_change = (result["ops_per_sec"] - base["ops_per_sec"]) / base["ops_per_sec"] * 100
+        p99_change = (result["p99_us"] - base["p99_us"]) / base["p99_us"] * 100
+
+        if ops_change < -threshold:
+            regressions.append("{0}: ops/sec {1} -> {2} ({3:+.1f}%)".format(case, base["ops_per_sec"], result["ops_per_sec"], ops_change))
+
+        if p99_change > threshold:
+            regressions.append("{0}: p99 {1}us -> {2}us ({3:+.1f}%)".format(case, base["p99_us"], result["p99_us"], p99_change))
+
+    return regressions
+
+
+def main(argv: list[str]=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks the DbService operations against the in-memory container.")
+    parser.add_argument("--case", action="append", choices=list(CASES), help="A case to run. Every case by default.")
+    parser.add_argument("--iterations", type=int, help="The iterations of each case. Each case's own default by default.")
+    parser.add_argument("--quick", action="store_true", help="Run a tenth of each case's default iterations.")
+    parser.add_argument("--log-level", default="WARNING", help="The level the service logs at. 'WARNING' by default.")
+    parser.add_argument("--output", help="The file to write the results to, or '-' for stdout.")
+    parser.add_argument("--baseline", help="A results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=10.0, help="The percentage a case may regress by. '10' by default.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level)
+    cases = args.case or list(CASES)
+
+    results = dict()
+    for case in cases:
+        iterations = args.iterations or (max(1, CASES[case] // 10) if args.quick else CASES[case])
+
+        if len(cases) == 1 and args.output == "-":
+            results[case] = run_case(case, iterations)
+
+        else:
+            results[case] = run_isolated(case, iterations, args.log_level)
+
+    if args.output == "-":
+        print(json.dumps(results, indent=2))
+        return 0
+
+    for case, result in results.items():
+        print("{0:<12} {1:>12,.0f} ops/s  p50 {2:>10,.1f}us  p99 {3:>10,.1f}us  {4:>12,} B/op  rss {5}".format(
+            case, result["ops_per_sec"], result["p50_us"], result["p99_us"], result["alloc_bytes_per_op"],
+            "n/a" if result["peak_rss_bytes"] is None else "{0:,} B".format(result["peak_rss_bytes"])))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+        for regression in regressions:
+            print("REGRESSION " + regression)
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
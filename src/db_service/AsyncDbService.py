@@ -0,0 +1,494 @@
+import logging
+from src.db_service.DbOptions import DbOptions
+from src.db_service.LogPolicy import LogPolicy
+from src.db_service.Query import Query
+from src.db_service.Serialization import ReturnFormat, serialize
+from src.db_service.SingleFlight import AsyncSingleFlight
+from src.db_service.Throttling import is_throttled
+from src.db_service.Validation import validate_db_options, validate_id_and_partition_key
+
+from azure.cosmos.aio import CosmosClient
+from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosResourceNotFoundError
+
+class AsyncDbService():
+    """
+    Manages connections or operations to the database without blocking the event loop.
+
+    Use as an async context manager so the connection is opened and closed with the service:
+
+        async with AsyncDbService(db_options) as db_service:
+            item = await db_service.get(id, partition_key)
+
+    Attributes
+    ----------
+    db_options: DbOptions
+            Options for configuring the database service.
+
+    logger: logging.Logger
+            The logger this service writes to.
+
+    single_flight: AsyncSingleFlight
+            Shares one request between concurrent identical gets and queries and counts the requests coalesced.
+            'None' if read coalescing is not enabled in the db options.
+
+    Methods
+    -------
+    connect()
+        Connects to the database.
+
+    close()
+        Closes the connection to the database.
+
+    get()
+        Gets an item in the database collection.
+
+    query()
+        Queries the database collection.
+
+    query_iter()
+        Lazily yields the documents of a query.
+
+    query_page()
+        Gets a single page of a query and the token to continue from.
+
+    upsert()
+        Upserts an item in the database collection.
+
+    delete()
+        Deletes an item in the database collection.
+    """
+
+    def __init__(self, db_options: DbOptions, logger: logging.Logger=None):
+        """
+        Parameters
+        ----------
+        db_options: DbOptions
+            Options for configuring the database service.
+
+        logger: logging.Logger
+            The logger this service writes to. The module's logger by default.
+        """
+        self.db_options = db_options
+        self.logger = logger or logging.getLogger(__name__)
+        self.log_policy = db_options.log_policy if db_options is not None else LogPolicy()
+        self.client = None
+        self.db = None
+        self.container = None
+        self.single_flight = None
+        self.__fan_outs = set()
+
+        if db_options is not None and db_options.coalesce_reads:
+            self.single_flight = AsyncSingleFlight()
+
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+
+    async def connect(self) -> None:
+        """
+        Connects to the database.
+
+        Raises
+        ------
+        Exception
+            Raised if an unexpected error occurs.
+        """
+
+        try: # Validate the dbOptions before connecting.
+            self.logger.debug("Validating DB options.")
+
+            validate_db_options(self.db_options)
+
+            self.logger.debug("DB options are valid.")
+
+        except Exception as e:
+            self.logger.exception("connect exception -> Error validating db options: %s", e)
+            raise
+
+        try: # Open database connection.
+            self.logger.info("Opening async connection to database.")
+
+            self.client = CosmosClient(self.db_options.endpoint, self.db_options.key)
+
+            self.logger.info("Database connection opened.")
+
+        except Exception as e:
+            self.logger.exception("connect exception -> Error opening connection to the database: %s", e)
+            raise
+
+        try: # Get database and container.
+            self.logger.info("Getting database %s and container %s.", self.db_options.database_id, self.db_options.container_id)
+
+            self.db = self.client.get_database_client(self.db_options.database_id)
+            self.container = self.db.get_container_client(self.db_options.container_id)
+
+            self.logger.info("Container retrieved.")
+
+        except Exception as e:
+            self.logger.exception("connect exception -> Error getting container: %s", e)
+            await self.close()
+            raise
+
+
+    async def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+        if self.client is not None:
+            self.logger.info("Closing async connection to database.")
+
+            await self.client.close()
+
+        self.client = None
+        self.db = None
+        self.container = None
+
+
+    async def get(self, id: str, partition_key: str, return_format: ReturnFormat=None) -> str:
+        """
+        Gets an item from the database.
+
+        Parameters
+        ----------
+        id: str
+            The unique id of the item being retrieved.
+
+        partition_key: str
+            The partition key used for the database item collection.
+
+        return_format: ReturnFormat
+            The form to return the item in. The db options' return format by default.
+
+        Returns
+        -------
+        str
+            The JSON document of the item in the collection this database is querying,
+            or the document in the requested return format. 'None' if the item is not found.
+
+        Raises
+        ------
+        ValueError
+            Raised if the parameters given are invalid.
+
+        CosmosHttpResponseError
+            Raised if the request is throttled or fails for another reason than the item not being found.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+
+        try:
+            validate_id_and_partition_key(id, partition_key)
+
+        except ValueError as e:
+            self.logger.exception("get exception -> Parameter invalid: %s", e)
+            raise
+
+        try:
+            self.logger.info("Getting item by id: %s", self.log_policy.key(id))
+
+            response = await self.__coalesce(("get", self.db_options.container_id, id, partition_key),
+                                             lambda: self.container.read_item(item=id, partition_key=partition_key))
+
+            self.logger.info("Item retrieved: %s.", self.log_policy.payload(response))
+
+            return serialize(response, return_format or self.db_options.return_format)
+
+        except CosmosHttpResponseError as e:
+            if is_throttled(e): # The item is not known to be missing.
+                self.logger.exception("get exception -> Request throttled: %s", e)
+                raise
+
+            if not isinstance(e, CosmosResourceNotFoundError) and e.status_code != 404:
+                self.logger.exception("get exception -> Error getting item by id: %s", e)
+                raise
+
+            self.logger.warning("Could not get item by id %s with partition key %s.", self.log_policy.key(id), self.log_policy.key(partition_key))
+            return None
+
+        except Exception as e:
+            self.logger.exception("get exception -> Error getting item by id: %s", e)
+            raise
+
+
+    async def query(self, query: Query, return_format: ReturnFormat=None) -> str:
+        """
+        Queries the database with a given search query string.
+
+        Parameters
+        ----------
+        query: Query
+            The query information to use for the query's execution.
+
+        return_format: ReturnFormat
+            The form to return the documents in. The db options' return format by default.
+
+        Returns
+        -------
+        str
+            The JSON documents from the result as a JSON string, or the documents in the requested return format.
+
+        Raises
+        ------
+        TypeError
+            Raised if the query is not defined.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+        async def collect() -> list[dict[str, any]]:
+            return [item async for item in self.query_iter(query)]
+
+        key = None if query is None else ("query", self.db_options.container_id) + query.cache_key()
+        result = await self.__coalesce(key, collect)
+
+        if len(result) > 0:
+            return serialize(result, return_format or self.db_options.return_format)
+
+        self.logger.warning("No results found for given query: %s", self.log_policy.query(query))
+        return None
+
+
+    async def query_iter(self, query: Query):
+        """
+        Lazily yields the documents of a query as they arrive from the database.
+
+        Parameters
+        ----------
+        query: Query
+            The query information to use for the query's execution.
+
+        Returns
+        -------
+        AsyncIterator[dict[str, any]]
+            The documents from the result.
+
+        Raises
+        ------
+        TypeError
+            Raised if the query is not defined.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+        try:
+            if query is None:
+                raise TypeError("'query' must be defined.")
+
+        except TypeError as e:
+            self.logger.exception("query exception -> Parameters are invalid: %s", e)
+            raise
+
+        try:
+            self.logger.info("Querying database with: %s", self.log_policy.query(query))
+
+            items = self.container.query_items(query.query_str, **self.__query_options(query))
+
+            count = 0
+            async for item in items:
+                count += 1
+                yield item
+
+            self.logger.info("%s results retrieved.", count)
+
+        except Exception as e:
+            self.logger.exception("query exception -> Error querying items: %s", e)
+            raise
+
+
+    async def query_page(self, query: Query, page_size: int=None, continuation_token: str=None, return_format: ReturnFormat=None) -> tuple:
+        """
+        Gets a single page of a query and the token to continue from, so a page can be served per request.
+
+        Parameters
+        ----------
+        query: Query
+            The query information to use for the query's execution.
+
+        page_size: int
+            The most documents in the page. The query's 'max_item_count' by default.
+
+        continuation_token: str
+            The opaque token returned with the previous page. 'None' by default, which gets the first page.
+
+        return_format: ReturnFormat
+            The form to return the documents in. The db options' return format by default.
+
+        Returns
+        -------
+        tuple
+            The documents of the page, 'None' if it is empty, and the token of the next page, 'None' if there are no more pages.
+
+        Raises
+        ------
+        TypeError
+            Raised if the query is not defined.
+
+        ValueError
+            Raised if the page size is not positive.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+        try:
+            if query is None:
+                raise TypeError("'query' must be defined.")
+
+            if page_size is not None and page_size <= 0:
+                raise ValueError("'page_size' must be greater than 0.")
+
+        except (TypeError, ValueError) as e:
+            self.logger.exception("query_page exception -> Parameters are invalid: %s", e)
+            raise
+
+        try:
+            self.logger.info("Getting page of query: %s", self.log_policy.query(query))
+
+            options = self.__query_options(query)
+            if page_size is not None:
+                options["max_item_count"] = page_size
+
+            pager = self.container.query_items(query.query_str, **options).by_page(continuation_token)
+
+            page = list()
+            async for p in pager:
+                page = [item async for item in p]
+                break
+
+            next_token = pager.continuation_token
+
+            self.logger.info("%s results retrieved, more pages: %s", len(page), next_token is not None)
+
+            if len(page) == 0:
+                return (None, next_token)
+
+            return (serialize(page, return_format or self.db_options.return_format), next_token)
+
+        except Exception as e:
+            self.logger.exception("query_page exception -> Error querying items: %s", e)
+            raise
+
+
+    async def upsert(self, item: dict[str, any], return_format: ReturnFormat=None) -> str:
+        """
+        Upserts an item in the database.
+
+        Parameters
+        ----------
+        item: dict[str, any]
+            The object's dictionary key value pair.
+
+        return_format: ReturnFormat
+            The form to return the upserted object in. The db options' return format by default.
+
+        Returns
+        -------
+        str
+            The JSON document of the object upserted, or the document in the requested return format.
+
+        Raises
+        ------
+        TypeError
+            Raised if the parameter given is invalid.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+
+        try:
+            if item is None:
+                raise TypeError("The item must be defined.")
+
+        except TypeError as e:
+            self.logger.exception("upsert exception -> Parameter invalid: %s", e)
+            raise
+
+        try:
+            self.logger.info("Upserting item: %s", self.log_policy.payload(item))
+
+            result = await self.container.upsert_item(item)
+
+            self.logger.info("Item upserted: %s", self.log_policy.payload(result))
+
+            return serialize(result, return_format or self.db_options.return_format)
+
+        except Exception as e:
+            self.logger.exception("upsert exception -> Error upserting item: %s", e)
+            raise
+
+
+    async def delete(self, id: str, partition_key: str) -> None:
+        """
+        Deletes an item from the database.
+
+        Parameters
+        ----------
+        id: str
+            The unique id of the item being deleted.
+
+        partition_key: str
+            The partition key used for the database item collection.
+
+        Raises
+        ------
+        ValueError
+            Raised if the parameters given are invalid.
+
+        CosmosResourceNotFoundError
+            Raised if the item cannot be found to be deleted.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+
+        try:
+            validate_id_and_partition_key(id, partition_key)
+
+        except ValueError as e:
+            self.logger.exception("delete exception -> Parameter invalid: %s", e)
+            raise
+
+        try:
+            self.logger.info("Deleting item by id: '%s'", self.log_policy.key(id))
+
+            await self.container.delete_item(item=id, partition_key=partition_key)
+
+            self.logger.info("Item with id '%s' deleted.", self.log_policy.key(id))
+
+        except CosmosResourceNotFoundError as e:
+            self.logger.exception("delete exception -> Could not find item to delete: %s", e)
+            raise
+
+        except Exception as e:
+            self.logger.exception("delete exception -> Error deleting item: %s", e)
+            raise
+
+
+    """
+    Private Methods
+    """
+
+    # Awaits a read, or shares the result of the identical read in flight when read coalescing is enabled.
+    async def __coalesce(self, key: tuple, operation):
+        if self.single_flight is None or key is None:
+            return await operation()
+
+        return await self.single_flight.do(key, operation)
+
+
+    # Builds the options of a query, scoping queries filtering on the partition key to it and logging the
+    # first fan out of every query shape.
+    def __query_options(self, query: Query) -> dict[str, object]:
+        options = query.build_query_options(self.db_options.partition_key_path)
+
+        if options.get("enable_cross_partition_query") and query.fingerprint() not in self.__fan_outs:
+            self.__fan_outs.add(query.fingerprint())
+            self.logger.warning("Query fans out to every partition, scope it to a partition key if it can be: %s", query.statement())
+
+        return options
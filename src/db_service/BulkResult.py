@@ -0,0 +1,93 @@
+class BulkItemResult:
+    """
+    The outcome of a single item in a bulk operation.
+
+    Attributes
+    ----------
+    index: int
+        The position of the item in the bulk request.
+
+    id: str
+        The unique id of the item.
+
+    partition_key: str
+        The partition key of the item.
+
+    result: dict[str, any]
+        The document returned by the database. 'None' if there is none.
+
+    error: Exception
+        The error raised for the item. 'None' if the item succeeded.
+    """
+
+    def __init__(self, index: int, id: str, partition_key: str, result: dict[str, any]=None, error: Exception=None):
+        """
+        Parameters
+        ----------
+        index: int
+            The position of the item in the bulk request.
+
+        id: str
+            The unique id of the item.
+
+        partition_key: str
+            The partition key of the item.
+
+        result: dict[str, any]
+            The document returned by the database. 'None' by default.
+
+        error: Exception
+            The error raised for the item. 'None' by default.
+        """
+        self.index = index
+        self.id = id
+        self.partition_key = partition_key
+        self.result = result
+        self.error = error
+
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+    def __str__(self) -> str:
+        return "'index': {0} | 'id': '{1}' | 'partition_key': '{2}' | 'succeeded': {3}".format(self.index, self.id, self.partition_key, self.succeeded)
+
+
+class BulkResult:
+    """
+    The per-item report of a bulk operation, in the order the items were given.
+
+    Attributes
+    ----------
+    items: list[BulkItemResult]
+        The outcome of every item.
+    """
+
+    def __init__(self, items: list[BulkItemResult]):
+        """
+        Parameters
+        ----------
+        items: list[BulkItemResult]
+            The outcome of every item.
+        """
+        self.items = sorted(items, key=lambda i: i.index)
+
+
+    @property
+    def succeeded(self) -> list[BulkItemResult]:
+        return [i for i in self.items if i.succeeded]
+
+
+    @property
+    def failed(self) -> list[BulkItemResult]:
+        return [i for i in self.items if not i.succeeded]
+
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+    def __str__(self) -> str:
+        return "'total': {0} | 'succeeded': {1} | 'failed': {2}".format(len(self.items), len(self.succeeded), len(self.failed))
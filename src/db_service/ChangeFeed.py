@@ -0,0 +1,384 @@
+import json
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Marks a feed range that has been read up to the present.
+DONE = object()
+
+class CheckpointStore:
+    """
+    Keeps the continuation every feed range of a change feed has been processed up to. Subclass to keep them
+    anywhere, e.g. in a database container.
+
+    Methods
+    -------
+    load(key)
+        Loads the continuation of a feed range.
+
+    save(key, continuation)
+        Saves the continuation of a feed range.
+    """
+
+    def load(self, key: str) -> str:
+        """
+        Loads the continuation of a feed range.
+
+        Parameters
+        ----------
+        key: str
+            Identifies the reader and the feed range.
+
+        Returns
+        -------
+        str
+            The continuation, or 'None' if the feed range has not been processed yet.
+        """
+        return None
+
+
+    def save(self, key: str, continuation: str) -> None:
+        """
+        Saves the continuation of a feed range. Called after every batch the handler processed.
+
+        Parameters
+        ----------
+        key: str
+            Identifies the reader and the feed range.
+
+        continuation: str
+            The continuation to resume the feed range from.
+        """
+        pass
+
+
+class InMemoryCheckpointStore(CheckpointStore):
+    """
+    Keeps checkpoints in memory. They do not survive the process, so readers resume from their start time.
+
+    Methods
+    -------
+    load(key)
+        Loads the continuation of a feed range.
+
+    save(key, continuation)
+        Saves the continuation of a feed range.
+
+    checkpoints()
+        Gets every checkpoint by key.
+    """
+
+    def __init__(self):
+        self.__checkpoints = dict()
+        self.__lock = threading.Lock()
+
+
+    def load(self, key: str) -> str:
+        with self.__lock:
+            return self.__checkpoints.get(key)
+
+
+    def save(self, key: str, continuation: str) -> None:
+        with self.__lock:
+            self.__checkpoints[key] = continuation
+
+
+    def checkpoints(self) -> dict[str, str]:
+        with self.__lock:
+            return dict(self.__checkpoints)
+
+
+class FileCheckpointStore(InMemoryCheckpointStore):
+    """
+    Keeps checkpoints in a JSON file, rewritten atomically on every save so a crash leaves the last checkpoints intact.
+
+    Attributes
+    ----------
+    path: str
+        The path of the file.
+
+    Methods
+    -------
+    load(key)
+        Loads the continuation of a feed range.
+
+    save(key, continuation)
+        Saves the continuation of a feed range.
+
+    checkpoints()
+        Gets every checkpoint by key.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path: str
+            The path of the file. It is created on the first save.
+        """
+        super().__init__()
+        self.path = path
+        self.__lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                for key, continuation in json.load(file).items():
+                    super().save(key, continuation)
+
+
+    def save(self, key: str, continuation: str) -> None:
+        with self.__lock:
+            super().save(key, continuation)
+
+            temp_path = "{0}.tmp".format(self.path)
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self.checkpoints(), file)
+
+            os.replace(temp_path, self.path)
+
+
+class ChangeFeedReader:
+    """
+    Reads the changes of every feed range of a container in parallel and delivers them in batches to a handler.
+
+    Feed ranges are read by a pool of workers into a bounded queue of batches. The handler is called on the
+    thread running the reader, one batch at a time, so it needs no locking. When the handler falls behind the
+    queue fills up and the workers wait, so no more than the pending batches are held in memory. The checkpoint
+    of a feed range is saved after the handler returns, so every change is delivered at least once.
+
+    The feed ranges are read from the container on the first pass and kept in the checkpoint store, and later
+    passes resume those ranges. A range's continuation keeps working after the range splits, while the ranges it
+    split into have no checkpoint and would start over from the start time, replaying or skipping changes.
+
+    Attributes
+    ----------
+    name: str
+        Prefixes the checkpoint keys, so several readers of the same container keep their own progress.
+
+    checkpoint_store: CheckpointStore
+        Keeps the continuation of every feed range.
+
+    batches: int
+        The batches delivered to the handler.
+
+    documents: int
+        The documents delivered to the handler.
+
+    Methods
+    -------
+    run_once()
+        Reads every feed range up to the present and delivers the changes.
+
+    run()
+        Reads the change feed until stopped, waiting the poll interval whenever it is caught up.
+
+    stop()
+        Stops a running reader after its current pass.
+
+    stats()
+        Gets the batches and documents delivered.
+
+    checkpoint_key(feed_range)
+        Gets the key the checkpoint of a feed range is kept under.
+
+    feed_ranges_key()
+        Gets the key the feed ranges of the reader are kept under.
+    """
+
+    def __init__(self, read_feed_ranges, read_pages, handler, checkpoint_store: CheckpointStore=None, name: str="default",
+                 max_workers: int=4, max_pending_batches: int=8, poll_interval: float=5.0, logger: logging.Logger=None):
+        """
+        Parameters
+        ----------
+        read_feed_ranges: Callable[[], list]
+            Gets the feed ranges of the container. Called on the first pass only, the ranges are kept in the
+            checkpoint store after it.
+
+        read_pages: Callable[[any, str], Iterator[tuple[list[dict[str, any]], str]]]
+            Reads the pages of changes of a feed range from a continuation, or from the start if it is 'None',
+            with the continuation following every page.
+
+        handler: Callable[[list[dict[str, any]]], None]
+            Processes a batch of changed documents. An error stops the reader without saving the batch's checkpoint.
+
+        checkpoint_store: CheckpointStore
+            Keeps the continuation of every feed range. An 'InMemoryCheckpointStore' by default.
+
+        name: str
+            Prefixes the checkpoint keys. 'default' by default.
+
+        max_workers: int
+            The most feed ranges read at once. '4' by default.
+
+        max_pending_batches: int
+            The most batches read ahead of the handler. '8' by default.
+
+        poll_interval: float
+            The seconds 'run' waits once it has caught up. '5.0' by default.
+
+        logger: logging.Logger
+            The logger to write to. The module logger by default.
+        """
+        if max_workers <= 0 or max_pending_batches <= 0:
+            raise ValueError("'max_workers' and 'max_pending_batches' must be greater than 0.")
+
+        self.read_feed_ranges = read_feed_ranges
+        self.read_pages = read_pages
+        self.handler = handler
+        self.checkpoint_store = checkpoint_store if checkpoint_store is not None else InMemoryCheckpointStore()
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending_batches = max_pending_batches
+        self.poll_interval = poll_interval
+        self.logger = logger if logger is not None else logging.getLogger(__name__)
+        self.batches = 0
+        self.documents = 0
+        self.__stopped = threading.Event()
+
+
+    def run_once(self) -> int:
+        """
+        Reads every feed range up to the present and delivers the changes to the handler.
+
+        Returns
+        -------
+        int
+            The documents delivered.
+
+        Raises
+        ------
+        Exception
+            Raised if a feed range cannot be read or the handler fails. Checkpoints of the batches delivered are kept.
+        """
+        feed_ranges = self.__feed_ranges()
+        pending = queue.Queue(self.max_pending_batches)
+        stopped = threading.Event()
+
+        self.logger.info("Reading the change feed of %s feed ranges.", len(feed_ranges))
+
+        def put(item: any) -> None:
+            while not stopped.is_set():
+                try:
+                    pending.put(item, timeout=0.05)
+                    return
+
+                except queue.Full:
+                    continue
+
+        def read(feed_range: any) -> None:
+            key = self.checkpoint_key(feed_range)
+
+            try:
+                for documents, continuation in self.read_pages(feed_range, self.checkpoint_store.load(key)):
+                    if stopped.is_set():
+                        return
+
+                    if len(documents) > 0:
+                        put((key, documents, continuation))
+
+            except Exception as e:
+                put(Failure(e))
+
+            finally:
+                put(DONE)
+
+        delivered = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for feed_range in feed_ranges:
+                executor.submit(read, feed_range)
+
+            try:
+                remaining = len(feed_ranges)
+                while remaining > 0:
+                    item = pending.get()
+
+                    if item is DONE:
+                        remaining -= 1
+                        continue
+
+                    if isinstance(item, Failure):
+                        raise item.error
+
+                    key, documents, continuation = item
+
+                    self.handler(documents)
+                    self.checkpoint_store.save(key, continuation)
+
+                    self.batches += 1
+                    self.documents += len(documents)
+                    delivered += len(documents)
+
+            except Exception as e:
+                self.logger.exception("Change feed stopped: %s", e)
+                raise
+
+            finally:
+                stopped.set()
+
+        self.logger.info("%s changed documents delivered.", delivered)
+
+        return delivered
+
+
+    def run(self) -> None:
+        """
+        Reads the change feed until stopped, waiting the poll interval whenever it is caught up.
+
+        Raises
+        ------
+        Exception
+            Raised if a feed range cannot be read or the handler fails.
+        """
+        self.__stopped.clear()
+
+        while not self.__stopped.is_set():
+            if self.run_once() == 0:
+                self.__stopped.wait(self.poll_interval)
+
+
+    def stop(self) -> None:
+        self.__stopped.set()
+
+
+    def stats(self) -> dict[str, int]:
+        return { "batches": self.batches, "documents": self.documents }
+
+
+    def checkpoint_key(self, feed_range: any) -> str:
+        return "{0}:{1}".format(self.name, json.dumps(feed_range, sort_keys=True, default=str))
+
+
+    def feed_ranges_key(self) -> str:
+        return "{0}:feed_ranges".format(self.name)
+
+
+    """
+    Private Methods
+    """
+
+    # Gets the feed ranges kept in the checkpoint store, reading them from the container and keeping them on the
+    # first pass.
+    def __feed_ranges(self) -> list:
+        stored = self.checkpoint_store.load(self.feed_ranges_key())
+
+        if stored is not None:
+            return json.loads(stored)
+
+        feed_ranges = list(self.read_feed_ranges())
+        self.checkpoint_store.save(self.feed_ranges_key(), json.dumps(feed_ranges, default=str))
+
+        return feed_ranges
+
+
+class Failure:
+    """
+    An error reading a feed range, handed to the thread running the reader.
+    """
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
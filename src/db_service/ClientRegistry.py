@@ -0,0 +1,147 @@
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class ClientRegistry:
+    """
+    Process-wide registry of database clients so services connecting to the same account share one client,
+    with its HTTP connection pool and account metadata, instead of each opening their own.
+
+    Clients are reference counted and closed once the last service using them releases them.
+
+    Methods
+    -------
+    acquire(key, factory)
+        Gets the client registered under a key, creating it on first use.
+
+    release(key)
+        Releases a client, closing it once nothing uses it.
+
+    clear()
+        Closes and removes every client.
+    """
+
+    def __init__(self):
+        self.__clients = dict()
+        self.__lock = threading.Lock()
+
+
+    def acquire(self, key: tuple, factory):
+        """
+        Gets the client registered under a key, creating it on first use.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the client. See 'client_key'.
+
+        factory: Callable[[], CosmosClient]
+            Creates the client if none is registered under the key.
+
+        Returns
+        -------
+        CosmosClient
+            The shared client.
+        """
+        with self.__lock:
+            entry = self.__clients.get(key)
+
+            if entry is None:
+                logger.debug("Creating shared database client.")
+
+                entry = [factory(), 0]
+                self.__clients[key] = entry
+
+            entry[1] += 1
+
+            return entry[0]
+
+
+    def release(self, key: tuple) -> None:
+        """
+        Releases a client, closing it once nothing uses it.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the client.
+        """
+        with self.__lock:
+            entry = self.__clients.get(key)
+
+            if entry is None:
+                return
+
+            entry[1] -= 1
+
+            if entry[1] > 0:
+                return
+
+            del self.__clients[key]
+
+        logger.debug("Closing shared database client.")
+        close_client(entry[0])
+
+
+    def clear(self) -> None:
+        """
+        Closes and removes every client.
+        """
+        with self.__lock:
+            entries = list(self.__clients.values())
+            self.__clients.clear()
+
+        for entry in entries:
+            close_client(entry[0])
+
+
+    def __len__(self) -> int:
+        return len(self.__clients)
+
+
+# The registry shared by every service in the process.
+default_registry = ClientRegistry()
+
+
+def client_key(endpoint: str, key: str, *settings) -> tuple:
+    """
+    Builds the registry key of a client. The account key is hashed so it is not held in the registry.
+
+    Parameters
+    ----------
+    endpoint: str
+        The endpoint for the database connection.
+
+    key: str
+        The key for accessing the database.
+
+    settings: any
+        Any connection settings that must match for a client to be shared.
+
+    Returns
+    -------
+    tuple
+        The registry key.
+    """
+    return (endpoint, hashlib.sha256(key.encode("utf-8")).hexdigest()) + tuple(settings)
+
+
+def close_client(client) -> None:
+    """
+    Closes a client, ignoring errors.
+
+    Parameters
+    ----------
+    client: CosmosClient
+        The client to close.
+    """
+    try:
+        close = getattr(client, "close", None)
+
+        if close is not None:
+            close()
+
+    except Exception as e:
+        logger.warning("Error closing database client: %s", e)
@@ -0,0 +1,73 @@
+class NotModified:
+    """
+    The result of a conditional read of an item that has not changed since the etag given. It carries no payload.
+    Compare with 'NOT_MODIFIED'.
+    """
+
+    def __repr__(self) -> str:
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = NotModified()
+
+
+class Conflict:
+    """
+    The result of a conditional write that was not applied because the item changed since it was read.
+
+    Attributes
+    ----------
+    id: str
+        The unique id of the item.
+
+    partition_key: str
+        The partition key of the item.
+
+    etag: str
+        The etag the item was expected to have.
+
+    error: Exception
+        The precondition failure returned by the database.
+    """
+
+    def __init__(self, id: str, partition_key: str, etag: str, error: Exception=None):
+        """
+        Parameters
+        ----------
+        id: str
+            The unique id of the item.
+
+        partition_key: str
+            The partition key of the item.
+
+        etag: str
+            The etag the item was expected to have.
+
+        error: Exception
+            The precondition failure returned by the database. 'None' by default.
+        """
+        self.id = id
+        self.partition_key = partition_key
+        self.etag = etag
+        self.error = error
+
+
+    def __str__(self) -> str:
+        return "'id': '{0}' | 'partition_key': '{1}' | 'etag': '{2}'".format(self.id, self.partition_key, self.etag)
+
+
+def get_etag(document: dict[str, any]) -> str:
+    """
+    Gets the etag of a document returned by the database.
+
+    Parameters
+    ----------
+    document: dict[str, any]
+        The document.
+
+    Returns
+    -------
+    str
+        The etag, or 'None' if the document has none.
+    """
+    return document.get("_etag") if isinstance(document, dict) else None
@@ -1,9 +1,20 @@
+from src.db_service.LogPolicy import LogPolicy
+from src.db_service.Metrics import MetricsSink
+from src.db_service.Serialization import ReturnFormat
+
 class DbOptions:
     """
     Database options for configuring the DbService.
     """
 
-    def __init__(self, endpoint: str, key: str, database_id: str, container_id: str):
+    def __init__(self, endpoint: str, key: str, database_id: str, container_id: str, partition_key_path: str=None,
+                 cache_max_size: int=0, cache_ttl: float=60.0, query_cache_max_bytes: int=0,
+                 return_format: ReturnFormat=ReturnFormat.STR, log_policy: LogPolicy=None,
+                 share_client: bool=True, connection_pool_size: int=None, connection_keep_alive: bool=True,
+                 metrics_sink: MetricsSink=None, ru_per_second: float=None, throttle_max_retries: int=5,
+                 max_concurrency: int=None, max_queue_size: int=1000, coalesce_reads: bool=False,
+                 max_degree_of_parallelism: int=None, prefetch_pages: int=2, containers: dict[str, str]=None,
+                 container_resolver=None, lazy_connect: bool=False):
         """
         Parameters
         ----------
@@ -18,9 +29,104 @@ class DbOptions:
 
         container_id : str
             The id of the container connecting to.
+
+        partition_key_path : str
+            The partition key path of the container, e.g. '/user'. 'None' by default.
+            Used to find the partition key of an item when working with many items at once.
+
+        cache_max_size : int
+            The most items kept in the in-process read cache in front of 'get'. '0' by default, which disables the cache.
+
+        cache_ttl : float
+            The seconds a cached item is served before it is revalidated with the database. '60.0' by default.
+
+        query_cache_max_bytes : int
+            The most bytes of results kept in the query result cache. '0' by default, which disables the cache.
+            Only queries with a 'cache_ttl' are cached.
+
+        return_format : ReturnFormat
+            The form documents are returned in. 'ReturnFormat.STR' by default, a JSON string.
+            'ReturnFormat.NATIVE' skips encoding entirely and 'ReturnFormat.BYTES' encodes with orjson when it is installed.
+            Native documents served from a cache are copies, so changing them does not change the cache.
+
+        log_policy : LogPolicy
+            How documents and keys are written into log records. By default documents are summarized and keys redacted.
+
+        share_client : bool
+            Should services connecting with the same endpoint, key and connection settings share one client
+            and its connection pool. 'True' by default.
+
+        connection_pool_size : int
+            The most HTTP connections kept open to the database. 'None' by default, which uses the SDK's default.
+
+        connection_keep_alive : bool
+            Should HTTP connections be kept open between requests. 'True' by default.
+
+        metrics_sink : MetricsSink
+            Receives the wall time, round trips, pages, documents, response bytes and request charge of every
+            operation. 'None' by default, which measures nothing.
+
+        ru_per_second : float
+            The most request units per second the service spends, e.g. a share of the container's provisioned throughput
+            for a background job. Requests are paced client side and the rate is lowered while the database answers
+            with 429s. 'None' by default, which does not pace requests.
+
+        throttle_max_retries : int
+            The number of times an operation throttled with a 429 is retried before the error is raised. '5' by default.
+
+        max_concurrency : int
+            The most requests the service has in flight at once. Requests beyond it wait in a queue per priority and
+            interactive requests are served before bulk ones. One slot is kept for interactive requests when it is
+            at least '2'. 'None' by default, which does not schedule requests.
+
+        max_queue_size : int
+            The most requests waiting in each priority's queue before more are rejected. '1000' by default.
+
+        coalesce_reads : bool
+            Should concurrent identical gets and queries share one request to the database and its result. 'False' by default.
+            Native documents shared this way should be treated as read-only.
+
+        max_degree_of_parallelism : int
+            The most feed ranges read at once by a query that fans out to every partition. 'None' by default, which reads
+            them one after another through the SDK. Queries can override it.
+
+        prefetch_pages : int
+            The most pages each feed range of a parallel query reads ahead of the caller. '2' by default.
+
+        containers : dict[str, str]
+            The partition key path of every other container the service works with, by container id. Operations
+            target them with 'container_id' on the same client. 'None' by default.
+
+        container_resolver : Callable[[str], str]
+            Gets the partition key path of a container that is not in 'containers', e.g. from a naming convention,
+            and raises a 'KeyError' for containers the service should not work with. 'None' by default.
+
+        lazy_connect : bool
+            Should the service connect on its first operation instead of requiring 'connect' to be called first.
+            'False' by default.
         """
 
         self.endpoint = endpoint
         self.key = key
         self.database_id = database_id
-        self.container_id = container_id
\ No newline at end of file
+        self.container_id = container_id
+        self.partition_key_path = partition_key_path
+        self.cache_max_size = cache_max_size
+        self.cache_ttl = cache_ttl
+        self.query_cache_max_bytes = query_cache_max_bytes
+        self.return_format = return_format
+        self.log_policy = log_policy or LogPolicy()
+        self.share_client = share_client
+        self.connection_pool_size = connection_pool_size
+        self.connection_keep_alive = connection_keep_alive
+        self.metrics_sink = metrics_sink
+        self.ru_per_second = ru_per_second
+        self.throttle_max_retries = throttle_max_retries
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.coalesce_reads = coalesce_reads
+        self.max_degree_of_parallelism = max_degree_of_parallelism
+        self.prefetch_pages = prefetch_pages
+        self.containers = containers or {}
+        self.container_resolver = container_resolver
+        self.lazy_connect = lazy_connect
@@ -1,10 +1,59 @@
-import json
-import logging as logger # TODO: Need a way to configure logging dynamically.
+import copy
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from src.db_service.BulkResult import BulkItemResult, BulkResult
+from src.db_service.ChangeFeed import ChangeFeedReader, CheckpointStore
+from src.db_service.ClientRegistry import client_key, close_client, default_registry
+from src.db_service.Concurrency import NOT_MODIFIED, Conflict, get_etag
 from src.db_service.DbOptions import DbOptions
-from src.db_service.Query import Query
+from src.db_service.ItemCache import ItemCache
+from src.db_service.JsonArrayEncoder import JsonArrayEncoder
+from src.db_service.LogPolicy import REDACTED, LogPolicy
+from src.db_service.Metrics import OperationRecorder
+from src.db_service.ParallelQuery import ParallelQuery, get_order
+from src.db_service.Patch import validate_patch_operations
+from src.db_service.PartitionKey import get_partition_key
+from src.db_service.Query import Query, build_projection
+from src.db_service.QueryCache import QueryCache
+from src.db_service.Scheduler import Priority, Scheduler
+from src.db_service.Serialization import ReturnFormat, dumps_bytes, from_bytes, serialize
+from src.db_service.SingleFlight import SingleFlight
+from src.db_service.Throttling import RateLimiter, call_with_retry, get_request_charge, get_throttle_retry_wait, is_throttled
+from src.db_service.Validation import validate_db_options, validate_id_and_partition_key
+
+from src.db_service.LazyImport import LazyModule
+
+# The SDK and HTTP packages are imported on first use, so importing the service does not pay for them.
+cosmos = LazyModule("azure.cosmos")
+exceptions = LazyModule("azure.cosmos.exceptions")
+core = LazyModule("azure.core")
+transport = LazyModule("azure.core.pipeline.transport")
+requests = LazyModule("requests")
+adapters = LazyModule("requests.adapters")
+
+# The SDK exceptions the service raises, still importable from this module.
+EXCEPTIONS = ("CosmosAccessConditionFailedError", "CosmosHttpResponseError", "CosmosResourceExistsError", "CosmosResourceNotFoundError")
+
+def __getattr__(name: str) -> any:
+    """
+    Gets the SDK names this module exposes, importing the SDK on first use. Assigning 'CosmosClient' on this module,
+    e.g. with 'patch', replaces the client type the service creates.
+    """
+    if name == "CosmosClient":
+        return cosmos.CosmosClient
+
+    if name in EXCEPTIONS:
+        return getattr(exceptions, name)
+
+    raise AttributeError("module '{0}' has no attribute '{1}'".format(__name__, name))
 
-from azure.cosmos import CosmosClient
-from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosResourceNotFoundError
+
+# The most operations Cosmos DB accepts in a single transactional batch.
+MAX_BATCH_SIZE = 100
 
 class DbService():
     """
@@ -15,29 +64,138 @@ class DbService():
     dbOptions: DbOptions
             Options for configuring the database service.
 
+    logger: logging.Logger
+            The logger this service writes to.
+
+    cache: ItemCache
+            The read cache in front of 'get'. 'None' if it is not enabled in the db options.
+
+    query_cache: QueryCache
+            The result cache in front of 'query'. 'None' if it is not enabled in the db options.
+
+    metrics_sink: MetricsSink
+            Receives the measurements of every operation. 'None' if it is not set in the db options.
+
+    rate_limiter: RateLimiter
+            Paces requests to the request units per second of the db options. 'None' if they are not set.
+            Assign one limiter to several services to have them share a budget.
+
+    scheduler: Scheduler
+            Limits the requests in flight and serves interactive requests before bulk ones. 'None' if the max
+            concurrency is not set in the db options. Assign one scheduler to several services to have them share it.
+
+    single_flight: SingleFlight
+            Shares one request between concurrent identical gets and queries and counts the requests coalesced.
+            'None' if read coalescing is not enabled in the db options.
+
     Methods
     -------
     connect()
         Connects to the database.
 
+    close()
+        Closes the connection to the database.
+
+    warmup()
+        Connects and opens connections to the database in the background.
+
+    for_container()
+        Gets the service for another container of the database, sharing this service's connection.
+
     get()
         Gets an item in the database collection.
 
+    get_many()
+        Gets many items in the database collection.
+
+    query()
+        Queries the database collection.
+
+    invalidate_queries()
+        Removes cached query results by tag or partition key.
+
+    query_iter()
+        Lazily yields the documents of a query.
+
+    query_pages()
+        Lazily yields the pages of a query.
+
+    query_page()
+        Gets a single page of a query and the token to continue from.
+
+    query_to_stream()
+        Streams the documents of a query as a JSON array into a sink.
+
     upsert()
         Upserts an item in the database collection.
+
+    upsert_many()
+        Upserts many items in the database collection.
+
+    delete()
+        Deletes an item in the database collection.
+
+    delete_many()
+        Deletes many items in the database collection.
+
+    patch()
+        Partially updates an item in the database collection.
+
+    patch_many()
+        Partially updates many items in the database collection.
+
+    read_modify_write()
+        Updates an item from its current state, retrying when it changes concurrently.
+
+    change_feed()
+        Creates a reader delivering the changes of the database collection to a handler.
     """
 
-    def __init__(self, db_options: DbOptions):
+    def __init__(self, db_options: DbOptions, logger: logging.Logger=None):
         """        
         Parameters
         ----------
         db_options: DbOptions
             Options for configuring the database service.
+
+        logger: logging.Logger
+            The logger this service writes to. The module's logger by default.
         """
         self.db_options = db_options
+        self.logger = logger or logging.getLogger(__name__)
+        self.log_policy = db_options.log_policy if db_options is not None else LogPolicy()
         self.client = None
         self.db = None
         self.container = None
+        self.cache = None
+        self.metrics_sink = db_options.metrics_sink if db_options is not None else None
+        self.rate_limiter = None
+        self.__client_key = None
+        self.__fan_outs = set()
+        self.__containers = dict()
+        self.__containers_lock = threading.Lock()
+        self.__connect_lock = threading.RLock()
+
+        if db_options is not None and db_options.cache_max_size:
+            self.cache = ItemCache(db_options.cache_max_size, db_options.cache_ttl)
+
+        self.query_cache = None
+
+        if db_options is not None and db_options.query_cache_max_bytes:
+            self.query_cache = QueryCache(db_options.query_cache_max_bytes)
+
+        if db_options is not None and db_options.ru_per_second:
+            self.rate_limiter = RateLimiter(db_options.ru_per_second)
+
+        self.scheduler = None
+
+        if db_options is not None and db_options.max_concurrency:
+            self.scheduler = Scheduler(db_options.max_concurrency, db_options.max_queue_size)
+
+        self.single_flight = None
+
+        if db_options is not None and db_options.coalesce_reads:
+            self.single_flight = SingleFlight()
 
 
     def connect(self) -> None:
@@ -50,53 +208,234 @@ class DbService():
             Raised if an unexpected error occurs.
         """
 
-        try: # Validate the dbOptions before connecting.
-            logger.debug("Validating DB options.")
+        start = time.perf_counter()
+
+        with self.__connect_lock:
+            try: # Validate the dbOptions before connecting.
+                self.logger.debug("Validating DB options.")
             
-            self.__validate_db_options()
+                validate_db_options(self.db_options)
 
-            logger.debug("DB options are valid.")
+                self.logger.debug("DB options are valid.")
 
-        except Exception as e:
-            logger.exception("connect exception -> Error validating db options: {0}".format(e))
-            raise
+            except Exception as e:
+                self.logger.exception("connect exception -> Error validating db options: %s", e)
+                raise
 
-        try: # Open database connection.
-            logger.info("Opening connection to database.")
-            logger.debug("endpoint: {0}, key: {1}".format(self.db_options.endpoint, self.db_options.key))
+            try: # Open database connection.
+                self.logger.info("Opening connection to database.")
+                self.logger.debug("endpoint: %s, key: %s", self.db_options.endpoint, REDACTED)
 
-            self.client = CosmosClient(self.db_options.endpoint, self.db_options.key)
+                if self.client is not None: # Reconnecting, let go of the previous client.
+                    self.__release_client()
 
-            logger.info("Database connection opened.")
+                if self.db_options.share_client:
+                    self.__client_key = client_key(
+                        self.db_options.endpoint,
+                        self.db_options.key,
+                        self.db_options.connection_pool_size,
+                        self.db_options.connection_keep_alive)
 
-        except Exception as e:
-            logger.exception("connect exception -> Error opening connection to the database: {0}".format(e))
-            raise
+                    self.client = default_registry.acquire(self.__client_key, self.__create_client)
+
+                else:
+                    self.client = self.__create_client()
+
+                self.logger.info("Database connection opened in %.1f ms.", (time.perf_counter() - start) * 1000)
+
+            except Exception as e:
+                self.logger.exception("connect exception -> Error opening connection to the database: %s", e)
+                raise
         
-        try: # Get database.
-            logger.info("Getting database {0}.".format(self.db_options.database_id))
+            try: # Get database.
+                self.logger.info("Getting database %s.", self.db_options.database_id)
 
-            self.db = self.client.get_database_client(self.db_options.database_id)
+                self.db = self.client.get_database_client(self.db_options.database_id)
 
-            logger.info("Database retrieved.")
+                self.logger.info("Database retrieved.")
         
-        except Exception as e:
-            logger.exception("connect exception -> Error getting database: {0}".format(e))
-            raise
+            except Exception as e:
+                self.logger.exception("connect exception -> Error getting database: %s", e)
+                self.__release_client()
+                raise
         
-        try: # Get container.
-            logger.info("Getting container {0}.".format(self.db_options.container_id))
+            try: # Get container.
+                self.logger.info("Getting container %s.", self.db_options.container_id)
 
-            self.container = self.db.get_container_client(self.db_options.container_id)
+                self.container = self.db.get_container_client(self.db_options.container_id)
 
-            logger.info("Container retrieved.")
+                self.logger.info("Container retrieved.")
         
-        except Exception as e:
-            logger.exception("connect exception -> Error getting container: {0}".format(e))
-            raise
+            except Exception as e:
+                self.logger.exception("connect exception -> Error getting container: %s", e)
+                self.__release_client()
+                raise
+
+        self.logger.info("Connected to container %s in %.1f ms.", self.db_options.container_id, (time.perf_counter() - start) * 1000)
+
+
+    def close(self) -> None:
+        """
+        Closes the connection to the database. A shared client is only closed once no other service uses it.
+        """
+        if self.client is not None:
+            self.logger.info("Closing connection to database.")
+
+            self.__release_client()
+
+        self.client = None
+        self.db = None
+        self.container = None
+
+        with self.__containers_lock:
+            self.__containers.clear()
+
+
+    def for_container(self, container_id: str) -> "DbService":
+        """
+        Gets the service for another container of the database. It is created on first use and cached, and shares
+        this service's client, caches, rate limiter, scheduler and read coalescing, so many containers cost one
+        connection. Connect and close this service rather than the one returned.
 
+        Parameters
+        ----------
+        container_id: str
+            The id of the container. It must be the db options' container, one of their 'containers', or be
+            resolved by their 'container_resolver'.
+
+        Returns
+        -------
+        DbService
+            The service for the container, or this service for the db options' container.
+
+        Raises
+        ------
+        ValueError
+            Raised if the container id is not defined or not known.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+        if container_id == self.db_options.container_id:
+            return self
+
+        with self.__containers_lock:
+            service = self.__containers.get(container_id)
+
+            if service is not None:
+                return service
+
+            try:
+                self.logger.debug("Validating parameter 'container_id'.")
+
+                partition_key_path = self.__partition_key_path(container_id)
+
+                self.logger.debug("'container_id' is valid.")
+
+            except ValueError as e:
+                self.logger.exception("for_container exception -> Parameter invalid: %s", e)
+                raise
+
+            try:
+                self.logger.info("Getting container %s.", container_id)
+
+                if self.db is None:
+                    self.__connect_lazily()
+
+                if self.db is None:
+                    raise ConnectionError("The service must be connected before getting container '{0}'.".format(container_id))
+
+                db_options = copy.copy(self.db_options)
+                db_options.container_id = container_id
+                db_options.partition_key_path = partition_key_path
+
+                service = DbService(db_options, self.logger)
+                service.db = self.db
+                service.container = self.db.get_container_client(container_id)
+                service.cache = self.cache
+                service.query_cache = self.query_cache
+                service.rate_limiter = self.rate_limiter
+                service.scheduler = self.scheduler
+                service.single_flight = self.single_flight
+
+                self.__containers[container_id] = service
+
+                self.logger.info("Container retrieved.")
+
+                return service
+
+            except Exception as e:
+                self.logger.exception("for_container exception -> Error getting container: %s", e)
+                raise
+
+
+    @property
+    def container(self):
+        """
+        The client of the container. Connects first when lazy connection is enabled in the db options and the
+        service is not connected yet.
+        """
+        if self.__container is None:
+            self.__connect_lazily()
 
-    def get(self, id: str, partition_key: str) -> str:
+        return self.__container
+
+
+    @container.setter
+    def container(self, container) -> None:
+        self.__container = container
+
+
+    def warmup(self, container_ids: list[str]=None) -> threading.Thread:
+        """
+        Connects in the background and opens connections to the database, so the first operations do not wait for
+        them. Errors are logged rather than raised; the first operation connects again if warming up failed.
+
+        Parameters
+        ----------
+        container_ids: list[str]
+            Other containers to get ready as well. 'None' by default.
+
+        Returns
+        -------
+        threading.Thread
+            The thread warming up. Join it to wait until the service is ready.
+        """
+        def run() -> None:
+            start = time.perf_counter()
+
+            try:
+                self.logger.info("Warming up the database service.")
+
+                with self.__connect_lock:
+                    if self.__container is None:
+                        self.connect()
+
+                for container_id in [self.db_options.container_id] + list(container_ids or []):
+                    self.for_container(container_id).container.read()
+
+                self.logger.info("Database service warmed up in %.1f ms.", (time.perf_counter() - start) * 1000)
+
+            except Exception as e:
+                self.logger.warning("Warming up the database service failed: %s", e)
+
+        thread = threading.Thread(target=run, name="db-service-warmup", daemon=True)
+        thread.start()
+
+        return thread
+
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+    def get(self, id: str, partition_key: str, return_format: ReturnFormat=None, priority: Priority=Priority.INTERACTIVE,
+            fields: list[str]=None, if_none_match: str=None, container_id: str=None) -> str:
         """
         Gets an item from the database.
 
@@ -108,15 +447,33 @@ class DbService():
         partition_key: str
             The partition key used for the database item collection.
 
+        return_format: ReturnFormat
+            The form to return the item in. The db options' return format by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        fields: list[str]
+            The top-level properties of the item to return. 'None' by default, which returns the whole document.
+            The properties are read with a point query, bypassing the read cache.
+
+        if_none_match: str
+            The etag of the copy of the item the caller holds. 'None' by default.
+            If the item still has this etag 'NOT_MODIFIED' is returned instead of the document.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
         Returns
         -------
         str
-            The JSON document of the item in the collection this database is querying.
+            The JSON document of the item in the collection this database is querying,
+            or the document in the requested return format. 'NOT_MODIFIED' if the item still has the etag given.
 
         Raises
         ------
         ValueError
-            Raised if the parameters given are invalid.
+            Raised if the parameters given are invalid, or fields and an etag are both given.
 
         CosmosHttpResponseError
             Raised if the item could not be retrieved.
@@ -124,237 +481,1660 @@ class DbService():
         Exception
             Raised if an unexpected error occurs.
         """
+        if container_id is not None:
+            return self.for_container(container_id).get(id, partition_key, return_format, priority, fields, if_none_match)
 
         try:
-            logger.debug("Validating parameter 'id' and 'partition_key'.")
+            self.logger.debug("Validating parameter 'id' and 'partition_key'.")
             
-            self.__validate_id_and_partition_key(id, partition_key)
+            validate_id_and_partition_key(id, partition_key)
+
+            if fields is not None:
+                build_projection(fields)
+
+                if if_none_match is not None:
+                    raise ValueError("'fields' and 'if_none_match' cannot be given together.")
             
-            logger.debug("'id' and 'partition_key' are valid.")
+            self.logger.debug("'id' and 'partition_key' are valid.")
 
         except ValueError as e:
-            logger.exception("get exception -> Parameter invalid: {0}".format(e))
+            self.logger.exception("get exception -> Parameter invalid: %s", e)
             raise
 
-        try:
-            logger.info("Getting item by id: {0}".format(id))
-            logger.debug("id: {0}, partition_key: {1}".format(id, partition_key))
+        with self.__recorder("get") as recorder:
+            try:
+                self.logger.info("Getting item by id: %s", self.log_policy.key(id))
+                self.logger.debug("id: %s, partition_key: %s", self.log_policy.key(id), self.log_policy.key(partition_key))
 
-            response = self.container.read_item(item=id, partition_key=partition_key)
+                if if_none_match is not None:
+                    response = self.__coalesce(("get",) + self.__cache_key(id, partition_key) + (if_none_match,),
+                                               lambda: self.__read_if_modified(id, partition_key, if_none_match, priority, **self.__request_options(recorder)))
 
-            logger.info("Item retrieved: {0}.".format(response))
-            
-            # Convert result to json and return generic object.
-            j = json.dumps(response)
+                    if response is NOT_MODIFIED:
+                        self.logger.info("Item with id %s not modified.", self.log_policy.key(id))
+                        return NOT_MODIFIED
 
-            return j
+                elif fields is None:
+                    response = self.__coalesce(("get",) + self.__cache_key(id, partition_key),
+                                               lambda: self.__read_item(id, partition_key, priority, **self.__request_options(recorder)))
 
-        except CosmosHttpResponseError as e:
-            logger.warning("Could not get item by id {0} with partition key {1}.".format(id, partition_key))
-            return None
+                else:
+                    response = self.__coalesce(("get",) + self.__cache_key(id, partition_key) + tuple(fields),
+                                               lambda: self.__read_fields(id, partition_key, fields, priority, **self.__request_options(recorder)))
 
-        except Exception as e:
-            logger.exception("get exception -> Error getting item by id: {0}".format(e))
-            raise
+                recorder.add_documents(1)
+
+                self.logger.info("Item retrieved: %s.", self.log_policy.payload(response))
+
+                if self.cache is not None and fields is None and self.__return_format(return_format) == ReturnFormat.NATIVE:
+                    response = copy.deepcopy(response) # The cached document must not change with the caller's copy.
+
+                return serialize(response, self.__return_format(return_format))
+
+            except exceptions.CosmosHttpResponseError as e:
+                if is_throttled(e): # Still throttled after every retry, the item is not known to be missing.
+                    self.logger.exception("get exception -> Request throttled: %s", e)
+                    raise
+
+                self.logger.warning("Could not get item by id %s with partition key %s.", self.log_policy.key(id), self.log_policy.key(partition_key))
+
+                recorder.fail(e)
+
+                if self.cache is not None:
+                    self.cache.invalidate(self.__cache_key(id, partition_key))
+
+                return None
+
+            except Exception as e:
+                self.logger.exception("get exception -> Error getting item by id: %s", e)
+                raise
 
     
-    def query(self, query: Query) -> str:
+    def get_many(self, keys: list[tuple[str, str]], max_workers: int=8, return_format: ReturnFormat=None,
+                 priority: Priority=Priority.INTERACTIVE, fields: list[str]=None, container_id: str=None) -> dict[str, str]:
         """
-        Queries the database with a given search query string.
+        Gets many items from the database in one or a few round trips.
+
+        Uses the SDK's batched point read when it is available. Otherwise the ids are grouped by partition
+        key and read with one query per partition, run in parallel. Items are always read with queries when
+        only some of their properties are wanted.
 
         Parameters
         ----------
-        query: Query
-            The query information to use for the query's execution.
+        keys: list[tuple[str, str]]
+            The (id, partition_key) of every item to retrieve.
+
+        max_workers: int
+            The most partition queries in flight at once when batched point reads are not available. '8' by default.
+
+        return_format: ReturnFormat
+            The form to return each item in. The db options' return format by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        fields: list[str]
+            The top-level properties of every item to return. 'None' by default, which returns the whole documents.
+
+        container_id: str
+            The container to work with. The db options' container by default.
 
         Returns
         -------
-        str
-            The JSON documents from the result as a JSON string.
+        dict[str, str]
+            The JSON document of every item keyed by id, or the document in the requested return format.
+            Items that could not be found map to 'None'.
 
         Raises
         ------
+        TypeError
+            Raised if the keys are not defined.
+
+        ValueError
+            Raised if an id or partition key is invalid.
+
         Exception
             Raised if an unexpected error occurs.
         """
+        if container_id is not None:
+            return self.for_container(container_id).get_many(keys, max_workers, return_format, priority, fields)
+
         try:
-            logger.debug("Validating 'query' is valid.")
+            self.logger.debug("Validating parameter 'keys' is valid.")
 
-            if query is None:
-                raise TypeError("'query' must be defined.")
+            if keys is None:
+                raise TypeError("The keys must be defined.")
 
-            logger.debug("'query' is valid.")
-        
-        except TypeError as e:
-            logger.exception("query exception -> Parameters are invalid: {0}".format(e))
+            for id, partition_key in keys:
+                validate_id_and_partition_key(id, partition_key)
+
+            if fields is not None:
+                build_projection(fields)
+
+            self.logger.debug("Parameter 'keys' is valid.")
+
+        except (TypeError, ValueError) as e:
+            self.logger.exception("get_many exception -> Parameter invalid: %s", e)
             raise
 
         try:
-            logger.debug("Building where params for database API.")
+            self.logger.info("Getting %s items.", len(keys))
 
-            params = query.build_where_params()
+            read_items = getattr(self.container, "read_items", None) or getattr(self.container, "read_many_items", None)
 
-            logger.debug("Where params built: {0}".format(json.dumps(params)))
-            logger.info("Querying database with: {0}".format(str(query)))
-
-            if params is None:
-                result = list(self.container.query_items(
-                    query.query_str,
-                    enable_cross_partition_query=query.enable_cross_partition_query))
+            if read_items is not None and fields is None:
+                documents = self.__call(lambda: list(read_items(items=list(keys), **self.__request_options())), priority)
 
             else:
-                result = list(self.container.query_items(
-                    query.query_str,
-                    parameters=params,
-                    enable_cross_partition_query=query.enable_cross_partition_query))
+                documents = self.__query_many(keys, max_workers, priority, fields)
 
-            if result is not None and len(result) > 0:
-                j = json.dumps(result)
+            return_format = self.__return_format(return_format)
 
-                logger.info("{0} results retrieved: {1}".format(len(result), j))
+            result = dict.fromkeys((id for id, _ in keys), None)
+            for document in documents:
+                id = document["id"]
 
-                return j
+                if fields is not None and "id" not in fields: # Only selected to key the result.
+                    document = { k: v for k, v in document.items() if k != "id" }
 
-            else:
-                logger.warning("No results found for given query: {0}".format(str(query)))
-                return None
+                result[id] = serialize(document, return_format)
+
+            self.logger.info("%s of %s items retrieved.", len(documents), len(result))
+
+            return result
 
         except Exception as e:
-            logger.exception("query exception -> Error querying items: {0}".format(e))
+            self.logger.exception("get_many exception -> Error getting items: %s", e)
             raise
 
 
-    def upsert(self, item: dict[str, any]) -> str:
+    def query(self, query: Query, return_format: ReturnFormat=None, priority: Priority=Priority.INTERACTIVE,
+              container_id: str=None) -> str:
         """
-        Upserts an item in the database.
+        Queries the database with a given search query string.
 
         Parameters
         ----------
-        item: dict[str, any]
-            The object's dictionary key value pair.
+        query: Query
+            The query information to use for the query's execution.
+
+        return_format: ReturnFormat
+            The form to return the documents in. The db options' return format by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
 
         Returns
         -------
         str
-            The JSON document of the object upserted.
+            The JSON documents from the result as a JSON string, or the documents in the requested return format.
 
         Raises
         ------
-        TypeError
-            Raised if the parameter given is invalid.
-
         Exception
             Raised if an unexpected error occurs.
-
         """
+        if container_id is not None:
+            return self.for_container(container_id).query(query, return_format, priority)
 
         try:
-            logger.debug("Validating parameter 'item' is valid.")
+            self.logger.debug("Validating 'query' is valid.")
 
-            if item is None:
-                raise TypeError("The item must be defined.")
-
-            logger.debug("Parameter 'item' is valid.")
+            if query is None:
+                raise TypeError("'query' must be defined.")
 
+            self.logger.debug("'query' is valid.")
+        
         except TypeError as e:
-            logger.exception("upsert exception -> Parameter invalid: {0}".format(e))
+            self.logger.exception("query exception -> Parameters are invalid: %s", e)
             raise
 
-        try:
-            logger.info("Getting item: {0}".format(json.dumps(item)))
+        with self.__recorder("query", query) as recorder:
+            try:
+                cache_key = (self.db_options.container_id,) + query.cache_key() if self.query_cache is not None and query.cache_ttl else None
 
-            result = self.container.upsert_item(item)
-            
-            # Convert result to json and return generic object.
-            j = json.dumps(result)
+                if cache_key is not None:
+                    entry = self.query_cache.get(cache_key)
 
-            logger.info("Item retrieved: {0}".format(j))
+                    if entry is not None:
+                        self.logger.info("Query result served from cache for: %s", self.log_policy.query(query))
 
-            return j
-        
-        except Exception as e:
-            logger.exception("upsert exception -> Error upserting item: {0}".format(e))
-            raise
-    
-    
-    def delete(self, id: str, partition_key: str) -> None:
+                        if entry.value is None:
+                            return None
+
+                        recorder.add_documents(entry.documents)
+
+                        return from_bytes(entry.value, self.__return_format(return_format))
+
+                self.logger.info("Querying database with: %s", self.log_policy.query(query))
+
+                def run_query() -> list[dict[str, any]]:
+                    options = query.build_query_options(self.db_options.partition_key_path)
+                    parallel = self.__parallel_query(query, options, recorder, priority)
+
+                    if parallel is not None:
+                        return list(parallel.documents())
+
+                    documents = list()
+                    for page in self.__pages(self.__query_items(query, options, **self.__request_options(recorder)), priority):
+                        recorder.add_page(len(page))
+                        documents.extend(page)
+
+                    return documents
+
+                result = self.__coalesce(("query", self.db_options.container_id) + query.cache_key(), lambda: self.__call(run_query, None))
+
+                if len(result) > 0:
+                    self.logger.info("%s results retrieved: %s", len(result), self.log_policy.payload(result))
+
+                    if cache_key is not None:
+                        partition_keys = self.__query_partition_keys(query, result)
+
+                        # The result is cached encoded, so every hit decodes its own copy and is encoded only once.
+                        data = dumps_bytes(result)
+                        self.query_cache.put(cache_key, data, len(data), query.cache_ttl, query.cache_tags, partition_keys, len(result))
+
+                        if self.__return_format(return_format) != ReturnFormat.NATIVE:
+                            return from_bytes(data, self.__return_format(return_format))
+
+                    return serialize(result, self.__return_format(return_format))
+
+                else:
+                    self.logger.warning("No results found for given query: %s", self.log_policy.query(query))
+
+                    if cache_key is not None:
+                        self.query_cache.put(cache_key, None, 0, query.cache_ttl, query.cache_tags, self.__query_partition_keys(query, []))
+
+                    return None
+
+            except Exception as e:
+                self.logger.exception("query exception -> Error querying items: %s", e)
+                raise
+
+
+    def invalidate_queries(self, tag: str=None, partition_key: str=None) -> int:
         """
-        Deletes an item from the database.
+        Removes cached query results with a tag, or of a partition the query is routed to or holding its documents.
 
         Parameters
         ----------
-         id: str
-            The unique id of the item being retrieved.
+        tag: str
+            The tag given to the queries through 'cache_tags'. 'None' by default.
 
         partition_key: str
-            The partition key used for the database item collection.
+            The partition key of the documents. Requires the partition key path in the db options. 'None' by default.
+
+        Returns
+        -------
+        int
+            The number of cached results removed.
+        """
+        if self.query_cache is None:
+            return 0
+
+        count = self.query_cache.invalidate(tag=tag, partition_key=partition_key)
+
+        self.logger.info("%s cached query results invalidated.", count)
+
+        return count
+
+
+    def query_iter(self, query: Query, priority: Priority=Priority.INTERACTIVE, container_id: str=None):
+        """
+        Lazily yields the documents of a query as they arrive from the database.
+
+        Only the page currently being read is held in memory and the first document is available
+        after the first round trip. Queries read across feed ranges in parallel hold at most the prefetched
+        pages of each feed range.
+
+        Parameters
+        ----------
+        query: Query
+            The query information to use for the query's execution.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        Iterator[dict[str, any]]
+            The documents from the result.
 
         Raises
         ------
-        ValueError
-            Raised if the parameters given are invalid.
-
-        CosmosResourceNotFoundError
-            Raised if the item cannot be found to be deleted.
+        TypeError
+            Raised if the query is not defined.
 
         Exception
             Raised if an unexpected error occurs.
         """
-        
-        try:
-            logger.debug("Validating parameter 'id' and 'partition_key'.")
-            
-            self.__validate_id_and_partition_key(id, partition_key)
-            
-            logger.debug("'id' and 'partition_key' are valid.")
+        if container_id is not None:
+            yield from self.for_container(container_id).query_iter(query, priority)
+            return
 
-        except ValueError as e:
-            logger.exception("delete exception -> Parameter invalid: {0}".format(e))
-            raise
+        for page in self.query_pages(query, priority):
+            yield from page
 
-        try:
-            logger.info("Deleting item by id: '{0}'".format(id))
-            logger.debug("id: {0}, partition_key: {1}".format(id, partition_key))
 
-            self.container.delete_item(item=id, partition_key=partition_key)
+    def query_pages(self, query: Query, priority: Priority=Priority.INTERACTIVE, container_id: str=None):
+        """
+        Lazily yields the pages of a query as they arrive from the database.
 
-            logger.info("Item with id '{0}' deleted.".format(id))
+        A query fanning out to every partition reads its feed ranges at once when the db options set a degree of
+        parallelism, holding at most the prefetched pages of each feed range. The documents of an ordered query
+        are merged across feed ranges into pages of the query's 'max_item_count'.
+
+        Parameters
+        ----------
+        query: Query
+            The query information to use for the query's execution.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        Iterator[list[dict[str, any]]]
+            The pages of documents from the result.
+
+        Raises
+        ------
+        TypeError
+            Raised if the query is not defined.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+        if container_id is not None:
+            yield from self.for_container(container_id).query_pages(query, priority)
+            return
+
+        try:
+            self.logger.debug("Validating 'query' is valid.")
+
+            if query is None:
+                raise TypeError("'query' must be defined.")
+
+            self.logger.debug("'query' is valid.")
+
+        except TypeError as e:
+            self.logger.exception("query_pages exception -> Parameters are invalid: %s", e)
+            raise
+
+        try:
+            self.logger.info("Streaming query from database with: %s", self.log_policy.query(query))
+
+            options = query.build_query_options(self.db_options.partition_key_path)
+            parallel = self.__parallel_query(query, options, None, priority)
+
+            if parallel is not None:
+                pages = parallel.pages(query.max_item_count)
+
+            else:
+                pages = self.__pages(self.__query_items(query, options, **self.__request_options()), priority)
+
+            page_count = 0
+            item_count = 0
+            for page in pages:
+                page_count += 1
+                item_count += len(page)
+
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Page %s retrieved with %s results.", page_count, len(page))
+
+                yield page
+
+            self.logger.info("%s results streamed in %s pages.", item_count, page_count)
+
+        except Exception as e:
+            self.logger.exception("query_pages exception -> Error querying items: %s", e)
+            raise
+
+
+    def query_page(self, query: Query, page_size: int=None, continuation_token: str=None, return_format: ReturnFormat=None,
+                   priority: Priority=Priority.INTERACTIVE, container_id: str=None) -> tuple:
+        """
+        Gets a single page of a query and the token to continue from, so a page can be served per request.
+
+        Parameters
+        ----------
+        query: Query
+            The query information to use for the query's execution.
+
+        page_size: int
+            The most documents in the page. The query's 'max_item_count' by default.
+
+        continuation_token: str
+            The opaque token returned with the previous page. 'None' by default, which gets the first page.
+
+        return_format: ReturnFormat
+            The form to return the documents in. The db options' return format by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        tuple
+            The JSON documents of the page as a JSON string, or the documents in the requested return format,
+            and the token of the next page. The documents are 'None' if the page is empty and the token is
+            'None' if there are no more pages.
+
+        Raises
+        ------
+        TypeError
+            Raised if the query is not defined.
+
+        ValueError
+            Raised if the page size is not positive.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+        if container_id is not None:
+            return self.for_container(container_id).query_page(query, page_size, continuation_token, return_format, priority)
+
+        try:
+            self.logger.debug("Validating 'query' and 'page_size' are valid.")
+
+            if query is None:
+                raise TypeError("'query' must be defined.")
+
+            if page_size is not None and page_size <= 0:
+                raise ValueError("'page_size' must be greater than 0.")
+
+            self.logger.debug("'query' and 'page_size' are valid.")
+
+        except (TypeError, ValueError) as e:
+            self.logger.exception("query_page exception -> Parameters are invalid: %s", e)
+            raise
+
+        try:
+            self.logger.info("Getting page of query: %s", self.log_policy.query(query))
+
+            overrides = self.__request_options()
+            if page_size is not None:
+                overrides["max_item_count"] = page_size
+
+            def read_page() -> tuple:
+                pager = self.__query_items(query, **overrides).by_page(continuation_token)
+                return (list(next(pager, [])), pager.continuation_token)
+
+            page, next_token = self.__call(read_page, priority)
+
+            self.logger.info("%s results retrieved, more pages: %s", len(page), next_token is not None)
+
+            if len(page) == 0:
+                return (None, next_token)
+
+            return (serialize(page, self.__return_format(return_format)), next_token)
 
-        except CosmosResourceNotFoundError as e:
-            logger.exception("delete exception -> Could not find item to delete: {0}".format(e))
-            raise
-        
         except Exception as e:
-            logger.exception("delete exception -> Error deleting item: {0}".format(e))
+            self.logger.exception("query_page exception -> Error querying items: %s", e)
+            raise
+
+
+    def query_to_stream(self, query: Query, sink, priority: Priority=Priority.INTERACTIVE, container_id: str=None) -> int:
+        """
+        Streams the documents of a query as a JSON array into a sink, one page at a time.
+
+        Parameters
+        ----------
+        query: Query
+            The query information to use for the query's execution.
+
+        sink: object
+            The file-like object (has 'write') or socket-like object (has 'sendall') to write to.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        int
+            The number of documents written.
+
+        Raises
+        ------
+        TypeError
+            Raised if the query or sink is not defined.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+        if container_id is not None:
+            return self.for_container(container_id).query_to_stream(query, sink, priority)
+
+        try:
+            encoder = JsonArrayEncoder(sink)
+
+        except TypeError as e:
+            self.logger.exception("query_to_stream exception -> Parameters are invalid: %s", e)
+            raise
+
+        return encoder.write_all(self.query_iter(query, priority))
+
+
+    def upsert(self, item: dict[str, any], return_format: ReturnFormat=None, priority: Priority=Priority.INTERACTIVE,
+               if_match: str=None, container_id: str=None) -> str:
+        """
+        Upserts an item in the database.
+
+        Parameters
+        ----------
+        item: dict[str, any]
+            The object's dictionary key value pair.
+
+        return_format: ReturnFormat
+            The form to return the upserted object in. The db options' return format by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        if_match: str
+            The etag the item must still have for it to be replaced. 'None' by default, which always writes.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        str
+            The JSON document of the object upserted, or the document in the requested return format.
+            A 'Conflict' if the item no longer has the etag given.
+
+        Raises
+        ------
+        TypeError
+            Raised if the parameter given is invalid.
+
+        Exception
+            Raised if an unexpected error occurs.
+
+        """
+        if container_id is not None:
+            return self.for_container(container_id).upsert(item, return_format, priority, if_match)
+
+        try:
+            self.logger.debug("Validating parameter 'item' is valid.")
+
+            if item is None:
+                raise TypeError("The item must be defined.")
+
+            self.logger.debug("Parameter 'item' is valid.")
+
+        except TypeError as e:
+            self.logger.exception("upsert exception -> Parameter invalid: %s", e)
+            raise
+
+        with self.__recorder("upsert") as recorder:
+            try:
+                self.logger.info("Upserting item: %s", self.log_policy.payload(item))
+
+                options = self.__request_options(recorder)
+
+                if if_match is not None:
+                    options.update(etag=if_match, match_condition=core.MatchConditions.IfNotModified)
+
+                result = self.__call(lambda: self.container.upsert_item(item, **options), priority)
+
+                recorder.add_documents(1)
+
+                self.__update_cache(result)
+
+                self.logger.info("Item upserted: %s", self.log_policy.payload(result))
+
+                return serialize(result, self.__return_format(return_format))
+
+            except exceptions.CosmosAccessConditionFailedError as e:
+                id, partition_key = item.get("id"), get_partition_key(item, self.db_options.partition_key_path)
+                self.logger.warning("Item with id %s changed since etag %s, not upserted.", self.log_policy.key(id), if_match)
+
+                recorder.fail(e)
+                self.__invalidate_cache(id, partition_key)
+
+                return Conflict(id, partition_key, if_match, e)
+
+            except Exception as e:
+                self.logger.exception("upsert exception -> Error upserting item: %s", e)
+                raise
+    
+    
+    def delete(self, id: str, partition_key: str, priority: Priority=Priority.INTERACTIVE, if_match: str=None,
+               container_id: str=None) -> Conflict:
+        """
+        Deletes an item from the database.
+
+        Parameters
+        ----------
+         id: str
+            The unique id of the item being retrieved.
+
+        partition_key: str
+            The partition key used for the database item collection.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        if_match: str
+            The etag the item must still have for it to be deleted. 'None' by default, which always deletes.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        Conflict
+            'None' if the item was deleted, or a 'Conflict' if it no longer has the etag given.
+
+        Raises
+        ------
+        ValueError
+            Raised if the parameters given are invalid.
+
+        CosmosResourceNotFoundError
+            Raised if the item cannot be found to be deleted.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+        if container_id is not None:
+            return self.for_container(container_id).delete(id, partition_key, priority, if_match)
+
+        
+        try:
+            self.logger.debug("Validating parameter 'id' and 'partition_key'.")
+            
+            validate_id_and_partition_key(id, partition_key)
+            
+            self.logger.debug("'id' and 'partition_key' are valid.")
+
+        except ValueError as e:
+            self.logger.exception("delete exception -> Parameter invalid: %s", e)
+            raise
+
+        with self.__recorder("delete") as recorder:
+            try:
+                self.logger.info("Deleting item by id: '%s'", self.log_policy.key(id))
+                self.logger.debug("id: %s, partition_key: %s", self.log_policy.key(id), self.log_policy.key(partition_key))
+
+                options = self.__request_options(recorder)
+
+                if if_match is not None:
+                    options.update(etag=if_match, match_condition=core.MatchConditions.IfNotModified)
+
+                self.__call(lambda: self.container.delete_item(item=id, partition_key=partition_key, **options), priority)
+
+                if self.cache is not None:
+                    self.cache.invalidate(self.__cache_key(id, partition_key))
+
+                self.logger.info("Item with id '%s' deleted.", self.log_policy.key(id))
+
+            except exceptions.CosmosAccessConditionFailedError as e:
+                self.logger.warning("Item with id %s changed since etag %s, not deleted.", self.log_policy.key(id), if_match)
+
+                recorder.fail(e)
+                self.__invalidate_cache(id, partition_key)
+
+                return Conflict(id, partition_key, if_match, e)
+
+            except exceptions.CosmosResourceNotFoundError as e:
+                self.logger.exception("delete exception -> Could not find item to delete: %s", e)
+                raise
+
+            except Exception as e:
+                self.logger.exception("delete exception -> Error deleting item: %s", e)
+                raise
+
+
+    def patch(self, id: str, partition_key: str, operations: list[dict[str, any]], filter_predicate: str=None,
+              return_format: ReturnFormat=None, priority: Priority=Priority.INTERACTIVE, if_match: str=None,
+              container_id: str=None) -> str:
+        """
+        Partially updates an item in the database. Only the operations are sent, and the database applies them
+        atomically to the current item, so concurrent patches of different properties do not overwrite each other.
+
+        Parameters
+        ----------
+        id: str
+            The unique id of the item being patched.
+
+        partition_key: str
+            The partition key used for the database item collection.
+
+        operations: list[dict[str, any]]
+            The operations to apply, built with 'Patch', e.g. [Patch.incr("/balance", 25)]. At most 10.
+
+        filter_predicate: str
+            A condition the item must meet for the patch to apply, e.g. 'FROM c WHERE c.balance >= 25'.
+            'None' by default.
+
+        return_format: ReturnFormat
+            The form to return the patched object in. The db options' return format by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        if_match: str
+            The etag the item must still have for it to be patched. 'None' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        str
+            The JSON document of the object patched, or the document in the requested return format.
+            A 'Conflict' if the item does not meet the filter predicate or no longer has the etag given.
+
+        Raises
+        ------
+        ValueError
+            Raised if the parameters given are invalid.
+
+        TypeError
+            Raised if the operations are not defined.
+
+        CosmosResourceNotFoundError
+            Raised if the item cannot be found to be patched.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+        if container_id is not None:
+            return self.for_container(container_id).patch(id, partition_key, operations, filter_predicate, return_format, priority, if_match)
+
+        try:
+            self.logger.debug("Validating parameters 'id', 'partition_key' and 'operations'.")
+
+            validate_id_and_partition_key(id, partition_key)
+            validate_patch_operations(operations)
+
+            self.logger.debug("'id', 'partition_key' and 'operations' are valid.")
+
+        except (TypeError, ValueError) as e:
+            self.logger.exception("patch exception -> Parameter invalid: %s", e)
+            raise
+
+        with self.__recorder("patch") as recorder:
+            try:
+                self.logger.info("Patching item by id: '%s'", self.log_policy.key(id))
+                self.logger.debug("operations: %s", self.log_policy.payload(operations))
+
+                options = self.__request_options(recorder)
+
+                if filter_predicate is not None:
+                    options.update(filter_predicate=filter_predicate)
+
+                if if_match is not None:
+                    options.update(etag=if_match, match_condition=core.MatchConditions.IfNotModified)
+
+                result = self.__call(lambda: self.container.patch_item(
+                    item=id,
+                    partition_key=partition_key,
+                    patch_operations=operations,
+                    **options), priority)
+
+                recorder.add_documents(1)
+
+                self.__update_cache(result)
+
+                self.logger.info("Item patched: %s", self.log_policy.payload(result))
+
+                return serialize(result, self.__return_format(return_format))
+
+            except exceptions.CosmosAccessConditionFailedError as e:
+                self.logger.warning("Item with id %s did not meet the patch precondition, not patched.", self.log_policy.key(id))
+
+                recorder.fail(e)
+                self.__invalidate_cache(id, partition_key)
+
+                return Conflict(id, partition_key, if_match, e)
+
+            except exceptions.CosmosResourceNotFoundError as e:
+                self.logger.exception("patch exception -> Could not find item to patch: %s", e)
+                raise
+
+            except Exception as e:
+                self.logger.exception("patch exception -> Error patching item: %s", e)
+                raise
+
+
+    def upsert_many(self, items: list[dict[str, any]], max_workers: int=8, priority: Priority=Priority.BULK,
+                    container_id: str=None) -> BulkResult:
+        """
+        Upserts many items in the database.
+
+        Items are grouped by partition key and written with transactional batches of up to 100 operations
+        when the partition key path is configured in the db options. Otherwise, or if a batch fails, the items
+        are written one at a time across a bounded pool of workers. Throttled requests are retried after the
+        retry-after the database asks for.
+
+        Parameters
+        ----------
+        items: list[dict[str, any]]
+            The objects' dictionary key value pairs.
+
+        max_workers: int
+            The most requests in flight at once. '8' by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.BULK' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        BulkResult
+            The outcome of every item. Failures are reported per item instead of raised.
+
+        Raises
+        ------
+        TypeError
+            Raised if the items are not defined or contain an undefined item.
+        """
+        if container_id is not None:
+            return self.for_container(container_id).upsert_many(items, max_workers, priority)
+
+        try:
+            self.logger.debug("Validating parameter 'items' is valid.")
+
+            if items is None or any(item is None for item in items):
+                raise TypeError("The items must be defined.")
+
+            self.logger.debug("Parameter 'items' is valid.")
+
+        except TypeError as e:
+            self.logger.exception("upsert_many exception -> Parameter invalid: %s", e)
+            raise
+
+        entries = list[tuple]()
+        for index, item in enumerate(items):
+            partition_key = get_partition_key(item, self.db_options.partition_key_path)
+            entries.append((index, item.get("id"), partition_key, item))
+
+        self.logger.info("Upserting %s items.", len(entries))
+
+        result = self.__run_bulk(
+            entries,
+            lambda entry: ("upsert", (entry[3],)),
+            lambda entry: self.container.upsert_item(entry[3], **self.__request_options()),
+            max_workers,
+            priority)
+
+        for item_result in result.succeeded:
+            self.__update_cache(item_result.result, item_result.id)
+
+        self.logger.info("Items upserted: %s", result)
+
+        return result
+
+
+    def delete_many(self, keys: list[tuple[str, str]], max_workers: int=8, priority: Priority=Priority.BULK,
+                    container_id: str=None) -> BulkResult:
+        """
+        Deletes many items from the database.
+
+        Items are grouped by partition key and deleted with transactional batches of up to 100 operations.
+        If a batch fails the items are deleted one at a time across a bounded pool of workers. Throttled
+        requests are retried after the retry-after the database asks for.
+
+        Parameters
+        ----------
+        keys: list[tuple[str, str]]
+            The (id, partition_key) of every item to delete.
+
+        max_workers: int
+            The most requests in flight at once. '8' by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.BULK' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        BulkResult
+            The outcome of every item. Failures are reported per item instead of raised.
+
+        Raises
+        ------
+        TypeError
+            Raised if the keys are not defined.
+
+        ValueError
+            Raised if an id or partition key is invalid.
+        """
+        if container_id is not None:
+            return self.for_container(container_id).delete_many(keys, max_workers, priority)
+
+        try:
+            self.logger.debug("Validating parameter 'keys' is valid.")
+
+            if keys is None:
+                raise TypeError("The keys must be defined.")
+
+            for id, partition_key in keys:
+                validate_id_and_partition_key(id, partition_key)
+
+            self.logger.debug("Parameter 'keys' is valid.")
+
+        except (TypeError, ValueError) as e:
+            self.logger.exception("delete_many exception -> Parameter invalid: %s", e)
+            raise
+
+        entries = [(index, id, partition_key, None) for index, (id, partition_key) in enumerate(keys)]
+
+        self.logger.info("Deleting %s items.", len(entries))
+
+        result = self.__run_bulk(
+            entries,
+            lambda entry: ("delete", (entry[1],)),
+            lambda entry: self.container.delete_item(item=entry[1], partition_key=entry[2], **self.__request_options()),
+            max_workers,
+            priority)
+
+        if self.cache is not None:
+            for item_result in result.succeeded:
+                self.cache.invalidate(self.__cache_key(item_result.id, item_result.partition_key))
+
+        self.logger.info("Items deleted: %s", result)
+
+        return result
+
+
+    def patch_many(self, patches: list[tuple[str, str, list[dict[str, any]]]], filter_predicate: str=None, max_workers: int=8,
+                   priority: Priority=Priority.BULK, container_id: str=None) -> BulkResult:
+        """
+        Partially updates many items in the database.
+
+        Patches are grouped by partition key and applied with transactional batches of up to 100 operations.
+        If a batch fails, e.g. because an item does not meet the filter predicate, the patches are applied one
+        at a time across a bounded pool of workers. Throttled requests are retried after the retry-after the
+        database asks for.
+
+        Parameters
+        ----------
+        patches: list[tuple[str, str, list[dict[str, any]]]]
+            The (id, partition_key, operations) of every item to patch.
+
+        filter_predicate: str
+            A condition every item must meet for its patch to apply. 'None' by default.
+
+        max_workers: int
+            The most requests in flight at once. '8' by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.BULK' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        BulkResult
+            The outcome of every item. Failures are reported per item instead of raised.
+
+        Raises
+        ------
+        TypeError
+            Raised if the patches or the operations of a patch are not defined.
+
+        ValueError
+            Raised if an id, partition key or operation is invalid.
+        """
+        if container_id is not None:
+            return self.for_container(container_id).patch_many(patches, filter_predicate, max_workers, priority)
+
+        try:
+            self.logger.debug("Validating parameter 'patches' is valid.")
+
+            if patches is None:
+                raise TypeError("The patches must be defined.")
+
+            for id, partition_key, operations in patches:
+                validate_id_and_partition_key(id, partition_key)
+                validate_patch_operations(operations)
+
+            self.logger.debug("Parameter 'patches' is valid.")
+
+        except (TypeError, ValueError) as e:
+            self.logger.exception("patch_many exception -> Parameter invalid: %s", e)
+            raise
+
+        entries = [(index, id, partition_key, operations) for index, (id, partition_key, operations) in enumerate(patches)]
+        options = { "filter_predicate": filter_predicate } if filter_predicate is not None else {}
+
+        self.logger.info("Patching %s items.", len(entries))
+
+        result = self.__run_bulk(
+            entries,
+            lambda entry: ("patch", (entry[1], entry[3]), options),
+            lambda entry: self.container.patch_item(
+                item=entry[1],
+                partition_key=entry[2],
+                patch_operations=entry[3],
+                **options,
+                **self.__request_options()),
+            max_workers,
+            priority)
+
+        for item_result in result.succeeded:
+            self.__update_cache(item_result.result, item_result.id)
+
+        self.logger.info("Items patched: %s", result)
+
+        return result
+
+
+    def read_modify_write(self, id: str, partition_key: str, update, max_attempts: int=10, return_format: ReturnFormat=None,
+                          priority: Priority=Priority.INTERACTIVE, container_id: str=None) -> str:
+        """
+        Updates an item from its current state without locks. The item is read, changed by 'update' and written back
+        only if it has not changed since it was read, otherwise this is retried with the item read again.
+
+        Parameters
+        ----------
+        id: str
+            The unique id of the item being updated.
+
+        partition_key: str
+            The partition key used for the database item collection.
+
+        update: Callable[[dict[str, any]], dict[str, any]]
+            Gets the new document from the current one, or from 'None' if the item does not exist yet.
+            Returning 'None' leaves the item as it is. May be called once per attempt, so it should not have side effects.
+
+        max_attempts: int
+            The most times the item is read and written before giving up. '10' by default.
+
+        return_format: ReturnFormat
+            The form to return the written document in. The db options' return format by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.INTERACTIVE' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        str
+            The JSON document written, or the document in the requested return format. 'None' if 'update' returned 'None'.
+            A 'Conflict' if the item kept changing for every attempt.
+
+        Raises
+        ------
+        TypeError
+            Raised if the update is not defined.
+
+        ValueError
+            Raised if the parameters given are invalid.
+
+        Exception
+            Raised if an unexpected error occurs.
+        """
+        if container_id is not None:
+            return self.for_container(container_id).read_modify_write(id, partition_key, update, max_attempts, return_format, priority)
+
+        try:
+            self.logger.debug("Validating parameters 'id', 'partition_key', 'update' and 'max_attempts'.")
+
+            validate_id_and_partition_key(id, partition_key)
+
+            if update is None:
+                raise TypeError("The update must be defined.")
+
+            if max_attempts is None or max_attempts <= 0:
+                raise ValueError("'max_attempts' must be greater than 0.")
+
+            self.logger.debug("Parameters are valid.")
+
+        except (TypeError, ValueError) as e:
+            self.logger.exception("read_modify_write exception -> Parameter invalid: %s", e)
+            raise
+
+        with self.__recorder("read_modify_write") as recorder:
+            try:
+                self.logger.info("Updating item by id: %s", self.log_policy.key(id))
+
+                conflict = None
+
+                for attempt in range(1, max_attempts + 1):
+                    options = self.__request_options(recorder)
+
+                    try:
+                        current = self.__call(lambda: self.container.read_item(item=id, partition_key=partition_key, **options), priority)
+
+                    except exceptions.CosmosResourceNotFoundError:
+                        current = None
+
+                    etag = get_etag(current)
+                    updated = update(current)
+
+                    if updated is None:
+                        self.logger.info("Item with id %s left unchanged.", self.log_policy.key(id))
+                        return None
+
+                    try:
+                        if current is None:
+                            result = self.__call(lambda: self.container.create_item(updated, **options), priority)
+
+                        else:
+                            result = self.__call(lambda: self.container.upsert_item(
+                                updated, etag=etag, match_condition=core.MatchConditions.IfNotModified, **options), priority)
+
+                    except (exceptions.CosmosAccessConditionFailedError, exceptions.CosmosResourceExistsError) as e:
+                        self.logger.warning("Item with id %s changed while updating it, attempt %s of %s.", self.log_policy.key(id), attempt, max_attempts)
+                        conflict = Conflict(id, partition_key, etag, e)
+                        continue
+
+                    recorder.add_documents(1)
+
+                    self.__update_cache(result)
+
+                    self.logger.info("Item updated: %s", self.log_policy.payload(result))
+
+                    return serialize(result, self.__return_format(return_format))
+
+                self.logger.warning("Could not update item with id %s, it changed for all %s attempts.", self.log_policy.key(id), max_attempts)
+
+                recorder.fail(conflict.error)
+                self.__invalidate_cache(id, partition_key)
+
+                return conflict
+
+            except Exception as e:
+                self.logger.exception("read_modify_write exception -> Error updating item: %s", e)
+                raise
+
+
+    def change_feed(self, handler, checkpoint_store: CheckpointStore=None, name: str="default", start_time="Beginning",
+                    max_workers: int=4, max_item_count: int=None, max_pending_batches: int=8, poll_interval: float=5.0,
+                    priority: Priority=Priority.BULK, container_id: str=None) -> ChangeFeedReader:
+        """
+        Creates a reader delivering the changes of the database collection to a handler, so downstream data can be
+        updated incrementally instead of recomputed with full queries. Only the latest version of every changed item
+        is delivered; deletes are not.
+
+        Parameters
+        ----------
+        handler: Callable[[list[dict[str, any]]], None]
+            Processes a batch of changed documents, one batch at a time.
+
+        checkpoint_store: CheckpointStore
+            Keeps the continuation of every feed range. An 'InMemoryCheckpointStore' by default.
+
+        name: str
+            Prefixes the checkpoint keys, so several readers keep their own progress. 'default' by default.
+
+        start_time: str | datetime
+            Where feed ranges without a checkpoint start: 'Beginning', 'Now' or a datetime. 'Now' is the time the
+            reader is created, so changes made before a feed range's first checkpoint are not skipped.
+            'Beginning' by default.
+
+        max_workers: int
+            The most feed ranges read at once. '4' by default.
+
+        max_item_count: int
+            The most documents in a batch. The database's page size by default.
+
+        max_pending_batches: int
+            The most batches read ahead of the handler. '8' by default.
+
+        poll_interval: float
+            The seconds the reader waits once it has caught up. '5.0' by default.
+
+        priority: Priority
+            The lane the requests are scheduled in. 'Priority.BULK' by default.
+
+        container_id: str
+            The container to work with. The db options' container by default.
+
+        Returns
+        -------
+        ChangeFeedReader
+            The reader. Call 'run_once' to catch up, or 'run' to keep reading until 'stop'.
+
+        Raises
+        ------
+        TypeError
+            Raised if the handler is not defined.
+        """
+        if container_id is not None:
+            return self.for_container(container_id).change_feed(handler, checkpoint_store, name, start_time, max_workers, max_item_count,
+                                                                 max_pending_batches, poll_interval, priority)
+
+        try:
+            self.logger.debug("Validating parameter 'handler' is valid.")
+
+            if handler is None:
+                raise TypeError("The handler must be defined.")
+
+            self.logger.debug("Parameter 'handler' is valid.")
+
+        except TypeError as e:
+            self.logger.exception("change_feed exception -> Parameter invalid: %s", e)
             raise
 
+        if start_time == "Now":
+            start_time = datetime.now(timezone.utc)
+
+        return ChangeFeedReader(
+            lambda: self.__call(lambda: list(self.container.read_feed_ranges()), priority),
+            lambda feed_range, continuation: self.__change_feed_pages(feed_range, continuation, start_time, max_item_count, priority),
+            handler,
+            checkpoint_store,
+            name,
+            max_workers,
+            max_pending_batches,
+            poll_interval,
+            self.logger)
+
 
     """
     Private Methods
     """
 
-    # Validates the db options.
-    def __validate_db_options(self) -> None:
-        if self.db_options is None:
-            raise TypeError("db_options cannot be 'None'.")
-        
-        if not self.db_options.endpoint or self.db_options.endpoint.isspace():
-            raise ValueError("The endpoint must be defined.")
-        
-        elif not self.db_options.key or self.db_options.key.isspace():
-            raise ValueError("The key must be defined.")
+    # Creates a client with the connection pool settings of the db options.
+    def __create_client(self):
+        client_type = sys.modules[__name__].CosmosClient
+
+        if self.db_options.connection_pool_size is None and self.db_options.connection_keep_alive:
+            return client_type(self.db_options.endpoint, self.db_options.key)
+
+        session = requests.Session()
+
+        if self.db_options.connection_pool_size is not None:
+            adapter = adapters.HTTPAdapter(
+                pool_connections=self.db_options.connection_pool_size,
+                pool_maxsize=self.db_options.connection_pool_size)
+
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+        if not self.db_options.connection_keep_alive:
+            session.headers["Connection"] = "close"
+
+        return client_type(self.db_options.endpoint, self.db_options.key, transport=transport.RequestsTransport(session=session))
+
+
+    # Gets the partition key path of a container from the db options, or their container resolver.
+    def __partition_key_path(self, container_id: str) -> str:
+        if not container_id or container_id.isspace():
+            raise ValueError("container_id must be defined.")
+
+        if container_id in self.db_options.containers:
+            return self.db_options.containers[container_id]
+
+        if self.db_options.container_resolver is not None:
+            try:
+                return self.db_options.container_resolver(container_id)
+
+            except KeyError:
+                pass
+
+        raise ValueError("Container '{0}' is not one of the containers in the db options.".format(container_id))
+
+
+    # Connects on first use when lazy connection is enabled in the db options. Concurrent first uses share one connection.
+    def __connect_lazily(self) -> None:
+        if self.db_options is None or not self.db_options.lazy_connect:
+            return
+
+        with self.__connect_lock:
+            if self.__container is None:
+                self.logger.info("Connecting on first use.")
+                self.connect()
+
+
+    # Releases the client back to the registry when it is shared, or closes it when it is not.
+    def __release_client(self) -> None:
+        if self.__client_key is not None:
+            default_registry.release(self.__client_key)
+            self.__client_key = None
+
+        elif self.client is not None:
+            close_client(self.client)
+
+
+    # Gets the return format of a call, falling back to the db options.
+    def __return_format(self, return_format: ReturnFormat) -> ReturnFormat:
+        return return_format or self.db_options.return_format
+
+
+    # Reads an item through the cache when it is enabled. Stale entries are revalidated with their etag so an
+    # unchanged item comes back as a 304 without a payload.
+    def __read_item(self, id: str, partition_key: str, priority: Priority, **options) -> dict[str, any]:
+        if self.cache is None:
+            return self.__call(lambda: self.container.read_item(item=id, partition_key=partition_key, **options), priority)
+
+        key = self.__cache_key(id, partition_key)
+        entry = self.cache.get(key)
+
+        if entry is not None and entry.is_fresh:
+            self.logger.debug("Cache hit for id: %s", self.log_policy.key(id))
+            return entry.value
+
+        if entry is not None and entry.etag is not None:
+            self.logger.debug("Revalidating cached item with id: %s", self.log_policy.key(id))
+
+            response = self.__call(lambda: self.container.read_item(item=id, partition_key=partition_key, initial_headers={ "If-None-Match": entry.etag }, **options), priority)
+
+            if not response: # Not modified, the 304 has no payload.
+                self.cache.refresh(key)
+                return entry.value
+
+        else:
+            response = self.__call(lambda: self.container.read_item(item=id, partition_key=partition_key, **options), priority)
+
+        self.cache.put(key, response)
+
+        return response
+
+
+    # Refreshes the cached copy of an upserted item, or drops every copy of it if its partition key is unknown.
+    def __update_cache(self, item: dict[str, any], id: str=None) -> None:
+        if self.cache is None:
+            return
+
+        id = item.get("id", id) if isinstance(item, dict) else id
+        partition_key = get_partition_key(item, self.db_options.partition_key_path)
+
+        if partition_key is not None and isinstance(item, dict):
+            self.cache.put(self.__cache_key(id, partition_key), copy.deepcopy(item))
+
+        else:
+            self.__invalidate_cache(id)
+
+
+    # Drops the cached copy of an item, or every copy of it if its partition key is unknown.
+    def __invalidate_cache(self, id: str, partition_key: str=None) -> None:
+        if self.cache is None:
+            return
+
+        if partition_key is not None:
+            self.cache.invalidate(self.__cache_key(id, partition_key))
+
+        else:
+            self.cache.invalidate_prefix((self.db_options.container_id, id))
+
+
+    # Builds the cache key of an item.
+    def __cache_key(self, id: str, partition_key: str) -> tuple:
+        return (self.db_options.container_id, id, partition_key)
+
+
+    # Gets the partition keys of a cached query result, the one the query is routed to and those of its documents,
+    # so results that are empty or do not select the partition key are still invalidated with their partition.
+    def __query_partition_keys(self, query: Query, documents: list[dict[str, any]]) -> set:
+        partition_keys = set(get_partition_key(d, self.db_options.partition_key_path) for d in documents)
+        partition_keys.add(query.scoped_partition_key(self.db_options.partition_key_path))
+        partition_keys.discard(None)
+
+        return partition_keys
+
+
+    # Runs a read, or shares the result of the identical read in flight when read coalescing is enabled.
+    def __coalesce(self, key: tuple, operation):
+        if self.single_flight is None:
+            return operation()
+
+        return self.single_flight.do(key, operation)
+
+
+    # Starts measuring an operation for the metrics sink.
+    def __recorder(self, operation: str, query: Query=None) -> OperationRecorder:
+        return OperationRecorder(self.metrics_sink, operation, query)
+
+
+    # Gets the keyword arguments of a database call that report each response to the recorder and rate limiter.
+    def __request_options(self, recorder: OperationRecorder=None) -> dict[str, any]:
+        options = recorder.request_options() if recorder is not None else {}
+
+        if self.rate_limiter is None:
+            return options
+
+        record = options.get("response_hook")
+        rate_limiter = self.rate_limiter
+
+        def on_response(headers: dict[str, str], result: any=None) -> None:
+            rate_limiter.consume(get_request_charge(headers))
+
+            throttle_wait = get_throttle_retry_wait(headers)
+            if throttle_wait is not None: # The SDK retried 429s before succeeding, back off as if they were raised.
+                rate_limiter.on_throttled(throttle_wait)
+
+            if record is not None:
+                record(headers, result)
+
+        return { "response_hook": on_response }
+
+
+    # Calls the database, pacing the call with the rate limiter, scheduling it in the lane of its priority and
+    # retrying it while it is throttled. Calls without a priority schedule their own requests.
+    def __call(self, operation, priority: Priority):
+        if self.scheduler is not None and priority is not None:
+            scheduled = operation
+            operation = lambda: self.scheduler.run(scheduled, priority)
+
+        return call_with_retry(operation, self.db_options.throttle_max_retries, self.rate_limiter)
+
+
+    # Splits the SDK's lazy iterator into its pages, pacing each page with the rate limiter and scheduling it
+    # in the lane of its priority. Anything without paging support is treated as a single page.
+    def __pages(self, items, priority: Priority):
+        pages = iter(items.by_page()) if hasattr(items, "by_page") else iter([items])
+
+        def read_page() -> list[dict[str, any]]:
+            page = next(pages, None)
+            return None if page is None else list(page)
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            page = read_page() if self.scheduler is None else self.scheduler.run(read_page, priority)
+
+            if page is None:
+                return
+
+            yield page
+
+
+    # Reads the pages of changes of a feed range from a continuation, or from the start time if there is none,
+    # with the continuation following every page. Pages are paced and scheduled like the pages of a query.
+    def __change_feed_pages(self, feed_range: any, continuation: str, start_time, max_item_count: int, priority: Priority):
+        options = self.__request_options()
+
+        if max_item_count is not None:
+            options["max_item_count"] = max_item_count
+
+        if continuation is not None:
+            items = self.container.query_items_change_feed(continuation=continuation, **options)
+
+        else:
+            items = self.container.query_items_change_feed(feed_range=feed_range, start_time=start_time, **options)
+
+        pager = items.by_page()
+
+        def read_page() -> list[dict[str, any]]:
+            page = next(pager, None)
+            return None if page is None else list(page)
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            page = read_page() if self.scheduler is None else self.scheduler.run(read_page, priority)
+
+            if page is None:
+                return
+
+            yield (page, pager.continuation_token)
+
+
+    # Runs the query against the container with its options, built once by the caller or here, and returns the
+    # SDK's lazy iterator. Queries filtering on the partition key are scoped to it, and the first fan out of every
+    # query shape is logged.
+    def __query_items(self, query: Query, options: dict[str, object]=None, **overrides):
+        options = dict(options or query.build_query_options(self.db_options.partition_key_path), **overrides)
+
+        if options.get("enable_cross_partition_query") and query.fingerprint() not in self.__fan_outs:
+            self.__fan_outs.add(query.fingerprint())
+            self.logger.warning("Query fans out to every partition, scope it to a partition key if it can be: %s", query.statement())
+
+        return self.container.query_items(query.query_str, **options)
+
+
+    # Sets up reading every feed range of the container at once for a query that fans out, when a degree of
+    # parallelism is set and the results of the query can be merged. Otherwise the SDK runs the query. Pages are
+    # recorded when a recorder is given.
+    def __parallel_query(self, query: Query, options: dict[str, object], recorder: OperationRecorder, priority: Priority) -> ParallelQuery:
+        max_degree_of_parallelism = query.max_degree_of_parallelism or self.db_options.max_degree_of_parallelism
+
+        if max_degree_of_parallelism is None or max_degree_of_parallelism <= 1:
+            return None
+
+        if not options.get("enable_cross_partition_query"):
+            return None
+
+        order = get_order(query.query_str)
+
+        if order is None:
+            self.logger.debug("Query results cannot be merged across feed ranges, reading them one after another: %s", query.statement())
+            return None
+
+        feed_ranges = self.__call(lambda: list(self.container.read_feed_ranges()), priority)
+
+        if len(feed_ranges) <= 1:
+            return None
+
+        overrides = self.__request_options(recorder)
+
+        return ParallelQuery(lambda feed_range: self.__pages(self.__query_items(query, options, feed_range=feed_range, **overrides), priority),
+                             feed_ranges, max_degree_of_parallelism, self.db_options.prefetch_pages, order,
+                             (lambda page: recorder.add_page(len(page))) if recorder is not None else None)
+
+
+    # Reads an item unless it still has the etag given. A fresh cached copy with the etag answers without a round trip.
+    def __read_if_modified(self, id: str, partition_key: str, etag: str, priority: Priority, **options) -> dict[str, any]:
+        key = self.__cache_key(id, partition_key)
+        entry = self.cache.get(key) if self.cache is not None else None
+
+        if entry is not None and entry.is_fresh and entry.etag == etag:
+            return NOT_MODIFIED
+
+        response = self.__call(lambda: self.container.read_item(item=id, partition_key=partition_key, initial_headers={ "If-None-Match": etag }, **options), priority)
+
+        if not response: # Not modified, the 304 has no payload.
+            return NOT_MODIFIED
+
+        if self.cache is not None:
+            self.cache.put(key, response)
+
+        return response
+
+
+    # Reads the given properties of an item with a point query, as point reads always return the whole document.
+    def __read_fields(self, id: str, partition_key: str, fields: list[str], priority: Priority, **options) -> dict[str, any]:
+        query_str = "SELECT {0} FROM c WHERE c.id = @id".format(build_projection(fields))
+
+        documents = self.__call(lambda: list(self.container.query_items(
+            query_str, parameters=[{ "name": "@id", "value": id }], partition_key=partition_key, **options)), priority)
+
+        if len(documents) == 0:
+            raise exceptions.CosmosResourceNotFoundError(status_code=404, message="Entity with the specified id does not exist in the system.")
+
+        return documents[0]
+
+
+    # Reads the items with one ARRAY_CONTAINS query per partition key and chunk of ids, run in parallel.
+    # Only the given properties and the id are read when fields are given.
+    def __query_many(self, keys: list[tuple[str, str]], max_workers: int, priority: Priority, fields: list[str]=None) -> list[dict[str, any]]:
+        groups = dict()
+        for id, partition_key in keys:
+            groups.setdefault(partition_key, list()).append(id)
+
+        tasks = list()
+        for partition_key, ids in groups.items():
+            for i in range(0, len(ids), MAX_BATCH_SIZE):
+                tasks.append((partition_key, ids[i:i + MAX_BATCH_SIZE]))
+
+        query_str = "SELECT {0} FROM c WHERE ARRAY_CONTAINS(@ids, c.id)".format("*" if fields is None else build_projection(["id"] + list(fields)))
+
+        def run_task(task: tuple) -> list[dict[str, any]]:
+            return self.__call(lambda: list(self.container.query_items(
+                query_str,
+                parameters=[{ "name": "@ids", "value": task[1] }],
+                partition_key=task[0],
+                **self.__request_options())), priority)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return [d for documents in executor.map(run_task, tasks) for d in documents]
+
+
+    # Runs (index, id, partition_key, payload) entries in transactional batches per partition key where
+    # possible, and single operations otherwise, across a bounded pool of workers.
+    def __run_bulk(self, entries: list[tuple], to_batch_operation, run_single, max_workers: int, priority: Priority) -> BulkResult:
+        tasks = list()
+        groups = dict()
+        for entry in entries:
+            if entry[2] is None:
+                tasks.append([entry])
+
+            else:
+                groups.setdefault(entry[2], list()).append(entry)
+
+        for group in groups.values():
+            for i in range(0, len(group), MAX_BATCH_SIZE):
+                tasks.append(group[i:i + MAX_BATCH_SIZE])
+
+        def run_task(task: list[tuple]) -> list[BulkItemResult]:
+            if task[0][2] is not None and len(task) > 1:
+                try:
+                    responses = self.__call(lambda: self.container.execute_item_batch(
+                        [to_batch_operation(entry) for entry in task],
+                        partition_key=task[0][2],
+                        **self.__request_options()), priority)
+
+                    return [
+                        BulkItemResult(entry[0], entry[1], entry[2], result=response.get("resourceBody"))
+                        for entry, response in zip(task, responses)]
+
+                except Exception as e:
+                    self.logger.warning("Batch for partition key '%s' failed, falling back to single operations: %s", self.log_policy.key(task[0][2]), e)
 
-        elif not self.db_options.database_id or self.db_options.database_id.isspace():
-            raise ValueError("The database id must be defined.")
+            results = list[BulkItemResult]()
+            for entry in task:
+                try:
+                    response = self.__call(lambda: run_single(entry), priority)
+                    results.append(BulkItemResult(entry[0], entry[1], entry[2], result=response))
 
-        elif not self.db_options.container_id or self.db_options.container_id.isspace():
-            raise ValueError("The container id must be defined.")
+                except Exception as e:
+                    self.logger.warning("Bulk operation failed for id '%s': %s", self.log_policy.key(entry[1]), e)
+                    results.append(BulkItemResult(entry[0], entry[1], entry[2], error=e))
 
+            return results
 
-    # Validates the id and partition key are valid.
-    def __validate_id_and_partition_key(self, id: str, partition_key: str) -> None:
-        if not id or id.isspace():
-            raise ValueError("id must be defined.")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = [r for task_results in executor.map(run_task, tasks) for r in task_results]
 
-        elif not partition_key or partition_key.isspace():
-            raise ValueError("partition_key must be defined.")
+        return BulkResult(results)
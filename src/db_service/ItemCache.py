@@ -0,0 +1,283 @@
+import threading
+import time
+from collections import OrderedDict
+
+class CacheEntry:
+    """
+    An item held in the cache.
+
+    Attributes
+    ----------
+    value: dict[str, any]
+        The cached document.
+
+    etag: str
+        The '_etag' of the cached document, used to revalidate the entry once it is stale.
+
+    expires_at: float
+        The monotonic time the entry becomes stale.
+    """
+
+    def __init__(self, value: dict[str, any], ttl: float):
+        """
+        Parameters
+        ----------
+        value: dict[str, any]
+            The cached document.
+
+        ttl: float
+            The seconds until the entry becomes stale.
+        """
+        self.value = value
+        self.etag = value.get("_etag") if isinstance(value, dict) else None
+        self.expires_at = time.monotonic() + ttl
+
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ItemCache:
+    """
+    Thread-safe, size-bounded LRU cache with a time to live per entry.
+
+    Stale entries are kept until they are evicted so they can be revalidated with their '_etag'. Keys are also indexed
+    by every part but the last, so the entries of an item can be removed without knowing its partition key.
+
+    Attributes
+    ----------
+    max_size: int
+        The most entries held before the least recently used entry is evicted.
+
+    ttl: float
+        The default seconds an entry stays fresh.
+
+    hits: int
+        The number of lookups answered from a fresh entry.
+
+    misses: int
+        The number of lookups that found no fresh entry.
+
+    evictions: int
+        The number of entries evicted to stay within the max size.
+
+    Methods
+    -------
+    get(key)
+        Gets an entry, fresh or stale.
+
+    put(key, value, ttl)
+        Adds or replaces an entry.
+
+    refresh(key, ttl)
+        Marks an entry fresh again after it was revalidated.
+
+    invalidate(key)
+        Removes an entry.
+
+    invalidate_prefix(prefix)
+        Removes every entry whose key is the prefix and one more part.
+
+    invalidate_where(predicate)
+        Removes every entry whose key matches the predicate.
+
+    clear()
+        Removes every entry.
+
+    stats()
+        Gets the cache counters.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Parameters
+        ----------
+        max_size: int
+            The most entries held before the least recently used entry is evicted.
+
+        ttl: float
+            The default seconds an entry stays fresh.
+
+        Raises
+        ------
+        ValueError
+            Raised if the max size or ttl are not positive.
+        """
+        if max_size is None or max_size <= 0:
+            raise ValueError("'max_size' must be greater than 0.")
+
+        if ttl is None or ttl <= 0:
+            raise ValueError("'ttl' must be greater than 0.")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__prefixes = dict()
+        self.__lock = threading.Lock()
+
+
+    def get(self, key: tuple) -> CacheEntry:
+        """
+        Gets an entry, fresh or stale, and counts a hit when it is fresh and a miss otherwise.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the entry.
+
+        Returns
+        -------
+        CacheEntry
+            The entry. 'None' if there is none.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None:
+                self.__entries.move_to_end(key)
+
+            if entry is not None and entry.is_fresh:
+                self.hits += 1
+
+            else:
+                self.misses += 1
+
+            return entry
+
+
+    def put(self, key: tuple, value: dict[str, any], ttl: float=None) -> None:
+        """
+        Adds or replaces an entry, evicting the least recently used entry if the cache is full.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the entry.
+
+        value: dict[str, any]
+            The document to cache.
+
+        ttl: float
+            The seconds the entry stays fresh. The cache's ttl by default.
+        """
+        with self.__lock:
+            self.__entries[key] = CacheEntry(value, self.ttl if ttl is None else ttl)
+            self.__entries.move_to_end(key)
+            self.__prefixes.setdefault(key[:-1], set()).add(key)
+
+            while len(self.__entries) > self.max_size:
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+
+
+    def refresh(self, key: tuple, ttl: float=None) -> CacheEntry:
+        """
+        Marks an entry fresh again after it was revalidated.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the entry.
+
+        ttl: float
+            The seconds the entry stays fresh. The cache's ttl by default.
+
+        Returns
+        -------
+        CacheEntry
+            The entry. 'None' if it was evicted in the meantime.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None:
+                entry.expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+            return entry
+
+
+    def invalidate(self, key: tuple) -> None:
+        """
+        Removes an entry.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the entry.
+        """
+        with self.__lock:
+            self.__remove(key)
+
+
+    def invalidate_prefix(self, prefix: tuple) -> None:
+        """
+        Removes every entry whose key is the prefix and one more part, e.g. an item under any partition key.
+
+        Parameters
+        ----------
+        prefix: tuple
+            Every part of the keys but the last.
+        """
+        with self.__lock:
+            for key in list(self.__prefixes.get(prefix, ())):
+                self.__remove(key)
+
+
+    def invalidate_where(self, predicate) -> None:
+        """
+        Removes every entry whose key matches the predicate.
+
+        Parameters
+        ----------
+        predicate: Callable[[tuple], bool]
+            Returns 'True' for the keys to remove.
+        """
+        with self.__lock:
+            for key in [k for k in self.__entries if predicate(k)]:
+                self.__remove(key)
+
+
+    def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__prefixes.clear()
+
+
+    def stats(self) -> dict[str, int]:
+        """
+        Gets the cache counters.
+
+        Returns
+        -------
+        dict[str, int]
+            The size, hits, misses and evictions of the cache.
+        """
+        with self.__lock:
+            return { "size": len(self.__entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions }
+
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+    """
+    Private Methods
+    """
+
+    # Removes an entry and its key from the prefix index. The lock must be held.
+    def __remove(self, key: tuple) -> None:
+        if self.__entries.pop(key, None) is None:
+            return
+
+        keys = self.__prefixes[key[:-1]]
+        keys.discard(key)
+
+        if len(keys) == 0:
+            del self.__prefixes[key[:-1]]
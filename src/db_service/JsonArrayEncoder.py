@@ -0,0 +1,132 @@
+import io
+import json
+
+class JsonArrayEncoder:
+    """
+    Incrementally encodes documents as a JSON array into a sink so the full result never has to be held in memory.
+
+    Attributes
+    ----------
+    sink: object
+        The file-like object (has 'write') or socket-like object (has 'sendall') the array is written to.
+
+    encoding: str
+        The encoding used when the sink expects bytes.
+
+    count: int
+        The number of documents written so far.
+
+    Methods
+    -------
+    write(item)
+        Writes a single document into the array.
+
+    write_all(items)
+        Writes every document in the iterable into the array and closes it.
+
+    close()
+        Closes the JSON array.
+    """
+
+    def __init__(self, sink, encoding: str="utf-8"):
+        """
+        Parameters
+        ----------
+        sink: object
+            The file-like object (has 'write') or socket-like object (has 'sendall') the array is written to.
+
+        encoding: str
+            The encoding used when the sink expects bytes. 'utf-8' by default.
+
+        Raises
+        ------
+        TypeError
+            Raised if the sink cannot be written to.
+        """
+        if sink is None:
+            raise TypeError("'sink' must be defined.")
+
+        if hasattr(sink, "sendall"):
+            self.__send = sink.sendall
+            self.__binary = True
+
+        elif hasattr(sink, "write"):
+            self.__send = sink.write
+            self.__binary = isinstance(sink, (io.RawIOBase, io.BufferedIOBase))
+
+        else:
+            raise TypeError("'sink' must have a 'write' or 'sendall' method.")
+
+        self.sink = sink
+        self.encoding = encoding
+        self.count = 0
+        self.__started = False
+        self.__closed = False
+
+
+    def write(self, item: dict[str, any]) -> None:
+        """
+        Writes a single document into the array.
+
+        Parameters
+        ----------
+        item: dict[str, any]
+            The document to write.
+
+        Raises
+        ------
+        ValueError
+            Raised if the array has already been closed.
+        """
+        if self.__closed:
+            raise ValueError("The JSON array has already been closed.")
+
+        self.__emit(("," if self.__started else "[") + json.dumps(item))
+        self.__started = True
+        self.count += 1
+
+
+    def write_all(self, items) -> int:
+        """
+        Writes every document in the iterable into the array and closes it.
+
+        Parameters
+        ----------
+        items: Iterable[dict[str, any]]
+            The documents to write.
+
+        Returns
+        -------
+        int
+            The number of documents written.
+        """
+        for item in items:
+            self.write(item)
+
+        self.close()
+
+        return self.count
+
+
+    def close(self) -> None:
+        """
+        Closes the JSON array. An empty array is written if no documents were written.
+        """
+        if self.__closed:
+            return
+
+        self.__emit("]" if self.__started else "[]")
+        self.__closed = True
+
+
+    """
+    Private Methods
+    """
+
+    # Sends a chunk of the array to the sink in the form the sink expects.
+    def __emit(self, chunk: str) -> None:
+        if self.__binary:
+            self.__send(chunk.encode(self.encoding))
+
+        else:
+            self.__send(chunk)
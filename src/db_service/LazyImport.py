@@ -0,0 +1,65 @@
+"""
+Defers importing heavy packages until they are first used, so importing the services stays fast on cold starts.
+"""
+
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class LazyModule:
+    """
+    Stands in for a module, importing it the first time one of its attributes is read. Safe to use from many threads.
+
+    Attributes
+    ----------
+    name: str
+        The name of the module, e.g. 'azure.cosmos'.
+
+    Methods
+    -------
+    load()
+        Imports the module if it is not imported yet.
+    """
+
+    def __init__(self, name: str):
+        """
+        Parameters
+        ----------
+        name: str
+            The name of the module, e.g. 'azure.cosmos'.
+        """
+        self.name = name
+        self.__module = None
+        self.__lock = threading.Lock()
+
+
+    def load(self):
+        """
+        Imports the module if it is not imported yet. The time a first import takes is logged.
+
+        Returns
+        -------
+        module
+            The module.
+        """
+        module = self.__module
+
+        if module is not None:
+            return module
+
+        with self.__lock:
+            if self.__module is None:
+                start = time.perf_counter()
+
+                self.__module = importlib.import_module(self.name)
+
+                logger.info("Imported %s in %.1f ms.", self.name, (time.perf_counter() - start) * 1000)
+
+            return self.__module
+
+
+    def __getattr__(self, name: str) -> any:
+        return getattr(self.load(), name)
@@ -0,0 +1,180 @@
+import json
+
+REDACTED = "***"
+
+class LogPolicy:
+    """
+    Decides how documents and keys are written into log records.
+
+    Values are wrapped so they are only formatted if a record is actually emitted. By default documents
+    are summarized instead of formatted and keys are redacted, so large result sets and identifiers
+    never end up in the logs unless asked for.
+
+    Attributes
+    ----------
+    log_payloads: bool
+        Should documents be written into log records.
+
+    max_payload_chars: int
+        The most characters of a document written into a log record before it is truncated.
+
+    log_keys: bool
+        Should ids and partition keys be written into log records.
+
+    redacted_fields: set[str]
+        Fields whose values are replaced when a document is written into a log record.
+
+    Methods
+    -------
+    payload(obj)
+        Wraps documents to be written into a log record.
+
+    key(value)
+        Wraps an id or partition key to be written into a log record.
+
+    query(query)
+        Wraps a query to be written into a log record.
+    """
+
+    def __init__(self, log_payloads: bool=False, max_payload_chars: int=1024, log_keys: bool=False, redacted_fields: list[str]=None):
+        """
+        Parameters
+        ----------
+        log_payloads: bool
+            Should documents be written into log records. 'False' by default, which only logs their size.
+
+        max_payload_chars: int
+            The most characters of a document written into a log record before it is truncated. '1024' by default.
+
+        log_keys: bool
+            Should ids and partition keys be written into log records. 'False' by default.
+
+        redacted_fields: list[str]
+            Fields whose values are replaced when a document is written into a log record. 'None' by default.
+        """
+        self.log_payloads = log_payloads
+        self.max_payload_chars = max_payload_chars
+        self.log_keys = log_keys
+        self.redacted_fields = set(redacted_fields or [])
+
+
+    def payload(self, obj: any) -> "LazyPayload":
+        """
+        Wraps documents to be written into a log record.
+
+        Parameters
+        ----------
+        obj: any
+            The document or documents.
+
+        Returns
+        -------
+        LazyPayload
+            Formats the documents according to this policy once the record is emitted.
+        """
+        return LazyPayload(obj, self)
+
+
+    def key(self, value: any) -> "LazyKey":
+        """
+        Wraps an id or partition key to be written into a log record.
+
+        Parameters
+        ----------
+        value: any
+            The id or partition key.
+
+        Returns
+        -------
+        LazyKey
+            Formats the key according to this policy once the record is emitted.
+        """
+        return LazyKey(value, self)
+
+
+    def query(self, query) -> "LazyQuery":
+        """
+        Wraps a query to be written into a log record. The values of its where parameters are treated as keys.
+
+        Parameters
+        ----------
+        query: Query
+            The query.
+
+        Returns
+        -------
+        LazyQuery
+            Formats the query according to this policy once the record is emitted.
+        """
+        return LazyQuery(query, self)
+
+
+class LazyPayload:
+    """
+    Documents formatted according to a log policy only when a log record is emitted.
+    """
+
+    def __init__(self, obj: any, policy: LogPolicy):
+        self.obj = obj
+        self.policy = policy
+
+
+    def __str__(self) -> str:
+        if not self.policy.log_payloads:
+            if isinstance(self.obj, (list, tuple)):
+                return "<{0} documents>".format(len(self.obj))
+
+            return "<document>"
+
+        text = json.dumps(self.__redact(self.obj), default=str)
+
+        if len(text) > self.policy.max_payload_chars:
+            return "{0}... ({1} more characters)".format(text[:self.policy.max_payload_chars], len(text) - self.policy.max_payload_chars)
+
+        return text
+
+
+    # Replaces the values of the redacted fields.
+    def __redact(self, obj: any) -> any:
+        if not self.policy.redacted_fields:
+            return obj
+
+        if isinstance(obj, dict):
+            return { k: REDACTED if k in self.policy.redacted_fields else self.__redact(v) for k, v in obj.items() }
+
+        if isinstance(obj, (list, tuple)):
+            return [self.__redact(o) for o in obj]
+
+        return obj
+
+
+class LazyKey:
+    """
+    An id or partition key formatted according to a log policy only when a log record is emitted.
+    """
+
+    def __init__(self, value: any, policy: LogPolicy):
+        self.value = value
+        self.policy = policy
+
+
+    def __str__(self) -> str:
+        return str(self.value) if self.policy.log_keys else REDACTED
+
+
+class LazyQuery:
+    """
+    A query formatted according to a log policy only when a log record is emitted.
+    """
+
+    def __init__(self, query, policy: LogPolicy):
+        self.query = query
+        self.policy = policy
+
+
+    def __str__(self) -> str:
+        if self.policy.log_keys or not self.query.where_params:
+            return str(self.query)
+
+        return "'query_str': '{0}' | 'where_params': '{1}' | 'enable_cross_partition_query': {2}".format(
+            self.query.query_str, ", ".join(self.query.where_params), self.query.enable_cross_partition_query)
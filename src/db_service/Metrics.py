@@ -0,0 +1,547 @@
+import bisect
+import threading
+import time
+from src.db_service.Throttling import get_request_charge
+
+CONTENT_LENGTH_HEADER = "Content-Length"
+
+# The measurements recorded for every operation.
+MEASUREMENTS = ("duration", "round_trips", "pages", "documents", "response_bytes", "request_charge")
+
+# The upper bounds of the histogram buckets, a 1-2-5 series covering sub-millisecond durations to megabyte responses.
+DEFAULT_BOUNDARIES = tuple(m * 10 ** e for e in range(-5, 8) for m in (1, 2, 5))
+
+class OperationMetrics:
+    """
+    The measurements of a single database operation.
+
+    Attributes
+    ----------
+    operation: str
+        The name of the operation, e.g. 'get' or 'query'.
+
+    fingerprint: str
+        The fingerprint of the query the operation ran, 'None' if it did not run a query.
+
+    statement: str
+        The query string the operation ran with its literals removed, 'None' if it did not run a query.
+
+    duration: float
+        The wall time of the operation in seconds.
+
+    round_trips: int
+        The requests sent to the database.
+
+    pages: int
+        The pages of results read.
+
+    documents: int
+        The documents returned.
+
+    response_bytes: int
+        The bytes of the responses from the database, when the responses report their length.
+
+    request_charge: float
+        The request units charged for the operation.
+
+    error: str
+        The type of the error the operation failed with, 'None' if it succeeded.
+    """
+
+    def __init__(self, operation: str, fingerprint: str=None, statement: str=None):
+        self.operation = operation
+        self.fingerprint = fingerprint
+        self.statement = statement
+        self.duration = 0.0
+        self.round_trips = 0
+        self.pages = 0
+        self.documents = 0
+        self.response_bytes = 0
+        self.request_charge = 0.0
+        self.error = None
+
+
+    def __str__(self) -> str:
+        return "{0} ({1}): {2:.2f}ms, {3} round trips, {4} pages, {5} documents, {6} bytes, {7} RU{8}".format(
+            self.operation, self.fingerprint or "-", self.duration * 1000, self.round_trips, self.pages,
+            self.documents, self.response_bytes, self.request_charge, "" if self.error is None else ", failed: " + self.error)
+
+
+class MetricsSink:
+    """
+    Receives the measurements of every database operation. Subclass to send them anywhere.
+
+    Methods
+    -------
+    record(metrics)
+        Records the measurements of an operation.
+    """
+
+    def record(self, metrics: OperationMetrics) -> None:
+        """
+        Records the measurements of an operation. Called on the thread that ran the operation, so it should be quick.
+
+        Parameters
+        ----------
+        metrics: OperationMetrics
+            The measurements of the operation.
+        """
+        pass
+
+
+class Histogram:
+    """
+    Bucketed distribution of a measurement.
+
+    Attributes
+    ----------
+    count: int
+        The number of values recorded.
+
+    sum: float
+        The sum of the values recorded.
+
+    min: float
+        The smallest value recorded.
+
+    max: float
+        The largest value recorded.
+
+    Methods
+    -------
+    record(value)
+        Records a value.
+
+    percentile(p)
+        Estimates a percentile from the buckets.
+    """
+
+    def __init__(self, boundaries: tuple=DEFAULT_BOUNDARIES):
+        """
+        Parameters
+        ----------
+        boundaries: tuple
+            The sorted upper bounds of the buckets. A 1-2-5 series from 0.00001 to 50,000,000 by default.
+        """
+        self.boundaries = boundaries
+        self.buckets = [0] * (len(boundaries) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+    def record(self, value: float) -> None:
+        """
+        Records a value.
+
+        Parameters
+        ----------
+        value: float
+            The value.
+        """
+        self.buckets[bisect.bisect_left(self.boundaries, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+
+    def percentile(self, p: float) -> float:
+        """
+        Estimates a percentile as the upper bound of the bucket it falls in, capped by the largest value recorded.
+
+        Parameters
+        ----------
+        p: float
+            The percentile, from 0 to 100.
+
+        Returns
+        -------
+        float
+            The estimated percentile, 'None' if nothing was recorded.
+        """
+        if self.count == 0:
+            return None
+
+        rank = p / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+
+            if seen >= rank and bucket_count > 0:
+                return min(self.boundaries[i], self.max) if i < len(self.boundaries) else self.max
+
+        return self.max
+
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99)
+        }
+
+
+class InMemoryMetricsSink(MetricsSink):
+    """
+    Thread-safe registry of histograms of every measurement, labelled by operation and query fingerprint.
+
+    Methods
+    -------
+    record(metrics)
+        Records the measurements of an operation.
+
+    histogram(name, operation, fingerprint)
+        Gets the histogram of a measurement.
+
+    errors(operation, fingerprint)
+        Gets the number of failed operations.
+
+    top(name, n)
+        Gets the labels with the largest total of a measurement, e.g. the queries costing the most request units.
+
+    snapshot()
+        Gets every histogram as plain data.
+
+    clear()
+        Removes every histogram.
+    """
+
+    def __init__(self, boundaries: tuple=DEFAULT_BOUNDARIES):
+        """
+        Parameters
+        ----------
+        boundaries: tuple
+            The sorted upper bounds of the histogram buckets. A 1-2-5 series from 0.00001 to 50,000,000 by default.
+        """
+        self.boundaries = boundaries
+        self.statements = dict()
+        self.__histograms = dict()
+        self.__errors = dict()
+        self.__lock = threading.Lock()
+
+
+    def record(self, metrics: OperationMetrics) -> None:
+        labels = (metrics.operation, metrics.fingerprint)
+
+        with self.__lock:
+            for name in MEASUREMENTS:
+                histogram = self.__histograms.get((name,) + labels)
+
+                if histogram is None:
+                    histogram = Histogram(self.boundaries)
+                    self.__histograms[(name,) + labels] = histogram
+
+                histogram.record(getattr(metrics, name))
+
+            if metrics.error is not None:
+                self.__errors[labels] = self.__errors.get(labels, 0) + 1
+
+            if metrics.fingerprint is not None:
+                self.statements.setdefault(metrics.fingerprint, metrics.statement)
+
+
+    def histogram(self, name: str, operation: str, fingerprint: str=None) -> Histogram:
+        """
+        Gets the histogram of a measurement.
+
+        Parameters
+        ----------
+        name: str
+            The measurement, one of 'duration', 'round_trips', 'pages', 'documents', 'response_bytes' or 'request_charge'.
+
+        operation: str
+            The name of the operation.
+
+        fingerprint: str
+            The fingerprint of the query. 'None' by default, for operations that do not run a query.
+
+        Returns
+        -------
+        Histogram
+            The histogram, 'None' if nothing was recorded for the labels.
+        """
+        return self.__histograms.get((name, operation, fingerprint))
+
+
+    def errors(self, operation: str, fingerprint: str=None) -> int:
+        """
+        Gets the number of failed operations.
+
+        Parameters
+        ----------
+        operation: str
+            The name of the operation.
+
+        fingerprint: str
+            The fingerprint of the query. 'None' by default, for operations that do not run a query.
+
+        Returns
+        -------
+        int
+            The number of failed operations.
+        """
+        return self.__errors.get((operation, fingerprint), 0)
+
+
+    def top(self, name: str="request_charge", n: int=10) -> list[tuple[str, str, Histogram]]:
+        """
+        Gets the labels with the largest total of a measurement, e.g. the queries costing the most request units.
+
+        Parameters
+        ----------
+        name: str
+            The measurement. 'request_charge' by default.
+
+        n: int
+            The most labels returned. '10' by default.
+
+        Returns
+        -------
+        list[tuple[str, str, Histogram]]
+            The operation, query fingerprint and histogram of each label, largest total first.
+        """
+        with self.__lock:
+            entries = [(key[1], key[2], h) for key, h in self.__histograms.items() if key[0] == name]
+
+        return sorted(entries, key=lambda e: e[2].sum, reverse=True)[:n]
+
+
+    def snapshot(self) -> list[dict[str, any]]:
+        """
+        Gets every histogram as plain data, e.g. to export as JSON.
+
+        Returns
+        -------
+        list[dict[str, any]]
+            The labels, statement and distribution of every histogram.
+        """
+        with self.__lock:
+            return [
+                dict(name=key[0], operation=key[1], fingerprint=key[2], statement=self.statements.get(key[2]), **h.to_dict())
+                for key, h in self.__histograms.items()]
+
+
+    def clear(self) -> None:
+        """
+        Removes every histogram.
+        """
+        with self.__lock:
+            self.__histograms.clear()
+            self.__errors.clear()
+            self.statements.clear()
+
+
+class OpenTelemetryMetricsSink(MetricsSink):
+    """
+    Records every measurement into histograms of an OpenTelemetry meter, or any object with the same
+    'create_histogram' and 'record' methods, with the operation and query fingerprint as attributes.
+
+        meter = opentelemetry.metrics.get_meter("my-finance-advisor")
+        db_options = DbOptions(..., metrics_sink=OpenTelemetryMetricsSink(meter))
+    """
+
+    UNITS = { "duration": "s", "response_bytes": "By", "request_charge": "{RU}" }
+
+    def __init__(self, meter, prefix: str="db_service"):
+        """
+        Parameters
+        ----------
+        meter: opentelemetry.metrics.Meter
+            The meter to create the histograms with.
+
+        prefix: str
+            The prefix of the histograms' names. 'db_service' by default.
+        """
+        self.meter = meter
+        self.prefix = prefix
+        self.__instruments = dict()
+        self.__lock = threading.Lock()
+
+
+    def record(self, metrics: OperationMetrics) -> None:
+        attributes = { "db.operation": metrics.operation }
+
+        if metrics.fingerprint is not None:
+            attributes["db.query.fingerprint"] = metrics.fingerprint
+
+        if metrics.error is not None:
+            attributes["error.type"] = metrics.error
+
+        for name in MEASUREMENTS:
+            self.__instrument(name).record(getattr(metrics, name), attributes=attributes)
+
+
+    # Gets the histogram of a measurement, creating it on first use.
+    def __instrument(self, name: str):
+        instrument = self.__instruments.get(name)
+
+        if instrument is None:
+            with self.__lock:
+                instrument = self.__instruments.get(name)
+
+                if instrument is None:
+                    instrument = self.meter.create_histogram("{0}.{1}".format(self.prefix, name), unit=self.UNITS.get(name, "1"))
+                    self.__instruments[name] = instrument
+
+        return instrument
+
+
+class OperationRecorder:
+    """
+    Measures a database operation and hands its measurements to a sink once it completes.
+
+    Use as a context manager around the operation. Without a sink nothing is measured.
+
+    Methods
+    -------
+    request_options()
+        Gets the keyword arguments that report each response to this recorder.
+
+    on_response(headers, result)
+        Adds the round trip, request charge and length of a response.
+
+    add_page(documents)
+        Adds a page of results.
+
+    add_documents(documents)
+        Adds documents returned without paging.
+
+    fail(error)
+        Marks the operation failed.
+    """
+
+    def __init__(self, sink: MetricsSink, operation: str, query=None):
+        """
+        Parameters
+        ----------
+        sink: MetricsSink
+            The sink to hand the measurements to. 'None' disables measuring.
+
+        operation: str
+            The name of the operation.
+
+        query: Query
+            The query the operation runs. 'None' by default.
+        """
+        self.sink = sink
+        self.operation = operation
+        self.query = query
+        self.metrics = None
+        self.__lock = threading.Lock()
+
+
+    def __enter__(self):
+        if self.sink is not None:
+            self.metrics = OperationMetrics(self.operation)
+            self.__started = time.perf_counter()
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self.metrics is None:
+            return
+
+        self.metrics.duration = time.perf_counter() - self.__started
+
+        if exc_type is not None and self.metrics.error is None:
+            self.metrics.error = exc_type.__name__
+
+        if self.query is not None:
+            self.metrics.statement = self.query.statement()
+            self.metrics.fingerprint = self.query.fingerprint()
+
+        self.sink.record(self.metrics)
+
+
+    def request_options(self) -> dict[str, any]:
+        """
+        Gets the keyword arguments that report each response of a database call to this recorder.
+
+        Returns
+        -------
+        dict[str, any]
+            The 'response_hook' of the call, or nothing without a sink.
+        """
+        return { "response_hook": self.on_response } if self.metrics is not None else {}
+
+
+    def on_response(self, headers: dict[str, str], result: any=None) -> None:
+        """
+        Adds the round trip, request charge and length of a response. Safe to call from the threads of a
+        parallel query.
+
+        Parameters
+        ----------
+        headers: dict[str, str]
+            The headers of the response.
+
+        result: any
+            The body of the response. Unused.
+        """
+        if self.metrics is None:
+            return
+
+        try:
+            response_bytes = int(headers.get(CONTENT_LENGTH_HEADER) or 0)
+
+        except (AttributeError, TypeError, ValueError):
+            response_bytes = 0
+
+        request_charge = get_request_charge(headers)
+
+        with self.__lock:
+            self.metrics.round_trips += 1
+            self.metrics.request_charge += request_charge
+            self.metrics.response_bytes += response_bytes
+
+
+    def add_page(self, documents: int) -> None:
+        """
+        Adds a page of results.
+
+        Parameters
+        ----------
+        documents: int
+            The documents in the page.
+        """
+        if self.metrics is not None:
+            self.metrics.pages += 1
+            self.metrics.documents += documents
+
+
+    def add_documents(self, documents: int) -> None:
+        """
+        Adds documents returned without paging, e.g. by a point read or from a cache.
+
+        Parameters
+        ----------
+        documents: int
+            The number of documents.
+        """
+        if self.metrics is not None:
+            self.metrics.documents += documents
+
+
+    def fail(self, error: Exception) -> None:
+        """
+        Marks the operation failed, for errors that are handled instead of raised.
+
+        Parameters
+        ----------
+        error: Exception
+            The error.
+        """
+        if self.metrics is not None:
+            self.metrics.error = type(error).__name__
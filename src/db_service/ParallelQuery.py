@@ -0,0 +1,400 @@
+import heapq
+import itertools
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Matches the clauses whose result cannot be put together from the results of each feed range.
+UNMERGEABLE_PATTERN = re.compile(r"\b(?:TOP|OFFSET|DISTINCT|GROUP\s+BY)\b|\b(?:COUNT|SUM|AVG|MIN|MAX)\s*\(", re.IGNORECASE)
+
+# Matches the ordering of a query.
+ORDER_BY_PATTERN = re.compile(r"\bORDER\s+BY\b(.*)$", re.IGNORECASE | re.DOTALL)
+
+# Matches a term of the ordering, e.g. 'c.age DESC' or 'c["user"]'.
+ORDER_TERM_PATTERN = re.compile(r"^\s*\w+((?:\.\w+|\[\s*['\"]\w+['\"]\s*\])*)\s*(ASC|DESC)?\s*$", re.IGNORECASE)
+
+# Marks a document without the property sorted by.
+MISSING = object()
+
+# The documents in each page of an ordered query's merged results, unless the query sets its page size.
+DEFAULT_PAGE_SIZE = 100
+
+def get_order(query_str: str) -> list[tuple[tuple[str], bool]]:
+    """
+    Gets the ordering of a query whose results can be merged from the results of each feed range.
+
+    Parameters
+    ----------
+    query_str: str
+        The query string.
+
+    Returns
+    -------
+    list[tuple[tuple[str], bool]]
+        The path and descending flag of every term of the ordering, empty if the query is not ordered,
+        or 'None' if the results of the query cannot be merged, e.g. it aggregates or orders by an expression.
+    """
+    if UNMERGEABLE_PATTERN.search(query_str):
+        return None
+
+    order_by = ORDER_BY_PATTERN.search(query_str)
+
+    if order_by is None:
+        return []
+
+    order = list()
+    for term in order_by.group(1).split(","):
+        match = ORDER_TERM_PATTERN.match(term)
+
+        if match is None:
+            return None
+
+        order.append((tuple(re.findall(r"\w+", match.group(1))), (match.group(2) or "").upper() == "DESC"))
+
+    return order
+
+
+def sort_key(order: list[tuple[tuple[str], bool]]):
+    """
+    Builds the key that sorts documents as the database orders them: missing properties first, then null,
+    booleans, numbers and strings.
+
+    Parameters
+    ----------
+    order: list[tuple[tuple[str], bool]]
+        The path and descending flag of every term of the ordering.
+
+    Returns
+    -------
+    Callable[[any], tuple]
+        Gets the sort key of a document.
+    """
+    def key(document: any) -> tuple:
+        return tuple(SortValue(_resolve(document, path), descending) for path, descending in order)
+
+    return key
+
+
+class SortValue:
+    """
+    A value sorted by, compared in the database's order of types and in the direction of its term.
+    """
+
+    __slots__ = ("rank", "value", "descending")
+
+    def __init__(self, value: any, descending: bool):
+        self.rank, self.value = _rank(value)
+        self.descending = descending
+
+
+    def __eq__(self, other: "SortValue") -> bool:
+        return self.rank == other.rank and (self.rank > 4 or self.value == other.value)
+
+
+    def __lt__(self, other: "SortValue") -> bool:
+        low, high = (other, self) if self.descending else (self, other)
+
+        if low.rank != high.rank:
+            return low.rank < high.rank
+
+        return low.rank <= 4 and low.value < high.value
+
+
+class ParallelQuery:
+    """
+    Runs a query over every feed range of a container at once and merges the results, in order when
+    the query is ordered.
+
+    Pages are read by a pool of threads as large as the degree of parallelism. Each feed range reads ahead at
+    most a few pages that have not been consumed yet, so memory stays bounded however large the result.
+
+    Methods
+    -------
+    documents()
+        Lazily yields the documents of every feed range.
+
+    pages(page_size)
+        Lazily yields the pages of every feed range.
+    """
+
+    def __init__(self, read_range, feed_ranges: list[dict[str, any]], max_degree_of_parallelism: int,
+                 prefetch_pages: int=2, order: list[tuple[tuple[str], bool]]=None, on_page=None):
+        """
+        Parameters
+        ----------
+        read_range: Callable[[dict[str, any]], Iterable[list[any]]]
+            Runs the query over a feed range and gives the pages of its results.
+
+        feed_ranges: list[dict[str, any]]
+            The feed ranges of the container.
+
+        max_degree_of_parallelism: int
+            The most pages read at once.
+
+        prefetch_pages: int
+            The most pages of each feed range read ahead of the consumer. '2' by default.
+
+        order: list[tuple[tuple[str], bool]]
+            The ordering of the query from 'get_order'. 'None' by default, which yields pages as they arrive.
+
+        on_page: Callable[[list[any]], None]
+            Called with every page as it is consumed. 'None' by default.
+
+        Raises
+        ------
+        ValueError
+            Raised if the degree of parallelism or the pages read ahead are not positive.
+        """
+        if max_degree_of_parallelism is None or max_degree_of_parallelism <= 0:
+            raise ValueError("'max_degree_of_parallelism' must be greater than 0.")
+
+        if prefetch_pages is None or prefetch_pages <= 0:
+            raise ValueError("'prefetch_pages' must be greater than 0.")
+
+        self.read_range = read_range
+        self.feed_ranges = list(feed_ranges)
+        self.max_degree_of_parallelism = max_degree_of_parallelism
+        self.prefetch_pages = prefetch_pages
+        self.order = order
+        self.on_page = on_page
+        self.__condition = threading.Condition()
+
+
+    def documents(self):
+        """
+        Lazily yields the documents of every feed range. Reading stops once the iterator is closed.
+
+        Returns
+        -------
+        Iterator[any]
+            The documents, in the order of the query when it is ordered.
+
+        Raises
+        ------
+        Exception
+            Raised if reading a feed range fails.
+        """
+        pages = self.pages()
+
+        try:
+            for page in pages:
+                yield from page
+
+        finally:
+            pages.close()
+
+
+    def pages(self, page_size: int=None):
+        """
+        Lazily yields the pages of every feed range as they arrive. The documents of an ordered query are merged
+        across feed ranges, so they are yielded in pages of their own. Reading stops once the iterator is closed.
+
+        Parameters
+        ----------
+        page_size: int
+            The documents in each page of an ordered query. 'None' by default, which uses 'DEFAULT_PAGE_SIZE'.
+
+        Returns
+        -------
+        Iterator[list[any]]
+            The pages of documents, in the order of the query when it is ordered.
+
+        Raises
+        ------
+        Exception
+            Raised if reading a feed range fails.
+        """
+        if len(self.feed_ranges) == 0:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_degree_of_parallelism, len(self.feed_ranges)), thread_name_prefix="db_service-query")
+        readers = [RangeReader(executor, lambda r=r: self.read_range(r), self.prefetch_pages, self.__condition) for r in self.feed_ranges]
+
+        try:
+            for reader in readers:
+                reader.start()
+
+            if self.order:
+                documents = heapq.merge(*[self.__range_documents(r) for r in readers], key=sort_key(self.order))
+
+                for page in iter(lambda: list(itertools.islice(documents, page_size or DEFAULT_PAGE_SIZE)), []):
+                    yield page
+
+            else:
+                yield from self.__unordered_pages(readers)
+
+        finally:
+            for reader in readers:
+                reader.close()
+
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+    """
+    Private Methods
+    """
+
+    # Yields the pages of every feed range as they arrive.
+    def __unordered_pages(self, readers: list["RangeReader"]):
+        pending = list(readers)
+
+        while pending:
+            with self.__condition:
+                ready = next((r for r in pending if r.ready), None)
+
+                while ready is None:
+                    self.__condition.wait()
+                    ready = next((r for r in pending if r.ready), None)
+
+                page = ready.take()
+
+            if page is None:
+                pending.remove(ready)
+                continue
+
+            yield self.__consume(page)
+
+
+    # Yields the documents of a single feed range, waiting for each page to be read.
+    def __range_documents(self, reader: "RangeReader"):
+        while True:
+            with self.__condition:
+                while not reader.ready:
+                    self.__condition.wait()
+
+                page = reader.take()
+
+            if page is None:
+                return
+
+            yield from self.__consume(page)
+
+
+    def __consume(self, page: list[any]) -> list[any]:
+        if self.on_page is not None:
+            self.on_page(page)
+
+        return page
+
+
+class RangeReader:
+    """
+    Reads the pages of a feed range on an executor, one page at a time and at most a few pages ahead of the consumer.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, open_pages, prefetch_pages: int, condition: threading.Condition):
+        self.executor = executor
+        self.open_pages = open_pages
+        self.prefetch_pages = prefetch_pages
+        self.condition = condition
+        self.buffer = deque()
+        self.pages = None
+        self.fetching = False
+        self.exhausted = False
+        self.closed = False
+        self.error = None
+
+
+    @property
+    def ready(self) -> bool:
+        return len(self.buffer) > 0 or self.exhausted or self.error is not None
+
+
+    def start(self) -> None:
+        with self.condition:
+            self.__schedule()
+
+
+    # Takes the next page read, or 'None' once the feed range is exhausted. Must hold the lock and be ready.
+    def take(self) -> list[any]:
+        if self.buffer:
+            page = self.buffer.popleft()
+            self.__schedule()
+            return page
+
+        if self.error is not None:
+            raise self.error
+
+        return None
+
+
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+
+
+    # Reads the next page unless one is being read or enough are buffered. Must hold the lock.
+    def __schedule(self) -> None:
+        if self.fetching or self.exhausted or self.closed or self.error is not None or len(self.buffer) >= self.prefetch_pages:
+            return
+
+        self.fetching = True
+        self.executor.submit(self.__fetch)
+
+
+    def __fetch(self) -> None:
+        page, error = None, None
+
+        try:
+            if self.pages is None:
+                self.pages = iter(self.open_pages())
+
+            page = next(self.pages, None)
+
+        except BaseException as e:
+            error = e
+
+        with self.condition:
+            self.fetching = False
+
+            if error is not None:
+                self.error = error
+
+            elif page is None:
+                self.exhausted = True
+
+            else:
+                self.buffer.append(page)
+
+            self.__schedule()
+            self.condition.notify_all()
+
+
+def _rank(value: any) -> tuple:
+    if value is MISSING:
+        return (0, 0)
+
+    if value is None:
+        return (1, 0)
+
+    if isinstance(value, bool):
+        return (2, value)
+
+    if isinstance(value, (int, float)):
+        return (3, value)
+
+    if isinstance(value, str):
+        return (4, value)
+
+    return (5, 0)
+
+
+# Gets the value at a path of a document. Projected documents keep only the last name of the path and
+# the documents of a 'SELECT VALUE' are the values themselves.
+def _resolve(document: any, path: tuple[str]) -> any:
+    if len(path) == 0 or not isinstance(document, dict):
+        return document
+
+    value = document
+    for part in path:
+        if not isinstance(value, dict) or part not in value:
+            value = MISSING
+            break
+
+        value = value[part]
+
+    if value is MISSING:
+        return document.get(path[-1], MISSING)
+
+    return value
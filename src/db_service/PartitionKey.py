@@ -0,0 +1,32 @@
+"""
+Helpers for working with the partition key of a container.
+"""
+
+def get_partition_key(item: dict[str, any], partition_key_path: str):
+    """
+    Gets the partition key value of an item.
+
+    Parameters
+    ----------
+    item: dict[str, any]
+        The document to read the partition key from.
+
+    partition_key_path: str
+        The partition key path of the container, e.g. '/user' or '/owner/id'.
+
+    Returns
+    -------
+    any
+        The partition key value. 'None' if the path is not defined or the item does not have it.
+    """
+    if not partition_key_path or item is None:
+        return None
+
+    value = item
+    for part in partition_key_path.strip("/").split("/"):
+        if not isinstance(value, dict) or part not in value:
+            return None
+
+        value = value[part]
+
+    return value
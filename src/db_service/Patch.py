@@ -0,0 +1,105 @@
+"""
+Builders for the operations of a partial document update.
+
+    db_service.patch("account::1", "user", [Patch.incr("/balance", 25), Patch.set("/updated", now)])
+"""
+
+# The most operations Cosmos DB applies in a single patch.
+MAX_PATCH_OPERATIONS = 10
+
+# The operations of a patch.
+PATCH_OPERATIONS = ("add", "set", "replace", "remove", "incr", "move")
+
+class Patch:
+    """
+    Builds the operations of a partial document update. Paths are JSON pointers, e.g. '/balance' or '/tags/0'.
+
+    Methods
+    -------
+    set(path, value)
+        Sets a property, adding it if it is missing.
+
+    incr(path, value)
+        Increments a number by a value, adding the property if it is missing.
+
+    add(path, value)
+        Adds a property or inserts an array element. The path '/tags/-' appends to an array.
+
+    replace(path, value)
+        Replaces a property that must exist.
+
+    remove(path)
+        Removes a property that must exist.
+
+    move(from_path, path)
+        Moves a property to another path.
+    """
+
+    @staticmethod
+    def set(path: str, value: any) -> dict[str, any]:
+        return { "op": "set", "path": path, "value": value }
+
+
+    @staticmethod
+    def incr(path: str, value: float) -> dict[str, any]:
+        return { "op": "incr", "path": path, "value": value }
+
+
+    @staticmethod
+    def add(path: str, value: any) -> dict[str, any]:
+        return { "op": "add", "path": path, "value": value }
+
+
+    @staticmethod
+    def replace(path: str, value: any) -> dict[str, any]:
+        return { "op": "replace", "path": path, "value": value }
+
+
+    @staticmethod
+    def remove(path: str) -> dict[str, any]:
+        return { "op": "remove", "path": path }
+
+
+    @staticmethod
+    def move(from_path: str, path: str) -> dict[str, any]:
+        return { "op": "move", "from": from_path, "path": path }
+
+
+def validate_patch_operations(operations: list[dict[str, any]]) -> None:
+    """
+    Validates the operations of a patch.
+
+    Parameters
+    ----------
+    operations: list[dict[str, any]]
+        The operations to validate.
+
+    Raises
+    ------
+    TypeError
+        Raised if the operations are not defined.
+
+    ValueError
+        Raised if there are no or too many operations, or an operation is unknown or incomplete.
+    """
+    if operations is None:
+        raise TypeError("The patch operations must be defined.")
+
+    if len(operations) == 0 or len(operations) > MAX_PATCH_OPERATIONS:
+        raise ValueError("A patch must have between 1 and {0} operations.".format(MAX_PATCH_OPERATIONS))
+
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get("op") not in PATCH_OPERATIONS:
+            raise ValueError("Unknown patch operation: {0}".format(operation))
+
+        if not str(operation.get("path", "")).startswith("/"):
+            raise ValueError("The path of a patch operation must start with '/': {0}".format(operation))
+
+        if operation["op"] == "move" and not str(operation.get("from", "")).startswith("/"):
+            raise ValueError("A move must have a 'from' path starting with '/': {0}".format(operation))
+
+        if operation["op"] not in ("remove", "move") and "value" not in operation:
+            raise ValueError("A {0} must have a value: {1}".format(operation["op"], operation))
+
+        if operation["op"] == "incr" and (isinstance(operation["value"], bool) or not isinstance(operation["value"], (int, float))):
+            raise ValueError("An incr must have a number value: {0}".format(operation))
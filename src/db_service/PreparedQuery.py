@@ -0,0 +1,214 @@
+import json
+import re
+from src.db_service.Query import LITERAL_PATTERN, Query, find_partition_key_source, parse_literal
+
+# Matches the '@name' parameters of a query string.
+PARAMETER_PATTERN = re.compile(r"@\w+")
+
+class PreparedQuery:
+    """
+    A query template compiled once and executed many times with different parameter values.
+
+    Compiling checks the query string, finds its '@' parameters and computes its canonical form, statement and
+    fingerprint, so executing it only binds the values. The partition key it is routed by is found once per
+    partition key path, so executing it only looks up the bound value.
+
+        by_age = PreparedQuery("SELECT * FROM c WHERE c.age > @age")
+        result = db_service.query(by_age.bind({ "@age": 30 }))
+
+    Attributes
+    ----------
+    query_str: str
+        The query string of the template.
+
+    parameter_names: tuple[str]
+        The '@' parameters of the query string, in order of first use.
+
+    statement: str
+        The query string with whitespace collapsed and its literals replaced by '?'.
+
+    fingerprint: str
+        The identifier of the shape of the query.
+
+    Methods
+    -------
+    bind(where_params, partition_key)
+        Binds values to the parameters, giving a query ready to execute.
+
+    partition_key_route(partition_key_path)
+        Finds the parameter or literal value the query filters the partition key on.
+    """
+
+    def __init__(self, query_str: str, enable_cross_partition_query: bool=True, cache_ttl: float=None,
+                 cache_tags: list[str]=None, max_item_count: int=None, max_degree_of_parallelism: int=None,
+                 fields: list[str]=None):
+        """
+        Parameters
+        ----------
+        query_str: str
+            The query string to execute, with an '@' parameter for every value bound later.
+
+        enable_cross_partition_query: bool
+            Should be 'True' if the container is partitioned. 'True' by default.
+
+        cache_ttl: float
+            The seconds the result may be served from the query result cache. 'None' by default, which never caches.
+
+        cache_tags: list[str]
+            The tags the cached result can be invalidated by. 'None' by default.
+
+        max_item_count: int
+            The most documents returned per page. 'None' by default, which uses the SDK's default.
+
+        max_degree_of_parallelism: int
+            The most feed ranges read at once when the query fans out to every partition. 'None' by default,
+            which uses the db options' degree of parallelism.
+
+        fields: list[str]
+            The top-level properties to return of every document, replacing the '*' of the query string.
+            'None' by default, which returns what the query string selects.
+
+        Raises
+        ------
+        ValueError
+            Raised if the query_str is not defined, the max_item_count or max_degree_of_parallelism are not positive
+            or fields are given for a query string that does not select '*'.
+        """
+        template = Query(query_str, None, enable_cross_partition_query, cache_ttl, cache_tags, max_item_count,
+                         max_degree_of_parallelism=max_degree_of_parallelism, fields=fields)
+        query_str = template.query_str
+
+        self.query_str = query_str
+        self.enable_cross_partition_query = enable_cross_partition_query
+        self.cache_ttl = cache_ttl
+        self.cache_tags = cache_tags
+        self.max_item_count = max_item_count
+        self.max_degree_of_parallelism = max_degree_of_parallelism
+        self.fields = fields
+
+        normalized = " ".join(query_str.split())
+        without_literals = LITERAL_PATTERN.sub("?", normalized)
+
+        self.parameter_names = tuple(dict.fromkeys(PARAMETER_PATTERN.findall(without_literals)))
+        self.statement = without_literals
+        self.fingerprint = template.fingerprint()
+        self.normalized = normalized
+        self.__routes = dict()
+
+
+    def bind(self, where_params: dict[str, any]=None, partition_key: any=None) -> "BoundQuery":
+        """
+        Binds values to the parameters, giving a query ready to execute.
+
+        Parameters
+        ----------
+        where_params: dict[str, any]
+            The value of every parameter of the query string, keyed by its '@' name. 'None' by default,
+            for query strings without parameters.
+
+        partition_key: any
+            The partition key the query is scoped to. 'None' by default, which routes the query by an equality
+            filter on the container's partition key path when it has one.
+
+        Returns
+        -------
+        BoundQuery
+            The query to execute.
+
+        Raises
+        ------
+        ValueError
+            Raised if a parameter of the query string has no value or a value is given for an unknown parameter.
+        """
+        where_params = where_params or {}
+
+        if len(where_params) != len(self.parameter_names) or any(name not in where_params for name in self.parameter_names):
+            missing = [name for name in self.parameter_names if name not in where_params]
+            unknown = [name for name in where_params if name not in self.parameter_names]
+
+            raise ValueError("Parameters do not match the query. Missing: {0}. Unknown: {1}.".format(missing, unknown))
+
+        return BoundQuery(self, where_params, partition_key)
+
+
+    def partition_key_route(self, partition_key_path: str) -> tuple[str, any]:
+        """
+        Finds the parameter or literal value the query filters the partition key on. Found once per path.
+
+        Parameters
+        ----------
+        partition_key_path: str
+            The partition key path of the container, e.g. '/user'.
+
+        Returns
+        -------
+        tuple[str, any]
+            The '@' parameter holding the partition key, or 'None' and the literal partition key.
+            '(None, None)' if the filter does not restrict the query to a single partition key.
+        """
+        route = self.__routes.get(partition_key_path)
+
+        if route is None:
+            source = find_partition_key_source(self.query_str, partition_key_path)
+
+            if source is None:
+                route = (None, None)
+
+            elif source.startswith("@"):
+                route = (source, None)
+
+            else:
+                route = (None, parse_literal(source))
+
+            self.__routes[partition_key_path] = route
+
+        return route
+
+
+class BoundQuery(Query):
+    """
+    A prepared query with values bound to its parameters. Reuses what the prepared query computed and checked
+    instead of computing it again on every execution.
+    """
+
+    def __init__(self, prepared: PreparedQuery, where_params: dict[str, any], partition_key: any=None):
+        # The prepared query already checked the options, so they are not checked again.
+        self.query_str = prepared.query_str
+        self.fields = prepared.fields
+        self.where_params = where_params
+        self.enable_cross_partition_query = prepared.enable_cross_partition_query
+        self.cache_ttl = prepared.cache_ttl
+        self.cache_tags = prepared.cache_tags
+        self.max_item_count = prepared.max_item_count
+        self.partition_key = partition_key
+        self.max_degree_of_parallelism = prepared.max_degree_of_parallelism
+        self.prepared = prepared
+
+
+    def find_partition_key(self, partition_key_path: str) -> any:
+        parameter, value = self.prepared.partition_key_route(partition_key_path)
+
+        return self.where_params[parameter] if parameter is not None else value
+
+
+    def build_where_params(self) -> list[dict[str, object]]:
+        if len(self.prepared.parameter_names) == 0:
+            return None
+
+        return [{ "name": name, "value": self.where_params[name] } for name in self.prepared.parameter_names]
+
+
+    def cache_key(self) -> tuple:
+        params = None
+        if len(self.prepared.parameter_names) > 0:
+            params = json.dumps(self.where_params, sort_keys=True, default=str)
+
+        return (self.prepared.normalized, params, self.enable_cross_partition_query, self.partition_key)
+
+
+    def statement(self) -> str:
+        return self.prepared.statement
+
+
+    def fingerprint(self) -> str:
+        return self.prepared.fingerprint
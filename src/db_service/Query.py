@@ -1,11 +1,155 @@
+import hashlib
 import json
+import re
+
+# Matches the string and number literals of a query string, which are left out of its fingerprint.
+LITERAL_PATTERN = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|(?<![\w@.])-?\d+(?:\.\d+)?\b")
+
+# Matches the collection and alias queried, e.g. 'FROM c' or 'FROM users u'.
+FROM_PATTERN = re.compile(r"\bFROM\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:WHERE|JOIN|ORDER|GROUP|OFFSET)\b)(\w+))?", re.IGNORECASE)
+
+# Matches the filter of a query up to its ordering, grouping or paging.
+WHERE_PATTERN = re.compile(r"\bWHERE\b(.*?)(?:\bORDER\s+BY\b|\bGROUP\s+BY\b|\bOFFSET\b|$)", re.IGNORECASE | re.DOTALL)
+
+# Matches the operators that keep an equality from restricting every document of a filter.
+DISJUNCTION_PATTERN = re.compile(r"\b(?:OR|NOT)\b", re.IGNORECASE)
+
+# Matches a query selecting whole documents, e.g. 'SELECT * FROM c' or 'SELECT TOP 10 * FROM users u'.
+SELECT_ALL_PATTERN = re.compile(r"^(\s*SELECT\s+(?:TOP\s+(?:\d+|@\w+)\s+)?(?:DISTINCT\s+)?)\*(?=\s+FROM\b)", re.IGNORECASE)
+
+# Matches the name of a property that can be selected.
+FIELD_PATTERN = re.compile(r"^[A-Za-z_]\w*$")
+
+# Matches the value compared to: a parameter, string, number or boolean.
+VALUE_PATTERN = r"(@\w+|'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|-?\d+(?:\.\d+)?\b|(?i:true|false)\b)"
+
+def build_projection(fields: list[str], alias: str="c") -> str:
+    """
+    Builds the select list returning the given properties of every document.
+
+    Parameters
+    ----------
+    fields: list[str]
+        The names of the top-level properties to return.
+
+    alias: str
+        The alias of the documents queried. 'c' by default.
+
+    Returns
+    -------
+    str
+        The select list, e.g. 'c.id, c.amount'.
+
+    Raises
+    ------
+    ValueError
+        Raised if no fields are given or a field is not a property name.
+    """
+    if fields is None or len(fields) == 0:
+        raise ValueError("'fields' must name at least one property.")
+
+    for field in fields:
+        if not isinstance(field, str) or not FIELD_PATTERN.match(field):
+            raise ValueError("'fields' must be property names, got '{0}'.".format(field))
+
+    return ", ".join("{0}.{1}".format(alias, field) for field in dict.fromkeys(fields))
+
+
+def project(query_str: str, fields: list[str]) -> str:
+    """
+    Replaces the '*' of a query string with a select list returning the given properties.
+
+    Parameters
+    ----------
+    query_str: str
+        The query string, selecting '*'.
+
+    fields: list[str]
+        The names of the top-level properties to return.
+
+    Returns
+    -------
+    str
+        The query string selecting the properties.
+
+    Raises
+    ------
+    ValueError
+        Raised if the query string does not select '*' or a field is not a property name.
+    """
+    select_all = SELECT_ALL_PATTERN.match(query_str or "")
+
+    if select_all is None:
+        raise ValueError("'fields' can only be given for a query string selecting '*'.")
+
+    source = FROM_PATTERN.search(query_str, select_all.end())
+    projection = build_projection(fields, source.group(2) or source.group(1))
+
+    return select_all.group(1) + projection + query_str[select_all.end():]
+
+
+def find_partition_key_source(query_str: str, partition_key_path: str) -> str:
+    """
+    Finds the value a query string's filter compares the partition key to with an equality that every result
+    must match, e.g. '@user' for 'c.user = @user' and the path '/user'.
+
+    Parameters
+    ----------
+    query_str: str
+        The query string.
+
+    partition_key_path: str
+        The partition key path of the container, e.g. '/user'.
+
+    Returns
+    -------
+    str
+        The '@' parameter or literal compared to, or 'None' if the filter does not restrict the query to a single
+        partition key.
+    """
+    where = WHERE_PATTERN.search(query_str)
+    source = FROM_PATTERN.search(query_str)
+
+    if where is None or source is None or DISJUNCTION_PATTERN.search(where.group(1)):
+        return None
+
+    alias = re.escape(source.group(2) or source.group(1))
+    path = "".join(r"(?:\.{0}|\[\s*['\"]{0}['\"]\s*\])".format(re.escape(p)) for p in partition_key_path.strip("/").split("/"))
+
+    # Property names are case sensitive, only the keywords of the filter are not.
+    equality = re.search(r"(?<![\w.]){0}{1}\s*=\s*{2}".format(alias, path, VALUE_PATTERN), where.group(1))
+
+    return equality.group(1) if equality is not None else None
+
+
+def parse_literal(literal: str) -> any:
+    """
+    Parses a string, number or boolean literal of a query string.
+
+    Parameters
+    ----------
+    literal: str
+        The literal, e.g. "'user'", '7' or 'true'.
+
+    Returns
+    -------
+    any
+        The value of the literal.
+    """
+    if literal.startswith("'"):
+        return re.sub(r"\\(.)", r"\1", literal[1:-1])
+
+    return json.loads(literal.lower() if literal.lower() in ("true", "false") else literal)
+
 
 class Query:
     """
     Specifies how to query the database
     """
 
-    def __init__(self, query_str: str, where_params: dict[str, any]=None, enable_cross_partition_query=True):
+    def __init__(self, query_str: str, where_params: dict[str, any]=None, enable_cross_partition_query=True,
+                 cache_ttl: float=None, cache_tags: list[str]=None, max_item_count: int=None, partition_key: any=None,
+                 max_degree_of_parallelism: int=None, fields: list[str]=None):
         """
         Parameters
         ----------
@@ -22,18 +166,56 @@ class Query:
 
         enable_cross_partition_query: bool
             Should be 'True' if the container is partitioned. 'True' by default.
+            Ignored when the query is scoped to a partition key.
+
+        cache_ttl: float
+            The seconds the result may be served from the query result cache. 'None' by default, which never caches.
+
+        cache_tags: list[str]
+            The tags the cached result can be invalidated by. 'None' by default.
+
+        max_item_count: int
+            The most documents returned per page. 'None' by default, which uses the SDK's default.
+
+        partition_key: any
+            The partition key the query is scoped to, so it is served by a single partition. 'None' by default,
+            which routes the query by an equality filter on the container's partition key path when it has one.
+
+        max_degree_of_parallelism: int
+            The most feed ranges read at once when the query fans out to every partition. 'None' by default,
+            which uses the db options' degree of parallelism.
+
+        fields: list[str]
+            The top-level properties to return of every document, replacing the '*' of the query string.
+            'None' by default, which returns what the query string selects.
         
         Raises
         ------
         ValueError
-            Raised if the query_str is not defined.
+            Raised if the query_str is not defined, the max_item_count or max_degree_of_parallelism are not positive
+            or fields are given for a query string that does not select '*'.
         """
         if query_str is None or query_str.isspace():
             raise ValueError("'query_str' must be defined.")
 
+        if max_item_count is not None and max_item_count <= 0:
+            raise ValueError("'max_item_count' must be greater than 0.")
+
+        if max_degree_of_parallelism is not None and max_degree_of_parallelism <= 0:
+            raise ValueError("'max_degree_of_parallelism' must be greater than 0.")
+
+        if fields is not None:
+            query_str = project(query_str, fields)
+
         self.query_str = query_str
+        self.fields = fields
         self.where_params = where_params
         self.enable_cross_partition_query = enable_cross_partition_query
+        self.cache_ttl = cache_ttl
+        self.cache_tags = cache_tags
+        self.max_item_count = max_item_count
+        self.partition_key = partition_key
+        self.max_degree_of_parallelism = max_degree_of_parallelism
 
 
     def build_where_params(self) -> list[dict[str, object]]:
@@ -55,6 +237,127 @@ class Query:
         return param_list
 
 
+    def build_query_options(self, partition_key_path: str=None) -> dict[str, object]:
+        """
+        Builds the keyword arguments for the database API's query.
+
+        Parameters
+        ----------
+        partition_key_path: str
+            The partition key path of the container, e.g. '/user'. 'None' by default.
+            Used to scope the query to the partition key it filters on when it is not given one.
+
+        Returns
+        -------
+        dict[str, object]
+            The parameters, partition key or cross partition flag and page size of the query.
+        """
+        partition_key = self.scoped_partition_key(partition_key_path)
+
+        if partition_key is not None:
+            options = { "partition_key": partition_key }
+
+        else:
+            options = { "enable_cross_partition_query": self.enable_cross_partition_query }
+
+        params = self.build_where_params()
+        if params is not None:
+            options["parameters"] = params
+
+        if self.max_item_count is not None:
+            options["max_item_count"] = self.max_item_count
+
+        return options
+
+
+    def scoped_partition_key(self, partition_key_path: str=None) -> any:
+        """
+        Gets the partition key the query is scoped to, the one given or else the one its filter restricts it to.
+
+        Parameters
+        ----------
+        partition_key_path: str
+            The partition key path of the container, e.g. '/user'. 'None' by default.
+
+        Returns
+        -------
+        any
+            The partition key, or 'None' if the query fans out to every partition.
+        """
+        if self.partition_key is not None or partition_key_path is None:
+            return self.partition_key
+
+        return self.find_partition_key(partition_key_path)
+
+
+    def find_partition_key(self, partition_key_path: str) -> any:
+        """
+        Finds the partition key the query filters on with an equality that every result must match,
+        e.g. 'c.user = @user' for the path '/user'.
+
+        Parameters
+        ----------
+        partition_key_path: str
+            The partition key path of the container, e.g. '/user'.
+
+        Returns
+        -------
+        any
+            The partition key, or 'None' if the filter does not restrict the query to a single partition key.
+        """
+        value = find_partition_key_source(self.query_str, partition_key_path)
+
+        if value is None:
+            return None
+
+        if value.startswith("@"):
+            return (self.where_params or {}).get(value)
+
+        return parse_literal(value)
+
+
+    def cache_key(self) -> tuple:
+        """
+        Builds the key of the query in the query result cache from the canonical form of the query.
+
+        Returns
+        -------
+        tuple
+            The query string with whitespace collapsed, the sorted where parameters, the cross partition flag
+            and the partition key.
+        """
+        params = None
+        if self.where_params is not None and len(self.where_params) > 0:
+            params = json.dumps(self.where_params, sort_keys=True, default=str)
+
+        return (" ".join(self.query_str.split()), params, self.enable_cross_partition_query, self.partition_key)
+
+
+    def statement(self) -> str:
+        """
+        Builds the shape of the query: the query string with whitespace collapsed and its literals replaced by '?'.
+
+        Returns
+        -------
+        str
+            The query string without its literals, safe to write into logs and metrics.
+        """
+        return LITERAL_PATTERN.sub("?", " ".join(self.query_str.split()))
+
+
+    def fingerprint(self) -> str:
+        """
+        Builds a short, stable identifier of the shape of the query, so its executions can be grouped
+        whatever parameters or literals they ran with.
+
+        Returns
+        -------
+        str
+            The first 16 hex characters of the SHA-256 of the query's statement.
+        """
+        return hashlib.sha256(self.statement().encode("utf-8")).hexdigest()[:16]
+
+
     def __str__(self) -> str:
         formatted_where_params = "Not defined."
 
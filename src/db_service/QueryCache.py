@@ -0,0 +1,264 @@
+import threading
+import time
+from collections import OrderedDict
+
+class QueryCacheEntry:
+    """
+    A query result held in the cache.
+
+    Attributes
+    ----------
+    value: bytes
+        The cached documents as JSON bytes. 'None' if the query had no results.
+
+    size: int
+        The size of the result in bytes.
+
+    documents: int
+        The number of cached documents.
+
+    expires_at: float
+        The monotonic time the entry expires.
+
+    tags: set[str]
+        The tags the entry can be invalidated by.
+
+    partition_keys: set
+        The partition keys of the cached documents.
+    """
+
+    def __init__(self, value: bytes, size: int, ttl: float, tags: set[str], partition_keys: set, documents: int=0):
+        """
+        Parameters
+        ----------
+        value: bytes
+            The cached documents as JSON bytes. 'None' if the query had no results.
+
+        size: int
+            The size of the result in bytes.
+
+        ttl: float
+            The seconds the entry is served.
+
+        tags: set[str]
+            The tags the entry can be invalidated by.
+
+        partition_keys: set
+            The partition keys of the cached documents.
+
+        documents: int
+            The number of cached documents. '0' by default.
+        """
+        self.value = value
+        self.size = size
+        self.documents = documents
+        self.expires_at = time.monotonic() + ttl
+        self.tags = tags
+        self.partition_keys = partition_keys
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results bounded by the total size of the results in bytes.
+
+    Attributes
+    ----------
+    max_bytes: int
+        The most bytes of results held before the least recently used results are evicted.
+
+    size: int
+        The bytes of results currently held.
+
+    hits: int
+        The number of lookups answered from the cache.
+
+    misses: int
+        The number of lookups that found no unexpired result.
+
+    evictions: int
+        The number of results evicted to stay within the max bytes.
+
+    Methods
+    -------
+    get(key)
+        Gets an unexpired entry.
+
+    put(key, value, size, ttl, tags, partition_keys)
+        Adds or replaces an entry.
+
+    invalidate(tag, partition_key)
+        Removes the entries with a tag or holding documents of a partition.
+
+    clear()
+        Removes every entry.
+
+    stats()
+        Gets the cache counters.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Parameters
+        ----------
+        max_bytes: int
+            The most bytes of results held before the least recently used results are evicted.
+
+        Raises
+        ------
+        ValueError
+            Raised if the max bytes are not positive.
+        """
+        if max_bytes is None or max_bytes <= 0:
+            raise ValueError("'max_bytes' must be greater than 0.")
+
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+
+    def get(self, key: tuple) -> QueryCacheEntry:
+        """
+        Gets an unexpired entry. Expired entries are removed.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the entry.
+
+        Returns
+        -------
+        QueryCacheEntry
+            The entry. 'None' if there is none.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self.__remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+
+            return entry
+
+
+    def put(self, key: tuple, value: bytes, size: int, ttl: float, tags: list[str]=None, partition_keys: set=None,
+            documents: int=0) -> None:
+        """
+        Adds or replaces an entry, evicting the least recently used entries until the results fit.
+        Results larger than the max bytes are not cached.
+
+        Parameters
+        ----------
+        key: tuple
+            The key of the entry.
+
+        value: bytes
+            The documents to cache as JSON bytes. 'None' if the query had no results.
+
+        size: int
+            The size of the result in bytes.
+
+        ttl: float
+            The seconds the entry is served.
+
+        tags: list[str]
+            The tags the entry can be invalidated by. 'None' by default.
+
+        partition_keys: set
+            The partition keys of the cached documents. 'None' by default.
+
+        documents: int
+            The number of cached documents. '0' by default.
+        """
+        if size > self.max_bytes:
+            return
+
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+
+            self.__entries[key] = QueryCacheEntry(value, size, ttl, set(tags or []), set(partition_keys or []), documents)
+            self.size += size
+
+            while self.size > self.max_bytes:
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+
+
+    def invalidate(self, tag: str=None, partition_key=None) -> int:
+        """
+        Removes the entries with a tag or holding documents of a partition.
+
+        Parameters
+        ----------
+        tag: str
+            The tag of the entries to remove. 'None' by default.
+
+        partition_key: any
+            The partition key of the entries to remove. 'None' by default.
+
+        Returns
+        -------
+        int
+            The number of entries removed.
+        """
+        with self.__lock:
+            keys = [
+                k for k, e in self.__entries.items()
+                if (tag is not None and tag in e.tags) or (partition_key is not None and partition_key in e.partition_keys)]
+
+            for key in keys:
+                self.__remove(key)
+
+            return len(keys)
+
+
+    def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.size = 0
+
+
+    def stats(self) -> dict[str, int]:
+        """
+        Gets the cache counters.
+
+        Returns
+        -------
+        dict[str, int]
+            The entries, bytes, hits, misses and evictions of the cache.
+        """
+        with self.__lock:
+            return {
+                "entries": len(self.__entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+    """
+    Private Methods
+    """
+
+    # Removes an entry and its size. The lock must be held.
+    def __remove(self, key: tuple) -> None:
+        self.size -= self.__entries.pop(key).size
@@ -0,0 +1,229 @@
+import queue
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from src.db_service.Metrics import Histogram
+
+class Priority(IntEnum):
+    """
+    The lanes requests are scheduled in. Lower values are served first.
+    """
+
+    INTERACTIVE = 0
+    """Latency sensitive requests, e.g. reads serving a web request."""
+
+    BULK = 1
+    """Throughput oriented requests, e.g. reconciliation jobs and bulk writes."""
+
+
+class Scheduler:
+    """
+    Thread-safe scheduler limiting how many requests run at once, with a bounded queue per priority.
+
+    Whenever a request completes, the next request is taken from the highest priority lane that is below its
+    own concurrency limit, so waiting interactive requests always go ahead of queued bulk work. Bulk requests
+    are limited to one less than the total by default, so one slot is always left for interactive requests.
+    With a max concurrency of '1' there is no slot to spare, so bulk requests get the only slot and interactive
+    requests are only served ahead of queued bulk work, not ahead of bulk work already running.
+
+    Attributes
+    ----------
+    max_concurrency: int
+        The most requests running at once.
+
+    max_queue_size: int
+        The most requests waiting in each lane.
+
+    lane_concurrency: dict[Priority, int]
+        The most requests of each lane running at once.
+
+    Methods
+    -------
+    run(operation, priority, timeout)
+        Runs an operation once a slot is available to its lane.
+
+    stats()
+        Gets the queue depth, concurrency and wait times of every lane.
+    """
+
+    def __init__(self, max_concurrency: int=8, max_queue_size: int=1000, lane_concurrency: dict[Priority, int]=None):
+        """
+        Parameters
+        ----------
+        max_concurrency: int
+            The most requests running at once. '8' by default.
+
+        max_queue_size: int
+            The most requests waiting in each lane before more are rejected. '1000' by default.
+
+        lane_concurrency: dict[Priority, int]
+            The most requests of a lane running at once. 'None' by default, which limits bulk requests to
+            one less than the max concurrency, or to '1' when the max concurrency is '1'.
+
+        Raises
+        ------
+        ValueError
+            Raised if the max concurrency or max queue size are not positive.
+        """
+        if max_concurrency is None or max_concurrency <= 0:
+            raise ValueError("'max_concurrency' must be greater than 0.")
+
+        if max_queue_size is None or max_queue_size <= 0:
+            raise ValueError("'max_queue_size' must be greater than 0.")
+
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.lane_concurrency = { p: max_concurrency for p in Priority }
+        self.lane_concurrency[Priority.BULK] = max(1, max_concurrency - 1)
+        self.lane_concurrency.update(lane_concurrency or {})
+
+        self.__condition = threading.Condition()
+        self.__running = 0
+        self.__lanes = { p: Lane() for p in Priority }
+
+
+    def run(self, operation, priority: Priority=Priority.INTERACTIVE, timeout: float=None):
+        """
+        Runs an operation once a slot is available to its lane.
+
+        Parameters
+        ----------
+        operation: Callable[[], any]
+            The operation to run.
+
+        priority: Priority
+            The lane of the operation. 'Priority.INTERACTIVE' by default.
+
+        timeout: float
+            The most seconds to wait for a slot. 'None' by default, which waits as long as it takes.
+
+        Returns
+        -------
+        any
+            The result of the operation.
+
+        Raises
+        ------
+        queue.Full
+            Raised if the lane's queue is full.
+
+        TimeoutError
+            Raised if no slot became available within the timeout.
+        """
+        self.__acquire(priority, timeout)
+
+        try:
+            return operation()
+
+        finally:
+            self.__release(priority)
+
+
+    def stats(self) -> dict[str, dict[str, any]]:
+        """
+        Gets the queue depth, concurrency and wait times of every lane.
+
+        Returns
+        -------
+        dict[str, dict[str, any]]
+            Per lane name, the requests queued and running, the most ever queued, the requests rejected
+            because the queue was full and the distribution of the seconds waited for a slot.
+        """
+        with self.__condition:
+            return {
+                priority.name.lower(): {
+                    "queued": len(lane.waiters),
+                    "running": lane.running,
+                    "max_queued": lane.max_queued,
+                    "rejected": lane.rejected,
+                    "wait": lane.waits.to_dict()
+                }
+                for priority, lane in self.__lanes.items()
+            }
+
+
+    """
+    Private Methods
+    """
+
+    # Waits for a slot for the lane, queueing behind earlier requests of the lane.
+    def __acquire(self, priority: Priority, timeout: float) -> None:
+        lane = self.__lanes[priority]
+
+        with self.__condition:
+            if not lane.waiters and self.__can_start(priority):
+                self.__start(priority, 0.0)
+                return
+
+            if len(lane.waiters) >= self.max_queue_size:
+                lane.rejected += 1
+                raise queue.Full("The {0} queue is full.".format(priority.name.lower()))
+
+            waiter = object()
+            lane.waiters.append(waiter)
+            lane.max_queued = max(lane.max_queued, len(lane.waiters))
+
+            queued_at = time.monotonic()
+            deadline = None if timeout is None else queued_at + timeout
+
+            while not (lane.waiters[0] is waiter and self.__can_start(priority)):
+                remaining = None if deadline is None else deadline - time.monotonic()
+
+                if remaining is not None and remaining <= 0:
+                    lane.waiters.remove(waiter)
+                    self.__condition.notify_all()
+                    raise TimeoutError("Timed out waiting for a {0} slot.".format(priority.name.lower()))
+
+                self.__condition.wait(remaining)
+
+            lane.waiters.popleft()
+            self.__start(priority, time.monotonic() - queued_at)
+            self.__condition.notify_all() # The next waiter of the lane may be able to start too.
+
+
+    # Gives the slot back and wakes the waiters. Must not hold the lock.
+    def __release(self, priority: Priority) -> None:
+        with self.__condition:
+            self.__running -= 1
+            self.__lanes[priority].running -= 1
+            self.__condition.notify_all()
+
+
+    # Takes a slot for the lane. Must hold the lock.
+    def __start(self, priority: Priority, waited: float) -> None:
+        lane = self.__lanes[priority]
+        lane.running += 1
+        lane.waits.record(waited)
+        self.__running += 1
+
+
+    # Checks a request of the lane may start: a slot is free, the lane is below its limit and no higher
+    # priority lane is waiting for the slot. Must hold the lock.
+    def __can_start(self, priority: Priority) -> bool:
+        if self.__running >= self.max_concurrency or self.__lanes[priority].running >= self.lane_concurrency[priority]:
+            return False
+
+        for higher in Priority:
+            if higher >= priority:
+                break
+
+            lane = self.__lanes[higher]
+
+            if lane.waiters and lane.running < self.lane_concurrency[higher]:
+                return False
+
+        return True
+
+
+class Lane:
+    """
+    The requests of a priority waiting for or holding a slot.
+    """
+
+    def __init__(self):
+        self.waiters = deque()
+        self.running = 0
+        self.max_queued = 0
+        self.rejected = 0
+        self.waits = Histogram()
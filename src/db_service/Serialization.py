@@ -0,0 +1,125 @@
+"""
+Serialization of the documents returned by the database services.
+"""
+
+import json
+from enum import Enum
+
+try: # orjson is optional, json is used when it is not installed.
+    import orjson
+except ImportError:
+    orjson = None
+
+class ReturnFormat(Enum):
+    """
+    The form documents are returned in.
+
+    STR
+        A JSON string, encoded with json.dumps. The default, for compatibility.
+
+    NATIVE
+        The parsed Python objects, without any encoding.
+
+    BYTES
+        Pre-encoded UTF-8 JSON bytes, encoded with orjson when it is installed.
+    """
+
+    STR = "str"
+    NATIVE = "native"
+    BYTES = "bytes"
+
+
+def dumps_bytes(obj: any) -> bytes:
+    """
+    Encodes an object as UTF-8 JSON bytes with the fastest encoder available.
+
+    Parameters
+    ----------
+    obj: any
+        The object to encode.
+
+    Returns
+    -------
+    bytes
+        The JSON document.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+
+        except TypeError: # e.g. integers larger than 64 bits.
+            pass
+
+    return json.dumps(obj).encode("utf-8")
+
+
+def loads_bytes(data: bytes) -> any:
+    """
+    Decodes UTF-8 JSON bytes with the fastest decoder available.
+
+    Parameters
+    ----------
+    data: bytes
+        The JSON document.
+
+    Returns
+    -------
+    any
+        The decoded object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def serialize(obj: any, return_format: ReturnFormat) -> any:
+    """
+    Converts documents to the given return format.
+
+    Parameters
+    ----------
+    obj: any
+        The documents to convert.
+
+    return_format: ReturnFormat
+        The form to return the documents in.
+
+    Returns
+    -------
+    any
+        The documents as a JSON string, the objects themselves or JSON bytes.
+    """
+    if return_format == ReturnFormat.NATIVE:
+        return obj
+
+    if return_format == ReturnFormat.BYTES:
+        return dumps_bytes(obj)
+
+    return json.dumps(obj)
+
+
+def from_bytes(data: bytes, return_format: ReturnFormat) -> any:
+    """
+    Converts documents held as JSON bytes to the given return format.
+
+    Parameters
+    ----------
+    data: bytes
+        The JSON document.
+
+    return_format: ReturnFormat
+        The form to return the documents in.
+
+    Returns
+    -------
+    any
+        The documents as a JSON string, new objects or the JSON bytes themselves.
+    """
+    if return_format == ReturnFormat.NATIVE:
+        return loads_bytes(data)
+
+    if return_format == ReturnFormat.BYTES:
+        return data
+
+    return data.decode("utf-8")
@@ -0,0 +1,179 @@
+import threading
+from src.db_service.LazyImport import LazyModule
+
+# Only the async variant needs asyncio, so it is imported on first use.
+asyncio = LazyModule("asyncio")
+
+class SingleFlight:
+    """
+    Thread-safe deduplication of concurrent identical calls: while a call for a key is in flight, further
+    calls for the key wait for it and share its result or error instead of running their own.
+
+    Attributes
+    ----------
+    executed: int
+        The calls that ran.
+
+    coalesced: int
+        The calls that shared the result of a call already in flight.
+
+    Methods
+    -------
+    do(key, operation)
+        Runs an operation, or waits for the one in flight for the same key.
+
+    stats()
+        Gets the executed and coalesced counts.
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self.__calls = dict()
+        self.__lock = threading.Lock()
+
+
+    def do(self, key: tuple, operation):
+        """
+        Runs an operation, or waits for the one in flight for the same key.
+
+        Parameters
+        ----------
+        key: tuple
+            Identifies calls that return the same result.
+
+        operation: Callable[[], any]
+            The operation to run.
+
+        Returns
+        -------
+        any
+            The result of the operation, shared with every call coalesced into it.
+        """
+        with self.__lock:
+            call = self.__calls.get(key)
+            in_flight = call is not None
+
+            if in_flight:
+                self.coalesced += 1
+
+            else:
+                call = Call()
+                self.__calls[key] = call
+                self.executed += 1
+
+        if in_flight:
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = operation()
+            return call.result
+
+        except BaseException as e:
+            call.error = e
+            raise
+
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+            call.done.set()
+
+
+    def stats(self) -> dict[str, int]:
+        return { "executed": self.executed, "coalesced": self.coalesced }
+
+
+class Call:
+    """
+    A call in flight and, once it completes, its result or error.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class AsyncSingleFlight:
+    """
+    Deduplication of concurrent identical calls on an event loop: while a call for a key is in flight, further
+    calls for the key await it and share its result or error instead of running their own.
+
+    Attributes
+    ----------
+    executed: int
+        The calls that ran.
+
+    coalesced: int
+        The calls that shared the result of a call already in flight.
+
+    Methods
+    -------
+    do(key, operation)
+        Runs an operation, or awaits the one in flight for the same key.
+
+    stats()
+        Gets the executed and coalesced counts.
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self.__calls = dict()
+
+
+    async def do(self, key: tuple, operation):
+        """
+        Runs an operation, or awaits the one in flight for the same key.
+
+        Parameters
+        ----------
+        key: tuple
+            Identifies calls that return the same result.
+
+        operation: Callable[[], Awaitable[any]]
+            Starts the operation to run.
+
+        Returns
+        -------
+        any
+            The result of the operation, shared with every call coalesced into it.
+        """
+        task = self.__calls.get(key)
+
+        if task is not None:
+            self.coalesced += 1
+
+        else:
+            # Run in its own task, so cancelling the caller that started it does not cancel it for the others.
+            task = asyncio.ensure_future(operation())
+            task.add_done_callback(lambda done: self.__finish(key, done))
+            self.__calls[key] = task
+            self.executed += 1
+
+        # Shielded so a caller giving up does not cancel the call for the others.
+        return await asyncio.shield(task)
+
+
+    def stats(self) -> dict[str, int]:
+        return { "executed": self.executed, "coalesced": self.coalesced }
+
+
+    """
+    Private Methods
+    """
+
+    # Forgets a call once it completes, and retrieves its error so it is not reported as unhandled when every
+    # caller gave up on it.
+    def __finish(self, key: tuple, task) -> None:
+        if self.__calls.get(key) is task:
+            del self.__calls[key]
+
+        if not task.cancelled():
+            task.exception()
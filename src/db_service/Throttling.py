@@ -0,0 +1,306 @@
+"""
+Helpers for handling request rate too large (429) responses from the database and for pacing requests
+to a share of the provisioned throughput.
+"""
+
+import logging
+import threading
+import time
+from src.db_service.LazyImport import LazyModule
+
+exceptions = LazyModule("azure.cosmos.exceptions")
+
+TOO_MANY_REQUESTS = 429
+RETRY_AFTER_HEADER = "x-ms-retry-after-ms"
+REQUEST_CHARGE_HEADER = "x-ms-request-charge"
+THROTTLE_RETRY_COUNT_HEADER = "x-ms-throttle-retry-count"
+THROTTLE_RETRY_WAIT_HEADER = "x-ms-throttle-retry-wait-time-ms"
+DEFAULT_RETRY_AFTER = 1.0
+
+# The shortest wait of a rate limiter, so rounding never leaves it spinning.
+MIN_WAIT = 0.001
+
+logger = logging.getLogger(__name__)
+
+def is_throttled(error: Exception) -> bool:
+    """
+    Checks if an error is a request rate too large (429) response.
+
+    Parameters
+    ----------
+    error: Exception
+        The error raised by the database.
+
+    Returns
+    -------
+    bool
+        'True' if the error is a 429 response.
+    """
+    return getattr(error, "status_code", None) == TOO_MANY_REQUESTS and isinstance(error, exceptions.CosmosHttpResponseError)
+
+
+def get_retry_after(error: Exception) -> float:
+    """
+    Gets how long the database asked to wait before retrying.
+
+    Parameters
+    ----------
+    error: Exception
+        The error raised by the database.
+
+    Returns
+    -------
+    float
+        The seconds to wait before retrying.
+    """
+    headers = getattr(error, "headers", None) or {}
+
+    try:
+        return float(headers[RETRY_AFTER_HEADER]) / 1000
+
+    except (KeyError, TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+def get_request_charge(headers: dict[str, str]) -> float:
+    """
+    Gets the request units a response was charged.
+
+    Parameters
+    ----------
+    headers: dict[str, str]
+        The headers of the response.
+
+    Returns
+    -------
+    float
+        The request units charged, '0.0' if the response does not report them.
+    """
+    try:
+        return float(headers.get(REQUEST_CHARGE_HEADER) or 0)
+
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
+def get_throttle_retry_wait(headers: dict[str, str]) -> float:
+    """
+    Gets how long the SDK waited out 429 responses before a request succeeded. The SDK retries throttled
+    requests itself and only reports them in the headers of the response.
+
+    Parameters
+    ----------
+    headers: dict[str, str]
+        The headers of the response.
+
+    Returns
+    -------
+    float
+        The seconds waited, or 'None' if the request was not throttled.
+    """
+    try:
+        if int(headers.get(THROTTLE_RETRY_COUNT_HEADER) or 0) <= 0:
+            return None
+
+        return float(headers.get(THROTTLE_RETRY_WAIT_HEADER) or 0) / 1000
+
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def call_with_retry(operation, max_retries: int=5, rate_limiter: "RateLimiter"=None):
+    """
+    Calls an operation, waiting out the retry-after of each 429 response before trying again.
+
+    Parameters
+    ----------
+    operation: Callable[[], any]
+        The operation to call.
+
+    max_retries: int
+        The number of times to retry a throttled operation. '5' by default.
+
+    rate_limiter: RateLimiter
+        Paces each attempt and is told of each 429, so every caller sharing it backs off. 'None' by default.
+
+    Returns
+    -------
+    any
+        The result of the operation.
+
+    Raises
+    ------
+    CosmosHttpResponseError
+        Raised if the operation is still throttled after all retries.
+    """
+    attempt = 0
+    while True:
+        try:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+
+            return operation()
+
+        except exceptions.CosmosHttpResponseError as e:
+            if not is_throttled(e) or attempt >= max_retries:
+                raise
+
+            attempt += 1
+            retry_after = get_retry_after(e)
+
+            logger.warning("Request throttled, retrying in %ss (attempt %s of %s).", retry_after, attempt, max_retries)
+
+            if rate_limiter is not None: # The next acquire waits out the retry-after.
+                rate_limiter.on_throttled(retry_after)
+
+            else:
+                time.sleep(retry_after)
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket in request units per second, with additive-increase, multiplicative-decrease
+    adaptation to 429 responses.
+
+    Request charges are only known once a response arrives, so callers wait in 'acquire' until the bucket is
+    out of debt and then pay the actual charge with 'consume'. Each 429 halves the rate and pauses every caller
+    for the retry-after the database asked for. The rate then grows back linearly to the configured rate.
+
+    Attributes
+    ----------
+    ru_per_second: float
+        The most request units per second, the rate the limiter recovers to.
+
+    rate: float
+        The current request units per second.
+
+    burst: float
+        The most request units that can be spent at once after a quiet period.
+
+    throttled_count: int
+        The number of 429 responses reported.
+
+    Methods
+    -------
+    acquire()
+        Waits until a request may be sent.
+
+    consume(request_charge)
+        Pays the charge of a response.
+
+    on_throttled(retry_after)
+        Backs off after a 429 response.
+    """
+
+    def __init__(self, ru_per_second: float, burst: float=None, min_rate: float=None, decrease_factor: float=0.5,
+                 recovery_seconds: float=10.0, clock=time.monotonic, sleep=time.sleep):
+        """
+        Parameters
+        ----------
+        ru_per_second: float
+            The most request units per second.
+
+        burst: float
+            The most request units that can be spent at once after a quiet period. One second's worth by default.
+
+        min_rate: float
+            The rate 429 responses cannot push the limiter below. A tenth of the request units per second by default.
+
+        decrease_factor: float
+            The rate is multiplied by this on each 429 response. '0.5' by default.
+
+        recovery_seconds: float
+            The seconds to grow back from the minimum to the full rate without further 429s. '10.0' by default.
+
+        clock: Callable[[], float]
+            The monotonic clock, in seconds. 'time.monotonic' by default.
+
+        sleep: Callable[[float], None]
+            Waits for a number of seconds. 'time.sleep' by default.
+
+        Raises
+        ------
+        ValueError
+            Raised if the request units per second are not positive.
+        """
+        if ru_per_second is None or ru_per_second <= 0:
+            raise ValueError("'ru_per_second' must be greater than 0.")
+
+        self.ru_per_second = ru_per_second
+        self.rate = ru_per_second
+        self.burst = burst if burst is not None else ru_per_second
+        self.min_rate = min_rate if min_rate is not None else ru_per_second / 10
+        self.decrease_factor = decrease_factor
+        self.increase_per_second = (ru_per_second - self.min_rate) / recovery_seconds
+        self.throttled_count = 0
+        self.clock = clock
+        self.sleep = sleep
+        self.__tokens = self.burst
+        self.__paused_until = 0.0
+        self.__updated = clock()
+        self.__lock = threading.Lock()
+
+
+    def acquire(self) -> None:
+        """
+        Waits until the bucket is out of debt and no retry-after is being waited out.
+        """
+        while True:
+            with self.__lock:
+                now = self.__refill()
+                wait = max(self.__paused_until - now, 0.0)
+
+                if wait == 0.0 and self.__tokens >= 0:
+                    return
+
+                if wait == 0.0:
+                    wait = -self.__tokens / self.rate
+
+            self.sleep(max(wait, MIN_WAIT))
+
+
+    def consume(self, request_charge: float) -> None:
+        """
+        Pays the charge of a response, putting the bucket into debt if it runs out.
+
+        Parameters
+        ----------
+        request_charge: float
+            The request units charged.
+        """
+        with self.__lock:
+            self.__refill()
+            self.__tokens -= request_charge
+
+
+    def on_throttled(self, retry_after: float) -> None:
+        """
+        Backs off after a 429 response: lowers the rate, empties the bucket and pauses every caller.
+
+        Parameters
+        ----------
+        retry_after: float
+            The seconds the database asked to wait.
+        """
+        with self.__lock:
+            now = self.__refill()
+
+            self.throttled_count += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self.__tokens = min(self.__tokens, 0.0)
+            self.__paused_until = max(self.__paused_until, now + retry_after)
+
+        logger.debug("Rate limited to %s RU/s after a throttled request.", self.rate)
+
+
+    # Adds the tokens and rate recovered since the last update. Must hold the lock.
+    def __refill(self) -> float:
+        now = self.clock()
+        elapsed = now - self.__updated
+        self.__updated = now
+
+        if elapsed > 0:
+            self.__tokens = min(self.burst, self.__tokens + elapsed * self.rate)
+            self.rate = min(self.ru_per_second, self.rate + elapsed * self.increase_per_second)
+
+        return now
@@ -0,0 +1,64 @@
+"""
+Validation rules shared by the database services.
+"""
+
+from src.db_service.DbOptions import DbOptions
+
+def validate_db_options(db_options: DbOptions) -> None:
+    """
+    Validates the db options.
+
+    Parameters
+    ----------
+    db_options: DbOptions
+        The options to validate.
+
+    Raises
+    ------
+    TypeError
+        Raised if the db options are not defined.
+
+    ValueError
+        Raised if a required option is not defined.
+    """
+    if db_options is None:
+        raise TypeError("db_options cannot be 'None'.")
+
+    if not db_options.endpoint or db_options.endpoint.isspace():
+        raise ValueError("The endpoint must be defined.")
+
+    elif not db_options.key or db_options.key.isspace():
+        raise ValueError("The key must be defined.")
+
+    elif not db_options.database_id or db_options.database_id.isspace():
+        raise ValueError("The database id must be defined.")
+
+    elif not db_options.container_id or db_options.container_id.isspace():
+        raise ValueError("The container id must be defined.")
+
+    elif any(not container_id or container_id.isspace() for container_id in db_options.containers):
+        raise ValueError("The ids of the containers must be defined.")
+
+
+def validate_id_and_partition_key(id: str, partition_key: str) -> None:
+    """
+    Validates the id and partition key are valid.
+
+    Parameters
+    ----------
+    id: str
+        The unique id of the item.
+
+    partition_key: str
+        The partition key of the item.
+
+    Raises
+    ------
+    ValueError
+        Raised if the id or partition key are not defined.
+    """
+    if not id or id.isspace():
+        raise ValueError("id must be defined.")
+
+    elif not partition_key or partition_key.isspace():
+        raise ValueError("partition_key must be defined.")
@@ -0,0 +1,44 @@
+
+class AsyncItems(object):
+    """
+    Async iterable stand-in for the SDK's AsyncItemPaged.
+    """
+
+    def __init__(self, items, page_size: int=100):
+        self.items = items
+        self.page_size = page_size
+
+    def __aiter__(self):
+        return self.__iterate(self.items)
+
+    def by_page(self, continuation_token: str=None):
+        return AsyncPager(self.items, self.page_size, continuation_token)
+
+    async def __iterate(self, items):
+        for item in items:
+            yield item
+
+
+class AsyncPager(object):
+    """
+    Async stand-in for the SDK's page iterator, paging a list with offsets as continuation tokens.
+    """
+
+    def __init__(self, items, page_size: int, continuation_token: str):
+        self.items = items
+        self.page_size = page_size
+        self.offset = int(continuation_token or 0)
+        self.continuation_token = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.offset >= len(self.items):
+            raise StopAsyncIteration
+
+        page = self.items[self.offset:self.offset + self.page_size]
+        self.offset += self.page_size
+        self.continuation_token = str(self.offset) if self.offset < len(self.items) else None
+
+        return AsyncItems(page)
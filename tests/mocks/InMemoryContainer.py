@@ -0,0 +1,1199 @@
+"""
+An in-process stand-in for an Azure Cosmos DB container, for load testing and profiling the services
+without a live account.
+
+Documents are indexed by partition key and id. Queries support a practical subset of the Cosmos DB SQL dialect:
+
+    SELECT [TOP n] [VALUE] * | <expr> [AS name], ... | COUNT(1)
+    FROM <alias>
+    [WHERE <condition>]
+    [ORDER BY <expr> [ASC | DESC], ...]
+    [OFFSET n LIMIT m]
+
+Conditions support =, !=, <>, <, <=, >, >=, AND, OR, NOT, IN (...), parentheses, @param binding and the functions
+ARRAY_CONTAINS, IS_DEFINED, STARTSWITH, ENDSWITH, CONTAINS, LOWER and UPPER.
+
+The change feed delivers the latest version of every document written, in the order written, per feed range.
+"""
+
+import copy
+import datetime
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+
+from azure.core import MatchConditions
+from azure.cosmos.exceptions import (CosmosAccessConditionFailedError, CosmosBatchOperationError, CosmosHttpResponseError,
+                                     CosmosResourceExistsError, CosmosResourceNotFoundError)
+
+UNDEFINED = object()
+
+
+class InMemoryContainer(object):
+    """
+    In-process stand-in for the SDK's ContainerProxy.
+    """
+
+    def __init__(self, partition_key_path: str="/partition_key", latency: float=0.0, throttle_rate: float=0.0,
+                 retry_after_ms: int=10, default_page_size: int=100, seed: int=None, feed_range_count: int=1):
+        """
+        Parameters
+        ----------
+        partition_key_path: str
+            The partition key path of the container. '/partition_key' by default.
+
+        latency: float
+            The seconds each request (or page of a query) takes. '0.0' by default.
+
+        throttle_rate: float
+            The share of requests answered with a 429. '0.0' by default.
+
+        retry_after_ms: int
+            The retry-after given with each 429. '10' by default.
+
+        default_page_size: int
+            The documents per page when the query does not set 'max_item_count'. '100' by default.
+
+        seed: int
+            The seed of the random throttling. 'None' by default.
+
+        feed_range_count: int
+            The feed ranges the partition keys are hashed into, standing in for physical partitions. '1' by default.
+        """
+        self.partition_key_path = partition_key_path
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after_ms = retry_after_ms
+        self.default_page_size = default_page_size
+        self.feed_range_count = feed_range_count
+        self.client_connection = ClientConnection()
+        self.request_count = 0
+        self.throttled_count = 0
+        self.__partitions = dict()
+        self.__random = random.Random(seed)
+        self.__lock = threading.RLock()
+        self.__compiled = dict()
+        self.__lsn = 0
+
+
+    def __len__(self) -> int:
+        return sum(len(p) for p in self.__partitions.values())
+
+
+    def seed(self, documents) -> None:
+        """
+        Loads documents directly, without latency, throttling or request accounting.
+        """
+        with self.__lock:
+            for document in documents:
+                self.__store(document)
+
+
+    def read_item(self, item, partition_key, initial_headers: dict=None, **kwargs) -> dict:
+        self.__request()
+
+        id = item["id"] if isinstance(item, dict) else item
+        document = self.__partitions.get(partition_key, {}).get(id)
+
+        if document is None:
+            self.__charge(1.0, **kwargs)
+            raise CosmosResourceNotFoundError(message="Entity with the specified id does not exist in the system.")
+
+        if initial_headers and initial_headers.get("If-None-Match") == document["_etag"]:
+            self.__charge(1.0, **kwargs)
+            return {}
+
+        result = document.decode()
+        self.__charge(_document_charge(document, 1.0), content_length=len(document.encoded), result=result, **kwargs)
+
+        return result
+
+
+    def read_items(self, items, **kwargs) -> list:
+        self.__request()
+
+        documents = list()
+        for id, partition_key in items:
+            document = self.__partitions.get(partition_key, {}).get(id)
+
+            if document is not None:
+                documents.append(document)
+
+        result = [d.decode() for d in documents]
+        self.__charge(sum(_document_charge(d, 1.0) for d in documents) or 1.0, len(result),
+            sum(len(d.encoded) for d in documents), result=result, **kwargs)
+
+        return result
+
+
+    def create_item(self, body: dict, **kwargs) -> dict:
+        self.__request()
+
+        with self.__lock:
+            if body.get("id") in self.__partitions.get(_get_path(body, self.partition_key_path), {}):
+                self.__charge(1.0, **kwargs)
+                raise CosmosResourceExistsError(status_code=409, message="Entity with the specified id already exists in the system.")
+
+            document = self.__store(body)
+
+        result = document.decode()
+        self.__charge(_document_charge(document, 5.0), content_length=len(document.encoded), result=result, **kwargs)
+
+        return result
+
+
+    def upsert_item(self, body: dict, etag: str=None, match_condition: MatchConditions=None, **kwargs) -> dict:
+        self.__request()
+
+        with self.__lock:
+            existing = self.__partitions.get(_get_path(body, self.partition_key_path), {}).get(body.get("id"))
+            self.__check_precondition(existing, etag, match_condition, **kwargs)
+
+            document = self.__store(body)
+
+        result = document.decode()
+        self.__charge(_document_charge(document, 5.0), content_length=len(document.encoded), result=result, **kwargs)
+
+        return result
+
+
+    def patch_item(self, item, partition_key, patch_operations: list, filter_predicate: str=None, etag: str=None,
+                   match_condition: MatchConditions=None, **kwargs) -> dict:
+        self.__request()
+
+        id = item["id"] if isinstance(item, dict) else item
+
+        with self.__lock:
+            existing = self.__partitions.get(partition_key, {}).get(id)
+
+            if existing is None:
+                self.__charge(1.0, **kwargs)
+                raise CosmosResourceNotFoundError(message="Entity with the specified id does not exist in the system.")
+
+            self.__check_precondition(existing, etag, match_condition, **kwargs)
+
+            try:
+                document = self.__store(self.__patch(existing, patch_operations, filter_predicate))
+
+            except CosmosHttpResponseError:
+                self.__charge(1.0, **kwargs)
+                raise
+
+        result = document.decode()
+        self.__charge(_document_charge(document, 5.0), content_length=len(document.encoded), result=result, **kwargs)
+
+        return result
+
+
+    def delete_item(self, item, partition_key, etag: str=None, match_condition: MatchConditions=None, **kwargs) -> None:
+        self.__request()
+
+        id = item["id"] if isinstance(item, dict) else item
+
+        with self.__lock:
+            partition = self.__partitions.get(partition_key, {})
+
+            if id not in partition:
+                self.__charge(1.0, **kwargs)
+                raise CosmosResourceNotFoundError(message="Entity with the specified id does not exist in the system.")
+
+            self.__check_precondition(partition[id], etag, match_condition, **kwargs)
+
+            del partition[id]
+
+        self.__charge(5.0, **kwargs)
+
+
+    def execute_item_batch(self, batch_operations, partition_key, **kwargs) -> list:
+        self.__request()
+
+        with self.__lock:
+            partition = self.__partitions.setdefault(partition_key, dict())
+            snapshot = dict(partition)
+            responses = list()
+
+            for index, operation in enumerate(batch_operations):
+                kind, args = operation[0].lower(), operation[1]
+
+                if kind in ("upsert", "create", "replace"):
+                    body = args[0]
+
+                    if _get_path(body, self.partition_key_path) != partition_key:
+                        return self.__fail_batch(partition, snapshot, index, 400, len(batch_operations))
+
+                    responses.append({ "statusCode": 200, "resourceBody": self.__store(body).decode() })
+
+                elif kind == "patch":
+                    if args[0] not in partition:
+                        return self.__fail_batch(partition, snapshot, index, 404, len(batch_operations))
+
+                    try:
+                        patched = self.__patch(partition[args[0]], args[1], (operation[2] if len(operation) > 2 else {}).get("filter_predicate"))
+
+                    except CosmosHttpResponseError as e:
+                        return self.__fail_batch(partition, snapshot, index, e.status_code, len(batch_operations))
+
+                    responses.append({ "statusCode": 200, "resourceBody": self.__store(patched).decode() })
+
+                elif kind in ("delete", "read"):
+                    if args[0] not in partition:
+                        return self.__fail_batch(partition, snapshot, index, 404, len(batch_operations))
+
+                    document = partition.pop(args[0]) if kind == "delete" else partition[args[0]]
+                    responses.append({ "statusCode": 204 if kind == "delete" else 200, "resourceBody": document.decode() if kind == "read" else None })
+
+                else:
+                    return self.__fail_batch(partition, snapshot, index, 400, len(batch_operations))
+
+        self.__charge(5.0 * len(responses), result=responses, **kwargs)
+
+        return responses
+
+
+    def read(self, **kwargs) -> dict:
+        self.__request()
+        self.__charge(1.0, **kwargs)
+
+        return { "id": "in-memory", "partitionKey": { "paths": [self.partition_key_path], "kind": "Hash" } }
+
+
+    def read_feed_ranges(self, **kwargs) -> list:
+        return [{ "index": i, "count": self.feed_range_count } for i in range(self.feed_range_count)]
+
+
+    def query_items(self, query: str, parameters: list=None, partition_key=None, enable_cross_partition_query: bool=None,
+                    max_item_count: int=None, feed_range: dict=None, **kwargs) -> "ItemPaged":
+        compiled = self.__compile(query)
+        params = { p["name"]: p["value"] for p in (parameters or []) }
+
+        if partition_key is None and feed_range is None:
+            partition_key = compiled.routing_key(params, self.partition_key_path)
+
+        if partition_key is not None:
+            documents = list(self.__partitions.get(partition_key, {}).values())
+
+        else:
+            documents = [d for k, p in list(self.__partitions.items()) if feed_range is None or _feed_range_index(k, self.feed_range_count) == feed_range["index"]
+                         for d in list(p.values())]
+
+        return ItemPaged(self, lambda: compiled.execute(documents, params), max_item_count or self.default_page_size, kwargs.get("response_hook"))
+
+
+    def query_items_change_feed(self, feed_range: dict=None, start_time=None, continuation: str=None, max_item_count: int=None,
+                                **kwargs) -> "ChangeFeedPaged":
+        if continuation is not None:
+            state = json.loads(continuation)
+
+        else:
+            feed_range = feed_range or { "index": 0, "count": 1 }
+
+            if start_time == "Beginning":
+                lsn = 0
+
+            elif isinstance(start_time, datetime.datetime):
+                lsn = min((d.lsn - 1 for d in self.__documents() if d.written >= start_time.timestamp()), default=self.__lsn)
+
+            else:
+                lsn = self.__lsn
+
+            state = { "index": feed_range["index"], "count": feed_range["count"], "lsn": lsn }
+
+        return ChangeFeedPaged(self, state, max_item_count or self.default_page_size, kwargs.get("response_hook"))
+
+
+    # Gets the documents of a feed range changed after a sequence number, in the order they changed.
+    def _changes(self, state: dict, page_size: int) -> list:
+        with self.__lock:
+            changes = [d for k, p in self.__partitions.items() if state["count"] == 1 or _feed_range_index(k, state["count"]) == state["index"]
+                       for d in p.values() if d.lsn > state["lsn"]]
+
+        return sorted(changes, key=lambda d: d.lsn)[:page_size]
+
+
+    """
+    Private Methods
+    """
+
+    # Applies the latency and throttling of a request.
+    def _request(self) -> None:
+        self.__request()
+
+
+    # Records the headers of the last response and reports them to the response hook of the call.
+    def _charge(self, request_charge: float, item_count: int=None, content_length: int=0, response_hook=None, result=None, **kwargs) -> None:
+        self.__charge(request_charge, item_count, content_length, response_hook, result)
+
+
+    def __request(self) -> None:
+        with self.__lock:
+            self.request_count += 1
+            throttled = self.throttle_rate > 0 and self.__random.random() < self.throttle_rate
+
+            if throttled:
+                self.throttled_count += 1
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        if throttled:
+            error = CosmosHttpResponseError(status_code=429, message="Request rate is large.")
+            error.headers = { "x-ms-retry-after-ms": str(self.retry_after_ms), "x-ms-request-charge": "0" }
+            raise error
+
+
+    def __charge(self, request_charge: float, item_count: int=None, content_length: int=0, response_hook=None, result=None, **kwargs) -> None:
+        headers = { "x-ms-request-charge": "{0:.2f}".format(request_charge), "Content-Length": str(content_length) }
+
+        if item_count is not None:
+            headers["x-ms-item-count"] = str(item_count)
+
+        self.client_connection.last_response_headers = headers
+
+        if response_hook is not None:
+            response_hook(headers, result)
+
+
+    # Fails a write whose if-match etag is not the current etag of the item.
+    def __check_precondition(self, existing: dict, etag: str, match_condition: MatchConditions, **kwargs) -> None:
+        if match_condition != MatchConditions.IfNotModified:
+            return
+
+        if existing is None or existing["_etag"] != etag:
+            self.__charge(1.0, **kwargs)
+            raise CosmosAccessConditionFailedError(status_code=412, message="One of the specified pre-condition is not met.")
+
+
+    # Applies patch operations to a copy of a document, if it matches the filter predicate.
+    def __patch(self, document: "StoredDocument", operations: list, filter_predicate: str=None) -> dict:
+        patched = document.decode()
+
+        if filter_predicate and not self.__compile("SELECT * " + filter_predicate).execute([patched], {}):
+            raise CosmosAccessConditionFailedError(status_code=412, message="Precondition failed: the filter predicate does not match.")
+
+        for operation in operations:
+            if operation["op"] == "move":
+                _pointer_set(patched, operation["path"], _pointer_remove(patched, operation["from"]), "add")
+
+            elif operation["op"] == "remove":
+                _pointer_remove(patched, operation["path"])
+
+            else:
+                _pointer_set(patched, operation["path"], operation["value"], operation["op"])
+
+        if _get_path(patched, self.partition_key_path) != _get_path(document, self.partition_key_path) or patched.get("id") != document["id"]:
+            raise CosmosHttpResponseError(status_code=400, message="The id and partition key cannot be patched.")
+
+        return patched
+
+
+    def __store(self, body: dict) -> dict:
+        if "id" not in body:
+            raise CosmosHttpResponseError(status_code=400, message="The input content is invalid because the required property 'id' is missing.")
+
+        document = dict(body)
+        document["_etag"] = "\"{0}\"".format(uuid.uuid4())
+        document["_ts"] = int(time.time())
+        document = StoredDocument(document)
+
+        self.__lsn += 1
+        document.lsn = self.__lsn
+
+        partition_key = _get_path(document, self.partition_key_path)
+        self.__partitions.setdefault(partition_key, dict())[document["id"]] = document
+
+        return document
+
+
+    def __documents(self) -> list:
+        with self.__lock:
+            return [d for p in self.__partitions.values() for d in p.values()]
+
+
+    def __fail_batch(self, partition: dict, snapshot: dict, index: int, status_code: int, count: int) -> None:
+        partition.clear()
+        partition.update(snapshot)
+
+        responses = [{ "statusCode": 424 } for _ in range(count)]
+        responses[index] = { "statusCode": status_code }
+
+        raise CosmosBatchOperationError(error_index=index, headers={}, status_code=status_code,
+            message="There was an error in the transactional batch.", operation_responses=responses)
+
+
+    def __compile(self, query: str) -> "CompiledQuery":
+        compiled = self.__compiled.get(query)
+
+        if compiled is None:
+            compiled = Parser(query).parse()
+            self.__compiled[query] = compiled
+
+        return compiled
+
+
+class StoredDocument(dict):
+    """
+    A stored document. It is kept encoded as well, so responses are decoded from JSON like real responses are.
+    """
+
+    __slots__ = ("encoded", "lsn", "written")
+
+    def __init__(self, document: dict):
+        self.encoded = json.dumps(document)
+        self.lsn = 0
+        self.written = time.time()
+        super().__init__(json.loads(self.encoded))
+
+    def decode(self) -> dict:
+        return json.loads(self.encoded)
+
+
+class ClientConnection(object):
+    """
+    Stand-in for the SDK's client connection, holding the headers of the last response.
+    """
+
+    def __init__(self):
+        self.last_response_headers = dict()
+
+
+class ItemPaged(object):
+    """
+    Stand-in for the SDK's ItemPaged. Documents are produced lazily, page by page.
+    """
+
+    def __init__(self, container: InMemoryContainer, execute, page_size: int, response_hook=None):
+        self.container = container
+        self.execute = execute
+        self.page_size = page_size
+        self.response_hook = response_hook
+
+    def __iter__(self):
+        for page in self.by_page():
+            yield from page
+
+    def by_page(self, continuation_token: str=None) -> "Pager":
+        return Pager(self, int(continuation_token or 0))
+
+
+class Pager(object):
+    """
+    Stand-in for the SDK's page iterator. Continuation tokens are offsets into the result.
+    """
+
+    def __init__(self, item_paged: ItemPaged, offset: int):
+        self.item_paged = item_paged
+        self.offset = offset
+        self.continuation_token = None
+        self.__result = None
+        self.__done = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.__done:
+            raise StopIteration
+
+        self.item_paged.container._request()
+
+        if self.__result is None:
+            self.__result = self.item_paged.execute()
+
+        page = self.__result[self.offset:self.offset + self.item_paged.page_size]
+        self.offset += len(page)
+
+        if self.offset >= len(self.__result):
+            self.continuation_token = None
+            self.__done = True
+
+        else:
+            self.continuation_token = str(self.offset)
+
+        if len(page) == 0 and self.offset > 0:
+            raise StopIteration
+
+        content_length = sum(len(d.encoded) if isinstance(d, StoredDocument) else len(json.dumps(d)) for d in page)
+        page = [d.decode() if isinstance(d, StoredDocument) else d for d in page]
+
+        self.item_paged.container._charge(2.5 + 0.1 * len(page), len(page), content_length, self.item_paged.response_hook, page)
+
+        return iter(page)
+
+
+class ChangeFeedPaged(object):
+    """
+    Stand-in for the SDK's change feed iterator. Continuation tokens hold the feed range and the sequence number read up to.
+    """
+
+    def __init__(self, container: InMemoryContainer, state: dict, page_size: int, response_hook=None):
+        self.container = container
+        self.state = state
+        self.page_size = page_size
+        self.response_hook = response_hook
+
+    def __iter__(self):
+        for page in self.by_page():
+            yield from page
+
+    def by_page(self, continuation_token: str=None) -> "ChangeFeedPager":
+        return ChangeFeedPager(self, json.loads(continuation_token) if continuation_token is not None else dict(self.state))
+
+
+class ChangeFeedPager(object):
+    """
+    Stand-in for the SDK's change feed page iterator. It ends once there are no more changes, and its continuation
+    token is always set.
+    """
+
+    def __init__(self, paged: ChangeFeedPaged, state: dict):
+        self.paged = paged
+        self.state = state
+        self.continuation_token = json.dumps(state)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self.paged.container._request()
+
+        page = self.paged.container._changes(self.state, self.paged.page_size)
+
+        if len(page) > 0:
+            self.state = { **self.state, "lsn": page[-1].lsn }
+            self.continuation_token = json.dumps(self.state)
+
+        self.paged.container._charge(1.0 + 0.1 * len(page), len(page), sum(len(d.encoded) for d in page), self.paged.response_hook, page)
+
+        if len(page) == 0:
+            raise StopIteration
+
+        return iter([{ **d.decode(), "_lsn": d.lsn } for d in page])
+
+
+# Approximates the request charge of a document, as a multiple of its size in kilobytes.
+def _document_charge(document: any, per_kb: float) -> float:
+    size = len(document.encoded) if isinstance(document, StoredDocument) else len(json.dumps(document))
+    return per_kb * max(1, math.ceil(size / 1024))
+
+
+# Reads a '/a/b' path from a document.
+# Finds the parent and key of a JSON pointer, e.g. '/tags/0'.
+def _pointer_parent(document: dict, path: str) -> tuple:
+    parts = [p.replace("~1", "/").replace("~0", "~") for p in path.split("/")[1:]]
+    parent = document
+
+    for part in parts[:-1]:
+        try:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise CosmosHttpResponseError(status_code=400, message="The patch path '{0}' does not exist.".format(path))
+
+    key = parts[-1]
+
+    if isinstance(parent, list) and key != "-":
+        try:
+            key = int(key)
+
+        except ValueError:
+            raise CosmosHttpResponseError(status_code=400, message="The patch path '{0}' is not an array index.".format(path))
+
+    if not isinstance(parent, (dict, list)):
+        raise CosmosHttpResponseError(status_code=400, message="The patch path '{0}' does not exist.".format(path))
+
+    return parent, key
+
+
+def _pointer_set(document: dict, path: str, value: any, op: str) -> None:
+    parent, key = _pointer_parent(document, path)
+    exists = key in parent if isinstance(parent, dict) else key != "-" and 0 <= key < len(parent)
+
+    if op == "replace" and not exists:
+        raise CosmosHttpResponseError(status_code=400, message="The patch path '{0}' does not exist.".format(path))
+
+    if op == "incr":
+        current = parent[key] if exists else 0
+
+        if isinstance(current, bool) or not isinstance(current, (int, float)):
+            raise CosmosHttpResponseError(status_code=400, message="The patch path '{0}' is not a number.".format(path))
+
+        value = current + value
+
+    if isinstance(parent, list):
+        if key == "-":
+            parent.append(value)
+
+        elif op == "add":
+            parent.insert(key, value)
+
+        elif exists:
+            parent[key] = value
+
+        else:
+            raise CosmosHttpResponseError(status_code=400, message="The patch path '{0}' is out of range.".format(path))
+
+    else:
+        parent[key] = value
+
+
+def _pointer_remove(document: dict, path: str) -> any:
+    parent, key = _pointer_parent(document, path)
+
+    try:
+        return parent.pop(key)
+
+    except (KeyError, IndexError, TypeError):
+        raise CosmosHttpResponseError(status_code=400, message="The patch path '{0}' does not exist.".format(path))
+
+
+def _feed_range_index(partition_key: any, feed_range_count: int) -> int:
+    return zlib.crc32(json.dumps(partition_key, default=str).encode("utf-8")) % feed_range_count
+
+
+def _get_path(document: dict, path: str) -> any:
+    value = document
+    for part in path.strip("/").split("/"):
+        if not isinstance(value, dict) or part not in value:
+            return None
+
+        value = value[part]
+
+    return value
+
+
+"""
+Query Engine
+"""
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<param>@\w+)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<op><=|>=|!=|<>|[=<>(),.\[\]*])
+    )""", re.VERBOSE)
+
+KEYWORDS = {
+    "SELECT", "VALUE", "TOP", "FROM", "WHERE", "AND", "OR", "NOT", "IN", "ORDER", "BY", "ASC", "DESC",
+    "OFFSET", "LIMIT", "AS", "TRUE", "FALSE", "NULL", "COUNT"
+}
+
+
+class CompiledQuery(object):
+    """
+    A parsed query, ready to run against lists of documents.
+    """
+
+    def __init__(self, alias, projection, value, top, where, order_by, offset, limit, count, equalities):
+        self.alias = alias
+        self.projection = projection
+        self.value = value
+        self.top = top
+        self.where = where
+        self.order_by = order_by
+        self.offset = offset
+        self.limit = limit
+        self.count = count
+        self.equalities = equalities
+
+    def routing_key(self, params: dict, partition_key_path: str) -> any:
+        path = tuple(partition_key_path.strip("/").split("/"))
+
+        for equality_path, operand in self.equalities:
+            if equality_path == path:
+                return operand({}, params)
+
+        return None
+
+    def execute(self, documents: list, params: dict) -> list:
+        rows = documents if self.where is None else [d for d in documents if self.where(d, params) is True]
+
+        if self.count:
+            return [len(rows)] if self.value else [{ "$1": len(rows) }]
+
+        for expression, descending in reversed(self.order_by):
+            rows = sorted(rows, key=lambda d: _sort_key(expression(d, params)), reverse=descending)
+
+        if self.offset is not None:
+            rows = rows[self.offset(None, params):]
+
+        if self.limit is not None:
+            rows = rows[:self.limit(None, params)]
+
+        if self.top is not None:
+            rows = rows[:self.top(None, params)]
+
+        if self.projection is None: # Decoded page by page as they are read.
+            return rows
+
+        result = list()
+        for document in rows:
+            if self.value:
+                value = self.projection[0][1](document, params)
+
+                if value is not UNDEFINED:
+                    result.append(copy.deepcopy(value))
+
+            else:
+                row = dict()
+                for name, expression in self.projection:
+                    value = expression(document, params)
+
+                    if value is not UNDEFINED:
+                        row[name] = copy.deepcopy(value)
+
+                result.append(row)
+
+        return result
+
+
+class Parser(object):
+    """
+    Recursive descent parser turning a query string into a CompiledQuery of closures.
+    """
+
+    def __init__(self, query: str):
+        self.tokens = list()
+        position = 0
+        query = query.strip()
+
+        while position < len(query):
+            match = TOKEN_PATTERN.match(query, position)
+
+            if match is None or match.end() == position:
+                raise CosmosHttpResponseError(status_code=400, message="Syntax error near '{0}'.".format(query[position:position + 10]))
+
+            kind = match.lastgroup
+            text = match.group(kind)
+
+            if kind == "name" and text.upper() in KEYWORDS:
+                kind, text = "keyword", text.upper()
+
+            self.tokens.append((kind, text))
+            position = match.end()
+
+        self.position = 0
+        self.alias = None
+        self.equalities = list()
+
+    def parse(self) -> CompiledQuery:
+        self.expect("keyword", "SELECT")
+
+        top = self.operand() if self.accept("keyword", "TOP") else None
+        value = self.accept("keyword", "VALUE")
+        select_start = self.position
+
+        # The alias is only known after FROM, so skip ahead to it and come back for the projection.
+        depth = 0
+        while not (depth == 0 and self.peek() == ("keyword", "FROM")):
+            kind, text = self.next()
+            depth += 1 if text in ("(", "[") else -1 if text in (")", "]") else 0
+
+        select_end = self.position
+        self.expect("keyword", "FROM")
+        self.alias = self.expect("name")[1]
+        after_from = self.position
+
+        self.position = select_start
+        count = False
+        projection = None
+
+        if self.accept("op", "*"):
+            projection = None
+
+        elif self.peek() == ("keyword", "COUNT"):
+            self.next()
+            self.expect("op", "(")
+            self.operand()
+            self.expect("op", ")")
+            count = True
+
+        else:
+            projection = list()
+            while True:
+                start = self.position
+                expression = self.expression()
+                name = self.tokens[self.position - 1][1] if self.tokens[self.position - 1][0] == "name" else "$" + str(len(projection) + 1)
+
+                if self.position - start == 1 and self.tokens[start][1] == self.alias:
+                    name = self.alias
+
+                if self.accept("keyword", "AS"):
+                    name = self.expect("name")[1]
+
+                projection.append((name, expression))
+
+                if not self.accept("op", ","):
+                    break
+
+        if self.position != select_end:
+            raise CosmosHttpResponseError(status_code=400, message="Syntax error in SELECT clause.")
+
+        self.position = after_from
+        where = None
+        order_by = list()
+        offset = None
+        limit = None
+
+        if self.accept("keyword", "WHERE"):
+            where = self.condition(top_level=True)
+
+        if self.accept("keyword", "ORDER"):
+            self.expect("keyword", "BY")
+
+            while True:
+                expression = self.expression()
+                descending = self.accept("keyword", "DESC")
+
+                if not descending:
+                    self.accept("keyword", "ASC")
+
+                order_by.append((expression, descending))
+
+                if not self.accept("op", ","):
+                    break
+
+        if self.accept("keyword", "OFFSET"):
+            offset = self.operand()
+            self.expect("keyword", "LIMIT")
+            limit = self.operand()
+
+        if self.position != len(self.tokens):
+            raise CosmosHttpResponseError(status_code=400, message="Syntax error near '{0}'.".format(self.tokens[self.position][1]))
+
+        return CompiledQuery(self.alias, projection, value, top, where, order_by, offset, limit, count, self.equalities)
+
+    def condition(self, top_level: bool=False):
+        left = self.conjunction(top_level)
+
+        while self.accept("keyword", "OR"):
+            right = self.conjunction(False)
+            left = _or(left, right)
+
+            if top_level: # Equalities under an OR cannot route the query.
+                self.equalities.clear()
+                top_level = False
+
+        return left
+
+    def conjunction(self, top_level: bool):
+        left = self.negation(top_level)
+
+        while self.accept("keyword", "AND"):
+            right = self.negation(top_level)
+            left = _and(left, right)
+
+        return left
+
+    def negation(self, top_level: bool):
+        if self.accept("keyword", "NOT"):
+            inner = self.negation(False)
+            return lambda d, p: _not(inner(d, p))
+
+        return self.comparison(top_level)
+
+    def comparison(self, top_level: bool):
+        start = self.position
+        left = self.expression()
+        kind, text = self.peek()
+
+        if kind == "op" and text in ("=", "!=", "<>", "<", "<=", ">", ">="):
+            self.next()
+            right_start = self.position
+            right = self.expression()
+
+            if top_level and text == "=":
+                self.record_equality(start, right_start, right)
+
+            return _comparison(text, left, right)
+
+        if self.accept("keyword", "IN"):
+            self.expect("op", "(")
+            values = [self.expression()]
+
+            while self.accept("op", ","):
+                values.append(self.expression())
+
+            self.expect("op", ")")
+
+            return lambda d, p: _in(left(d, p), [v(d, p) for v in values])
+
+        return left
+
+    def record_equality(self, start: int, right_start: int, right) -> None:
+        path = self.path_of(start, right_start - 1)
+        right_is_constant = all(k in ("param", "number", "string") or t in ("TRUE", "FALSE", "NULL") for k, t in self.tokens[right_start:self.position])
+
+        if path is not None and right_is_constant:
+            self.equalities.append((path, right))
+
+    def path_of(self, start: int, end: int) -> tuple:
+        tokens = self.tokens[start:end]
+
+        if not tokens or tokens[0] != ("name", self.alias):
+            return None
+
+        path = list()
+        i = 1
+        while i < len(tokens):
+            if tokens[i] == ("op", ".") and i + 1 < len(tokens) and tokens[i + 1][0] in ("name", "keyword"):
+                path.append(tokens[i + 1][1])
+                i += 2
+
+            elif tokens[i] == ("op", "[") and i + 2 < len(tokens) and tokens[i + 1][0] == "string" and tokens[i + 2] == ("op", "]"):
+                path.append(tokens[i + 1][1][1:-1])
+                i += 3
+
+            else:
+                return None
+
+        return tuple(path)
+
+    def expression(self):
+        kind, text = self.peek()
+
+        if kind == "op" and text == "(":
+            self.next()
+            inner = self.condition()
+            self.expect("op", ")")
+            return inner
+
+        if kind == "name" and self.peek(1) == ("op", "("):
+            return self.function()
+
+        if kind == "name":
+            return self.path()
+
+        return self.operand()
+
+    def function(self):
+        name = self.next()[1].upper()
+        self.expect("op", "(")
+        args = list()
+
+        if not self.accept("op", ")"):
+            args.append(self.expression())
+
+            while self.accept("op", ","):
+                args.append(self.expression())
+
+            self.expect("op", ")")
+
+        function = FUNCTIONS.get(name)
+
+        if function is None:
+            raise CosmosHttpResponseError(status_code=400, message="Unsupported function '{0}'.".format(name))
+
+        return lambda d, p: function(*[a(d, p) for a in args])
+
+    def path(self):
+        root = self.expect("name")[1]
+
+        if root != self.alias:
+            raise CosmosHttpResponseError(status_code=400, message="Identifier '{0}' could not be resolved.".format(root))
+
+        parts = list()
+        while True:
+            if self.accept("op", "."):
+                parts.append(self.next()[1])
+
+            elif self.peek() == ("op", "["):
+                self.next()
+                kind, text = self.next()
+                parts.append(text[1:-1] if kind == "string" else int(text))
+                self.expect("op", "]")
+
+            else:
+                break
+
+        return lambda d, p: _resolve(d, parts)
+
+    def operand(self):
+        kind, text = self.next()
+
+        if kind == "number":
+            value = float(text) if "." in text else int(text)
+            return lambda d, p: value
+
+        if kind == "string":
+            value = text[1:-1].replace("\\'", "'").replace('\\"', '"')
+            return lambda d, p: value
+
+        if kind == "param":
+            return lambda d, p: p.get(text, UNDEFINED)
+
+        if kind == "keyword" and text in ("TRUE", "FALSE", "NULL"):
+            value = { "TRUE": True, "FALSE": False, "NULL": None }[text]
+            return lambda d, p: value
+
+        raise CosmosHttpResponseError(status_code=400, message="Syntax error near '{0}'.".format(text))
+
+    def peek(self, offset: int=0) -> tuple:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def next(self) -> tuple:
+        token = self.peek()
+
+        if token == (None, None):
+            raise CosmosHttpResponseError(status_code=400, message="Unexpected end of query.")
+
+        self.position += 1
+        return token
+
+    def accept(self, kind: str, text: str=None) -> bool:
+        token = self.peek()
+
+        if token[0] == kind and (text is None or token[1] == text):
+            self.position += 1
+            return True
+
+        return False
+
+    def expect(self, kind: str, text: str=None) -> tuple:
+        token = self.peek()
+
+        if token[0] != kind or (text is not None and token[1] != text):
+            raise CosmosHttpResponseError(status_code=400, message="Expected '{0}' but found '{1}'.".format(text or kind, token[1]))
+
+        self.position += 1
+        return token
+
+
+def _resolve(document, parts: list) -> any:
+    value = document
+    for part in parts:
+        if isinstance(value, dict) and isinstance(part, str) and part in value:
+            value = value[part]
+
+        elif isinstance(value, list) and isinstance(part, int) and -len(value) <= part < len(value):
+            value = value[part]
+
+        else:
+            return UNDEFINED
+
+    return value
+
+
+def _comparable(left, right) -> bool:
+    if left is UNDEFINED or right is UNDEFINED:
+        return False
+
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool)
+
+    numbers = (int, float)
+    return (isinstance(left, numbers) and isinstance(right, numbers)) or type(left) == type(right)
+
+
+def _comparison(operator: str, left, right):
+    def compare(d, p):
+        a, b = left(d, p), right(d, p)
+
+        if not _comparable(a, b):
+            return UNDEFINED
+
+        if operator == "=":
+            return a == b
+
+        if operator in ("!=", "<>"):
+            return a != b
+
+        if a is None or isinstance(a, (dict, list)):
+            return UNDEFINED
+
+        return { "<": a < b, "<=": a <= b, ">": a > b, ">=": a >= b }[operator]
+
+    return compare
+
+
+def _and(left, right):
+    def evaluate(d, p):
+        a = left(d, p)
+
+        if a is False:
+            return False
+
+        b = right(d, p)
+
+        if b is False:
+            return False
+
+        return True if a is True and b is True else UNDEFINED
+
+    return evaluate
+
+
+def _or(left, right):
+    def evaluate(d, p):
+        a = left(d, p)
+
+        if a is True:
+            return True
+
+        b = right(d, p)
+
+        if b is True:
+            return True
+
+        return False if a is False and b is False else UNDEFINED
+
+    return evaluate
+
+
+def _not(value):
+    return (not value) if isinstance(value, bool) else UNDEFINED
+
+
+def _in(value, candidates: list):
+    if value is UNDEFINED:
+        return UNDEFINED
+
+    return any(_comparable(value, c) and value == c for c in candidates)
+
+
+def _sort_key(value) -> tuple:
+    if value is UNDEFINED:
+        return (0, 0)
+
+    if value is None:
+        return (1, 0)
+
+    if isinstance(value, bool):
+        return (2, value)
+
+    if isinstance(value, (int, float)):
+        return (3, value)
+
+    if isinstance(value, str):
+        return (4, value)
+
+    return (5, str(value))
+
+
+def _strings(function):
+    def call(*args):
+        if not all(isinstance(a, str) for a in args):
+            return UNDEFINED
+
+        return function(*args)
+
+    return call
+
+
+FUNCTIONS = {
+    "ARRAY_CONTAINS": lambda array, value, partial=False: UNDEFINED if not isinstance(array, list) else any(
+        value == a or (partial is True and isinstance(a, dict) and isinstance(value, dict) and value.items() <= a.items()) for a in array),
+    "IS_DEFINED": lambda value: value is not UNDEFINED,
+    "STARTSWITH": _strings(lambda s, prefix: s.startswith(prefix)),
+    "ENDSWITH": _strings(lambda s, suffix: s.endswith(suffix)),
+    "CONTAINS": _strings(lambda s, sub: sub in s),
+    "LOWER": _strings(lambda s: s.lower()),
+    "UPPER": _strings(lambda s: s.upper())
+}
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import unittest
+
+from src.db_service.AsyncDbService import AsyncDbService, CosmosHttpResponseError, CosmosResourceNotFoundError
+from src.db_service.DbOptions import DbOptions
+from src.db_service.Query import Query
+from tests.mocks.AsyncItems import AsyncItems
+from tests.mocks.User import User
+from unittest.mock import AsyncMock, Mock, patch
+
+class AsyncDbServiceTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+       self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id")
+
+    def tearDown(self) -> None:
+        self.db_options = None
+
+    # Asserts the context manager connects and closes the client.
+    @patch("src.db_service.AsyncDbService.CosmosClient")
+    async def test_async_context_manager_connects_and_closes(self, mock_cosmos_client):
+        client = Mock()
+        client.close = AsyncMock()
+        mock_cosmos_client.return_value = client
+
+        with self.assertLogs(level="INFO"):
+            async with AsyncDbService(self.db_options) as db_service:
+                self.assertIsNotNone(db_service.container)
+
+        client.close.assert_awaited_once()
+        self.assertIsNone(db_service.container)
+
+    # Asserts an exception is raised if the dbOptions are invalid.
+    async def test_async_connect_invalid_db_options(self):
+        db_service = AsyncDbService(None)
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(TypeError):
+                await db_service.connect()
+
+    # Asserts an item can be retrieved.
+    async def test_async_get_gets_item(self):
+        db_service = AsyncDbService(self.db_options)
+        db_service.container = Mock()
+        db_service.container.read_item = AsyncMock(return_value=User("test", "testing").__dict__)
+
+        with self.assertLogs(level="INFO"):
+            result = await db_service.get("user::test", "user")
+
+        self.assertEqual("test", User(**json.loads(result)).user)
+
+    # Asserts None is returned if no item is found and a ValueError is raised on bad parameters.
+    async def test_async_get_cannot_find_item(self):
+        db_service = AsyncDbService(self.db_options)
+        db_service.container = Mock()
+        db_service.container.read_item = AsyncMock(side_effect=CosmosResourceNotFoundError(status_code=404))
+
+        with self.assertLogs(level="WARNING"):
+            result = await db_service.get("test", "test_partition")
+
+        self.assertIsNone(result)
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(ValueError):
+                await db_service.get(" ", "test_partition")
+
+    # Asserts throttled and other failed reads raise instead of reading as a missing item.
+    async def test_async_get_raises_when_throttled(self):
+        db_service = AsyncDbService(self.db_options)
+        db_service.container = Mock()
+
+        for status_code in (429, 500):
+            db_service.container.read_item = AsyncMock(side_effect=CosmosHttpResponseError(status_code=status_code))
+
+            with self.assertLogs(level="ERROR"):
+                with self.assertRaises(CosmosHttpResponseError):
+                    await db_service.get("user::test", "user")
+
+    # Asserts documents can be queried and iterated asynchronously.
+    async def test_async_query_queries_data(self):
+        users = [User("test1", "testing").__dict__, User("test2", "testing").__dict__]
+
+        db_service = AsyncDbService(self.db_options)
+        db_service.container = Mock()
+        db_service.container.query_items.side_effect = lambda *args, **kwargs: AsyncItems(users)
+
+        query = Query(query_str="SELECT * FROM users WHERE id = @id", where_params={ "@id": "user::test" })
+
+        with self.assertLogs(level="INFO"):
+            result = await db_service.query(query)
+
+        self.assertEqual(2, len(json.loads(result)))
+
+        with self.assertLogs(level="INFO"):
+            streamed = [u async for u in db_service.query_iter(query)]
+
+        self.assertEqual(users, streamed)
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(TypeError):
+                await db_service.query(None)
+
+    # Asserts many requests can be in flight on one event loop.
+    async def test_async_get_runs_concurrently(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def read_item(item, partition_key):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return { "id": item }
+
+        db_service = AsyncDbService(self.db_options)
+        db_service.container = Mock()
+        db_service.container.read_item = read_item
+
+        with self.assertLogs(level="INFO"):
+            results = await asyncio.gather(*[db_service.get("user::{0}".format(i), "user") for i in range(50)])
+
+        self.assertEqual(50, len(results))
+        self.assertEqual(50, max_in_flight)
+
+    # Asserts an item can be upserted and deleted.
+    async def test_async_upsert_and_delete(self):
+        user = User("test", "testing").__dict__
+
+        db_service = AsyncDbService(self.db_options)
+        db_service.container = Mock()
+        db_service.container.upsert_item = AsyncMock(return_value=user)
+        db_service.container.delete_item = AsyncMock(side_effect=[None, CosmosResourceNotFoundError()])
+
+        with self.assertLogs(level="INFO"):
+            result = await db_service.upsert(user)
+
+        self.assertEqual(user, json.loads(result))
+
+        with self.assertLogs(level="INFO"):
+            await db_service.delete("user::test", "user")
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(CosmosResourceNotFoundError):
+                await db_service.delete("user::test", "user")
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(TypeError):
+                await db_service.upsert(None)
+
+    # Asserts a single page of a query can be retrieved with its continuation token.
+    async def test_async_query_page(self):
+        users = [User("test{0}".format(i), "testing").__dict__ for i in range(3)]
+
+        db_service = AsyncDbService(self.db_options)
+        db_service.container = Mock()
+        db_service.container.query_items.side_effect = lambda *args, **kwargs: AsyncItems(users, kwargs["max_item_count"])
+
+        with self.assertLogs(level="INFO"):
+            items, token = await db_service.query_page(Query(query_str="SELECT * FROM users"), page_size=2)
+
+        self.assertEqual(users[:2], json.loads(items))
+
+        with self.assertLogs(level="INFO"):
+            items, token = await db_service.query_page(Query(query_str="SELECT * FROM users"), page_size=2, continuation_token=token)
+
+        self.assertEqual(users[2:], json.loads(items))
+        self.assertIsNone(token)
@@ -0,0 +1,117 @@
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, CosmosHttpResponseError, CosmosResourceNotFoundError
+from tests.mocks.User import User
+from unittest.mock import Mock, patch
+
+class BulkTests(unittest.TestCase):
+    def setUp(self) -> None:
+       self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", partition_key_path="/user")
+
+    def tearDown(self) -> None:
+        self.db_options = None
+
+    # Creates user documents spread over the given number of partitions.
+    def create_items(self, count: int, partitions: int) -> list[dict[str, any]]:
+        items = list()
+        for i in range(count):
+            item = User("user{0}".format(i % partitions), "testing").__dict__
+            item["id"] = "item::{0}".format(i)
+            items.append(item)
+
+        return items
+
+    # Asserts items are upserted with transactional batches of at most 100 per partition.
+    def test_upsert_many_uses_batches(self):
+        mock_container = Mock()
+        mock_container.execute_item_batch.side_effect = lambda ops, partition_key: [
+            { "statusCode": 200, "resourceBody": op[1][0] } for op in ops]
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        items = self.create_items(250, 2)
+        with self.assertLogs(level="INFO"):
+            result = db_service.upsert_many(items)
+
+        self.assertEqual(250, len(result.succeeded))
+        self.assertEqual(0, len(result.failed))
+        self.assertEqual(items[42], result.items[42].result)
+        self.assertEqual(4, mock_container.execute_item_batch.call_count)
+        for call in mock_container.execute_item_batch.call_args_list:
+            self.assertLessEqual(len(call.args[0]), 100)
+
+        mock_container.upsert_item.assert_not_called()
+
+    # Asserts items are written one at a time without a partition key path, reporting failures per item.
+    def test_upsert_many_reports_failures_per_item(self):
+        self.db_options.partition_key_path = None
+        items = self.create_items(5, 1)
+
+        mock_container = Mock()
+        mock_container.upsert_item.side_effect = lambda item: self.fail_on(item, "item::3")
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        with self.assertLogs(level="INFO"):
+            result = db_service.upsert_many(items, max_workers=2)
+
+        self.assertEqual(4, len(result.succeeded))
+        self.assertEqual(1, len(result.failed))
+        self.assertEqual("item::3", result.failed[0].id)
+        self.assertEqual(5, mock_container.upsert_item.call_count)
+        mock_container.execute_item_batch.assert_not_called()
+
+    # Raises for the item with the given id and echoes the rest.
+    def fail_on(self, item: dict[str, any], id: str) -> dict[str, any]:
+        if item["id"] == id:
+            raise Exception("failed")
+
+        return item
+
+    # Asserts a failed batch falls back to single deletes so the report is accurate per item.
+    def test_delete_many_falls_back_on_batch_failure(self):
+        mock_container = Mock()
+        mock_container.execute_item_batch.side_effect = Exception("batch failed")
+        mock_container.delete_item.side_effect = [None, CosmosResourceNotFoundError(), None]
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        with self.assertLogs(level="INFO"):
+            result = db_service.delete_many([("item::0", "user"), ("item::1", "user"), ("item::2", "user")], max_workers=1)
+
+        self.assertEqual(2, len(result.succeeded))
+        self.assertIsInstance(result.items[1].error, CosmosResourceNotFoundError)
+        mock_container.execute_item_batch.assert_called_once()
+
+    # Asserts throttled requests are retried after the retry-after the database asks for.
+    @patch("src.db_service.Throttling.time.sleep")
+    def test_delete_many_retries_throttled_requests(self, mock_sleep):
+        throttled = CosmosHttpResponseError(status_code=429, message="throttled")
+        throttled.headers = { "x-ms-retry-after-ms": "250" }
+
+        mock_container = Mock()
+        mock_container.delete_item.side_effect = [throttled, None]
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        with self.assertLogs(level="WARNING"):
+            result = db_service.delete_many([("item::0", "user")])
+
+        self.assertEqual(1, len(result.succeeded))
+        mock_sleep.assert_called_once_with(0.25)
+
+    # Asserts invalid parameters raise.
+    def test_bulk_raises_on_invalid_parameters(self):
+        db_service = DbService(self.db_options)
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(TypeError):
+                db_service.upsert_many(None)
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(ValueError):
+                db_service.delete_many([(" ", "user")])
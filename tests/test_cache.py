@@ -0,0 +1,130 @@
+import json
+import time
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, CosmosHttpResponseError
+from src.db_service.ItemCache import ItemCache
+from unittest.mock import Mock
+
+class CacheTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+       self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id",
+           partition_key_path="/user", cache_max_size=2, cache_ttl=60)
+       self.document = { "id": "user::test", "user": "user", "_etag": "\"etag-1\"" }
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.document = None
+
+    # Creates a service whose container returns the test document.
+    def create_db_service(self) -> DbService:
+        mock_container = Mock()
+        mock_container.read_item.return_value = self.document
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        return db_service
+
+    # Asserts repeated gets are answered from the cache.
+    def test_cache_serves_repeated_gets(self):
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            first = db_service.get("user::test", "user")
+            second = db_service.get("user::test", "user")
+
+        self.assertEqual(first, second)
+        db_service.container.read_item.assert_called_once()
+        self.assertEqual({ "size": 1, "hits": 1, "misses": 1, "evictions": 0 }, db_service.cache.stats())
+
+    # Asserts the cache is disabled by default.
+    def test_cache_disabled_by_default(self):
+        db_service = DbService(DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id"))
+
+        self.assertIsNone(db_service.cache)
+
+    # Asserts stale entries are revalidated with their etag and kept when unchanged.
+    def test_cache_revalidates_stale_entries(self):
+        self.db_options.cache_ttl = 0.01
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            db_service.get("user::test", "user")
+
+        time.sleep(0.02)
+        db_service.container.read_item.return_value = {}
+
+        with self.assertLogs(level="INFO"):
+            result = db_service.get("user::test", "user")
+
+        self.assertEqual(self.document, json.loads(result))
+        db_service.container.read_item.assert_called_with(
+            item="user::test", partition_key="user", initial_headers={ "If-None-Match": "\"etag-1\"" })
+
+    # Asserts upserts refresh and deletes invalidate the cached entry.
+    def test_cache_updated_on_writes(self):
+        db_service = self.create_db_service()
+        updated = dict(self.document, _etag="\"etag-2\"")
+        db_service.container.upsert_item.return_value = updated
+
+        with self.assertLogs(level="INFO"):
+            db_service.get("user::test", "user")
+            db_service.upsert(updated)
+            result = db_service.get("user::test", "user")
+
+        self.assertEqual(updated, json.loads(result))
+        db_service.container.read_item.assert_called_once()
+
+        with self.assertLogs(level="INFO"):
+            db_service.delete("user::test", "user")
+            db_service.get("user::test", "user")
+
+        self.assertEqual(2, db_service.container.read_item.call_count)
+
+    # Asserts missing items are not cached.
+    def test_cache_invalidated_when_item_not_found(self):
+        db_service = self.create_db_service()
+        db_service.container.read_item.side_effect = CosmosHttpResponseError()
+
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(db_service.get("user::test", "user"))
+
+        self.assertEqual(0, len(db_service.cache))
+
+    # Asserts the least recently used entry is evicted once the cache is full.
+    def test_item_cache_evicts_least_recently_used(self):
+        cache = ItemCache(2, 60)
+
+        cache.put(("c", "1", "p"), { "id": "1" })
+        cache.put(("c", "2", "p"), { "id": "2" })
+        cache.get(("c", "1", "p"))
+        cache.put(("c", "3", "p"), { "id": "3" })
+
+        self.assertIsNotNone(cache.get(("c", "1", "p")))
+        self.assertIsNone(cache.get(("c", "2", "p")))
+        self.assertEqual(1, cache.evictions)
+
+    # Asserts the entries of an item are removed under every partition key, and evicted entries leave the index.
+    def test_item_cache_invalidates_by_prefix(self):
+        cache = ItemCache(3, 60)
+
+        cache.put(("c", "1", "p"), { "id": "1" })
+        cache.put(("c", "1", "q"), { "id": "1" })
+        cache.put(("c", "2", "p"), { "id": "2" })
+        cache.put(("d", "1", "p"), { "id": "1" })
+        cache.invalidate_prefix(("c", "1"))
+
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get(("c", "1", "q")))
+        self.assertIsNotNone(cache.get(("c", "2", "p")))
+        self.assertIsNotNone(cache.get(("d", "1", "p")))
+
+    # Asserts a ValueError is raised if the cache is configured with invalid bounds.
+    def test_item_cache_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            ItemCache(0, 60)
+
+        with self.assertRaises(ValueError):
+            ItemCache(10, 0)
@@ -0,0 +1,165 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.db_service.ChangeFeed import ChangeFeedReader, FileCheckpointStore, InMemoryCheckpointStore
+from src.db_service.DbService import DbService, DbOptions
+from tests.mocks.InMemoryContainer import InMemoryContainer
+
+class ChangeFeedTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", partition_key_path="/user")
+        self.container = InMemoryContainer(partition_key_path="/user", default_page_size=5, feed_range_count=4)
+        self.container.seed([{ "id": "txn::{0}".format(i), "user": "user{0}".format(i % 10), "amount": i } for i in range(40)])
+        self.db_service = DbService(self.db_options)
+        self.db_service.container = self.container
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.container = None
+        self.db_service = None
+
+    # Asserts every change is delivered once and later passes deliver only the changes since the checkpoints.
+    def test_change_feed_delivers_changes_incrementally(self):
+        totals = dict()
+        store = InMemoryCheckpointStore()
+
+        def handler(documents: list) -> None:
+            for document in documents:
+                totals[document["id"]] = document["amount"]
+
+        reader = self.db_service.change_feed(handler, checkpoint_store=store)
+
+        with self.assertLogs(level="INFO"):
+            self.assertEqual(40, reader.run_once())
+
+        self.assertEqual(sum(range(40)), sum(totals.values()))
+        self.assertEqual(4 + 1, len(store.checkpoints())) # A checkpoint per feed range and the feed ranges.
+
+        self.container.upsert_item({ "id": "txn::1", "user": "user1", "amount": 100 })
+        self.container.upsert_item({ "id": "txn::40", "user": "user0", "amount": 1 })
+
+        with self.assertLogs(level="INFO"):
+            self.assertEqual(2, reader.run_once())
+            self.assertEqual(0, reader.run_once())
+
+        self.assertEqual(sum(range(40)) + 100, sum(totals.values()))
+        self.assertEqual({ "batches": reader.batches, "documents": 42 }, reader.stats())
+
+    # Asserts a reader keeps resuming the feed ranges it started with after they split, so changes are neither replayed nor skipped.
+    def test_change_feed_resumes_ranges_after_split(self):
+        delivered = list()
+        reader = self.db_service.change_feed(delivered.extend, start_time="Beginning")
+
+        with self.assertLogs(level="INFO"):
+            self.assertEqual(40, reader.run_once())
+
+            self.container.feed_range_count = 8 # Every feed range splits in two.
+            self.container.upsert_item({ "id": "txn::1", "user": "user1", "amount": 100 })
+            self.container.upsert_item({ "id": "txn::40", "user": "user0", "amount": 1 })
+
+            self.assertEqual(2, reader.run_once())
+            self.assertEqual(0, reader.run_once())
+
+        self.assertEqual(42, len(delivered))
+        self.assertEqual(["txn::1", "txn::40"], sorted(d["id"] for d in delivered[40:]))
+
+    # Asserts a reader starting now skips the changes made before it.
+    def test_change_feed_starts_now(self):
+        delivered = list()
+        reader = self.db_service.change_feed(delivered.extend, start_time="Now")
+
+        with self.assertLogs(level="INFO"):
+            reader.run_once()
+            self.container.upsert_item({ "id": "txn::0", "user": "user0", "amount": 5 })
+            reader.run_once()
+
+        self.assertEqual(["txn::0"], [d["id"] for d in delivered])
+
+    # Asserts a handler error stops the reader without checkpointing the batch, so it is delivered again.
+    def test_change_feed_redelivers_failed_batch(self):
+        delivered = list()
+        failures = [ValueError("downstream unavailable")]
+
+        def handler(documents: list) -> None:
+            if failures:
+                raise failures.pop()
+
+            delivered.extend(documents)
+
+        reader = self.db_service.change_feed(handler, max_workers=1)
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(ValueError):
+                reader.run_once()
+
+        with self.assertLogs(level="INFO"):
+            reader.run_once()
+
+        self.assertEqual(sorted("txn::{0}".format(i) for i in range(40)), sorted(d["id"] for d in delivered))
+
+    # Asserts checkpoints kept in a file let a new reader resume where the last one stopped.
+    def test_change_feed_resumes_from_file_checkpoints(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "checkpoints.json")
+
+            with self.assertLogs(level="INFO"):
+                self.db_service.change_feed(lambda documents: None, checkpoint_store=FileCheckpointStore(path)).run_once()
+                self.container.upsert_item({ "id": "txn::3", "user": "user3", "amount": 0 })
+
+                delivered = list()
+                self.db_service.change_feed(delivered.extend, checkpoint_store=FileCheckpointStore(path)).run_once()
+
+            self.assertEqual(["txn::3"], [d["id"] for d in delivered])
+            self.assertEqual(4 + 1, len(FileCheckpointStore(path).checkpoints()))
+
+    # Asserts feed ranges read no further ahead of a slow handler than the pending batches allow.
+    def test_change_feed_applies_backpressure(self):
+        lock = threading.Lock()
+        produced = [0]
+        ahead = list()
+
+        def read_pages(feed_range: int, continuation: str):
+            for page in range(10):
+                with lock:
+                    produced[0] += 1
+
+                yield ([feed_range], str(page))
+
+        def handler(documents: list) -> None:
+            time.sleep(0.002)
+            with lock:
+                ahead.append(produced[0] - len(ahead) - 1)
+
+        reader = ChangeFeedReader(lambda: range(3), read_pages, handler, max_workers=3, max_pending_batches=2)
+
+        with self.assertLogs(level="INFO"):
+            self.assertEqual(30, reader.run_once())
+
+        self.assertLessEqual(max(ahead), 2 + 3)
+        self.assertEqual({ "default:feed_ranges": "[0, 1, 2]", "default:0": "9", "default:1": "9", "default:2": "9" },
+                         reader.checkpoint_store.checkpoints())
+
+    # Asserts a running reader polls for changes until stopped.
+    def test_change_feed_runs_until_stopped(self):
+        delivered = list()
+        reader = self.db_service.change_feed(delivered.extend, poll_interval=0.01)
+
+        with self.assertLogs(level="INFO"):
+            thread = threading.Thread(target=reader.run)
+            thread.start()
+
+            self.container.upsert_item({ "id": "txn::40", "user": "user0", "amount": 0 })
+
+            deadline = time.time() + 5
+            while len(delivered) < 41 and time.time() < deadline:
+                time.sleep(0.01)
+
+            reader.stop()
+            thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(41, len(delivered))
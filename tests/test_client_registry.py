@@ -0,0 +1,108 @@
+import unittest
+
+from src.db_service.ClientRegistry import ClientRegistry, client_key, default_registry
+from src.db_service.DbService import DbService, DbOptions
+from unittest.mock import Mock, patch
+
+class ClientRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+       self.users_options = DbOptions("registry_endpoint", "test_key", "test_db_id", "users")
+       self.accounts_options = DbOptions("registry_endpoint", "test_key", "test_db_id", "accounts")
+
+    def tearDown(self) -> None:
+        self.users_options = None
+        self.accounts_options = None
+        default_registry.clear()
+
+    # Asserts services targeting different containers share one client and the last one closes it.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_services_share_client(self, mock_cosmos_client):
+        users = DbService(self.users_options)
+        accounts = DbService(self.accounts_options)
+
+        with self.assertLogs(level="INFO"):
+            users.connect()
+            accounts.connect()
+
+        mock_cosmos_client.assert_called_once()
+        self.assertIs(users.client, accounts.client)
+        client = users.client
+
+        with self.assertLogs(level="INFO"):
+            users.close()
+
+        client.close.assert_not_called()
+        self.assertIsNone(users.container)
+
+        with self.assertLogs(level="INFO"):
+            accounts.close()
+
+        client.close.assert_called_once()
+
+    # Asserts a service can opt out of sharing its client.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_service_without_shared_client(self, mock_cosmos_client):
+        self.users_options.share_client = False
+        self.accounts_options.share_client = False
+
+        with self.assertLogs(level="INFO"):
+            DbService(self.users_options).connect()
+            DbService(self.accounts_options).connect()
+
+        self.assertEqual(2, mock_cosmos_client.call_count)
+        self.assertEqual(0, len(default_registry))
+
+    # Asserts reconnecting a service that does not share its client closes the previous client.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_reconnect_closes_unshared_client(self, mock_cosmos_client):
+        self.users_options.share_client = False
+        first, second = Mock(), Mock()
+        mock_cosmos_client.side_effect = [first, second]
+        db_service = DbService(self.users_options)
+
+        with self.assertLogs(level="INFO"):
+            db_service.connect()
+            db_service.connect()
+
+        first.close.assert_called_once()
+        second.close.assert_not_called()
+        self.assertIs(second, db_service.client)
+
+    # Asserts the connection pool settings are given to the client's transport.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_service_configures_connection_pool(self, mock_cosmos_client):
+        self.users_options.connection_pool_size = 50
+        self.users_options.connection_keep_alive = False
+
+        with self.assertLogs(level="INFO"):
+            with DbService(self.users_options) as db_service:
+                self.assertIsNotNone(db_service.container)
+
+        transport = mock_cosmos_client.call_args.kwargs["transport"]
+        self.assertEqual(50, transport.session.get_adapter("https://test").poolmanager.connection_pool_kw["maxsize"])
+        self.assertEqual("close", transport.session.headers["Connection"])
+        mock_cosmos_client.return_value.close.assert_called_once()
+
+    # Asserts the registry key depends on the connection settings and does not hold the account key.
+    def test_client_key(self):
+        self.assertEqual(client_key("endpoint", "key", 10), client_key("endpoint", "key", 10))
+        self.assertNotEqual(client_key("endpoint", "key", 10), client_key("endpoint", "key", 20))
+        self.assertNotIn("key", client_key("endpoint", "key"))
+
+    # Asserts the registry creates a client once per key and closes it once released by every user.
+    def test_registry_reference_counts_clients(self):
+        registry = ClientRegistry()
+        factory = Mock()
+
+        first = registry.acquire(("a",), factory)
+        second = registry.acquire(("a",), factory)
+
+        self.assertIs(first, second)
+        factory.assert_called_once()
+
+        registry.release(("a",))
+        first.close.assert_not_called()
+
+        registry.release(("a",))
+        first.close.assert_called_once()
+        self.assertEqual(0, len(registry))
@@ -0,0 +1,108 @@
+import json
+import threading
+import unittest
+
+from src.db_service.Concurrency import NOT_MODIFIED, Conflict
+from src.db_service.DbService import DbService, DbOptions
+from tests.mocks.InMemoryContainer import InMemoryContainer
+
+class ConcurrencyTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", partition_key_path="/user")
+        self.container = InMemoryContainer(partition_key_path="/user")
+        self.container.seed([{ "id": "account::1", "user": "user", "balance": 0 }])
+        self.db_service = DbService(self.db_options)
+        self.db_service.container = self.container
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.container = None
+        self.db_service = None
+
+    def read(self) -> dict:
+        return self.container.read_item("account::1", "user")
+
+    # Asserts a get with the current etag is not modified and a get with an old etag returns the document.
+    def test_get_if_none_match(self):
+        etag = self.read()["_etag"]
+
+        with self.assertLogs(level="INFO"):
+            unchanged = self.db_service.get("account::1", "user", if_none_match=etag)
+            self.db_service.upsert({ "id": "account::1", "user": "user", "balance": 5 })
+            changed = self.db_service.get("account::1", "user", if_none_match=etag)
+
+        self.assertIs(NOT_MODIFIED, unchanged)
+        self.assertEqual(5, json.loads(changed)["balance"])
+
+    # Asserts an upsert with an old etag is not applied and returns a conflict.
+    def test_upsert_if_match(self):
+        etag = self.read()["_etag"]
+
+        with self.assertLogs(level="INFO"):
+            written = self.db_service.upsert({ "id": "account::1", "user": "user", "balance": 1 }, if_match=etag)
+            conflict = self.db_service.upsert({ "id": "account::1", "user": "user", "balance": 2 }, if_match=etag)
+
+        self.assertEqual(1, json.loads(written)["balance"])
+        self.assertIsInstance(conflict, Conflict)
+        self.assertEqual(("account::1", "user", etag), (conflict.id, conflict.partition_key, conflict.etag))
+        self.assertEqual(1, self.read()["balance"])
+
+    # Asserts a delete with an old etag is not applied and returns a conflict.
+    def test_delete_if_match(self):
+        etag = self.read()["_etag"]
+        self.container.upsert_item({ "id": "account::1", "user": "user", "balance": 1 })
+
+        with self.assertLogs(level="WARNING"):
+            conflict = self.db_service.delete("account::1", "user", if_match=etag)
+
+        self.assertIsInstance(conflict, Conflict)
+        self.assertEqual(1, len(self.container))
+
+        with self.assertLogs(level="INFO"):
+            result = self.db_service.delete("account::1", "user", if_match=self.read()["_etag"])
+
+        self.assertIsNone(result)
+        self.assertEqual(0, len(self.container))
+
+    # Asserts concurrent read-modify-write updates all apply without locks.
+    def test_read_modify_write_retries_concurrent_updates(self):
+        self.container.latency = 0.001
+
+        def deposit(document: dict) -> dict:
+            return { **document, "balance": document["balance"] + 1 }
+
+        def run() -> None:
+            for _ in range(5):
+                self.db_service.read_modify_write("account::1", "user", deposit, max_attempts=100)
+
+        with self.assertLogs(level="INFO"):
+            threads = [threading.Thread(target=run) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join(10)
+
+        self.assertEqual(30, self.read()["balance"])
+
+    # Asserts read-modify-write gives up with a conflict when the item changes on every attempt.
+    def test_read_modify_write_returns_conflict(self):
+        def interfere(document: dict) -> dict:
+            self.container.upsert_item({ **document, "balance": document["balance"] + 100 })
+            return { **document, "balance": -1 }
+
+        with self.assertLogs(level="WARNING"):
+            result = self.db_service.read_modify_write("account::1", "user", interfere, max_attempts=3)
+
+        self.assertIsInstance(result, Conflict)
+        self.assertEqual(300, self.read()["balance"])
+
+    # Asserts read-modify-write creates a missing item and skips writing when the update returns None.
+    def test_read_modify_write_creates_missing_item(self):
+        with self.assertLogs(level="INFO"):
+            created = self.db_service.read_modify_write("account::2", "user", lambda d: { "id": "account::2", "user": "user", "balance": 1 } if d is None else None)
+            unchanged = self.db_service.read_modify_write("account::2", "user", lambda d: None)
+
+        self.assertEqual(1, json.loads(created)["balance"])
+        self.assertIsNone(unchanged)
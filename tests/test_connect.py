@@ -1,14 +1,17 @@
 import unittest
 
+from src.db_service.ClientRegistry import default_registry
 from src.db_service.DbService import DbService, DbOptions
 from unittest.mock import Mock, patch
 
 class ConnectTests(unittest.TestCase):
     def setUp(self) -> None:
        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id")
+       default_registry.clear() # A client shared by an earlier test would be used instead of the mock.
 
     def tearDown(self) -> None:
         self.db_options = None
+        default_registry.clear()
 
     # Assert that we can connect to the database.
     @patch("src.db_service.DbService.CosmosClient")
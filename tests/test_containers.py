@@ -0,0 +1,107 @@
+import json
+import threading
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, Query
+from tests.mocks.InMemoryContainer import InMemoryContainer
+from unittest.mock import Mock, patch
+
+class ContainersTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "users", partition_key_path="/user",
+                                    containers={ "accounts": "/account" }, cache_max_size=10, query_cache_max_bytes=10000,
+                                    share_client=False)
+        self.containers = {
+            "users": InMemoryContainer(partition_key_path="/user"),
+            "accounts": InMemoryContainer(partition_key_path="/account"),
+            "budgets::2026": InMemoryContainer(partition_key_path="/budget")
+        }
+        self.containers["users"].seed([{ "id": "user::1", "user": "user", "name": "Ann" }])
+        self.containers["accounts"].seed([{ "id": "account::1", "account": "checking", "balance": 5 }])
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.containers = None
+
+    def connect(self, mock_cosmos_client: Mock) -> DbService:
+        db = mock_cosmos_client.return_value.get_database_client.return_value
+        db.get_container_client.side_effect = lambda container_id: self.containers[container_id]
+
+        db_service = DbService(self.db_options)
+
+        with self.assertLogs(level="INFO"):
+            db_service.connect()
+
+        return db_service
+
+    # Asserts operations given a container id work with that container and its partition key path.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_operations_target_container(self, mock_cosmos_client):
+        db_service = self.connect(mock_cosmos_client)
+
+        with self.assertLogs(level="INFO"):
+            account = db_service.get("account::1", "checking", container_id="accounts")
+            user = db_service.get("user::1", "user")
+            result = db_service.upsert_many([{ "id": "account::{0}".format(i), "account": "savings" } for i in range(2, 5)], container_id="accounts")
+            query = json.loads(db_service.query(Query("SELECT * FROM c WHERE c.account = 'savings'"), container_id="accounts"))
+
+        self.assertEqual(5, json.loads(account)["balance"])
+        self.assertEqual("Ann", json.loads(user)["name"])
+        self.assertEqual(3, len(result.succeeded))
+        self.assertEqual(3, len(query))
+        self.assertEqual((4, 1), (len(self.containers["accounts"]), len(self.containers["users"])))
+
+    # Asserts a container's client is created once on first use and shared by concurrent callers.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_container_is_created_lazily_once(self, mock_cosmos_client):
+        db_service = self.connect(mock_cosmos_client)
+        db = mock_cosmos_client.return_value.get_database_client.return_value
+        self.assertEqual(1, db.get_container_client.call_count)
+
+        services = list()
+        with self.assertLogs(level="INFO"):
+            threads = [threading.Thread(target=lambda: services.append(db_service.for_container("accounts"))) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(2, db.get_container_client.call_count)
+        self.assertEqual(1, len(set(map(id, services))))
+        self.assertIs(db_service.cache, services[0].cache)
+        self.assertIs(db_service, db_service.for_container("users"))
+        mock_cosmos_client.assert_called_once()
+
+    # Asserts containers not in the db options are resolved, and unknown containers raise.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_container_resolver(self, mock_cosmos_client):
+        self.db_options.container_resolver = lambda container_id: { "budgets": "/budget" }[container_id.split("::")[0]]
+        db_service = self.connect(mock_cosmos_client)
+
+        with self.assertLogs(level="INFO"):
+            db_service.upsert({ "id": "budget::1", "budget": "food" }, container_id="budgets::2026")
+
+        self.assertEqual("/budget", db_service.for_container("budgets::2026").db_options.partition_key_path)
+        self.assertEqual(1, len(self.containers["budgets::2026"]))
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(ValueError):
+                db_service.get("goal::1", "goal", container_id="goals")
+
+    # Asserts cached items and query results of different containers are kept apart.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_caches_are_kept_per_container(self, mock_cosmos_client):
+        self.containers["users"].seed([{ "id": "shared::1", "user": "shared", "owner": "users" }])
+        self.containers["accounts"].seed([{ "id": "shared::1", "account": "shared", "owner": "accounts" }])
+        db_service = self.connect(mock_cosmos_client)
+        query = Query("SELECT * FROM c WHERE c.id = 'shared::1'", cache_ttl=60)
+
+        with self.assertLogs(level="INFO"):
+            users = [json.loads(db_service.get("shared::1", "shared"))["owner"], json.loads(db_service.query(query))[0]["owner"]]
+            accounts = [json.loads(db_service.get("shared::1", "shared", container_id="accounts"))["owner"],
+                        json.loads(db_service.query(query, container_id="accounts"))[0]["owner"]]
+
+        self.assertEqual(["users", "users"], users)
+        self.assertEqual(["accounts", "accounts"], accounts)
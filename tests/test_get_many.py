@@ -0,0 +1,75 @@
+import json
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions
+from unittest.mock import Mock
+
+class GetManyTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+       self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id")
+       self.documents = [
+           { "id": "user::1", "user": "user" },
+           { "id": "user::2", "user": "user" },
+           { "id": "account::1", "user": "account" }
+       ]
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.documents = None
+
+    # Asserts items are read with a single batched point read and missing items map to None.
+    def test_get_many_uses_batched_point_read(self):
+        mock_container = Mock()
+        mock_container.read_items.return_value = self.documents
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        keys = [("user::1", "user"), ("user::2", "user"), ("account::1", "account"), ("missing", "user")]
+        with self.assertLogs(level="INFO"):
+            result = db_service.get_many(keys)
+
+        self.assertEqual(4, len(result))
+        self.assertEqual(self.documents[2], json.loads(result["account::1"]))
+        self.assertIsNone(result["missing"])
+        mock_container.read_items.assert_called_once_with(items=keys)
+        mock_container.query_items.assert_not_called()
+
+    # Asserts one query per partition key is run when batched point reads are not available.
+    def test_get_many_falls_back_to_partition_queries(self):
+        mock_container = Mock(spec=["query_items"])
+        mock_container.query_items.side_effect = lambda query, parameters, partition_key: [
+            d for d in self.documents if d["user"] == partition_key and d["id"] in parameters[0]["value"]]
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        keys = [("user::1", "user"), ("user::2", "user"), ("account::1", "account"), ("missing", "account")]
+        with self.assertLogs(level="INFO"):
+            result = db_service.get_many(keys)
+
+        self.assertEqual(self.documents[0], json.loads(result["user::1"]))
+        self.assertEqual(self.documents[1], json.loads(result["user::2"]))
+        self.assertIsNone(result["missing"])
+        self.assertEqual(2, mock_container.query_items.call_count)
+
+    # Asserts a ValueError is raised if a key is invalid.
+    def test_get_many_raises_value_error(self):
+        db_service = DbService(self.db_options)
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(ValueError):
+                db_service.get_many([("user::1", " ")])
+
+    # Asserts an Exception is raised if an unexpected error occurs.
+    def test_get_many_raises_exception(self):
+        mock_container = Mock()
+        mock_container.read_items.side_effect = Exception()
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(Exception):
+                db_service.get_many([("user::1", "user")])
@@ -0,0 +1,89 @@
+import json
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions
+from src.db_service.Query import Query
+from tests.mocks.InMemoryContainer import InMemoryContainer
+
+class InMemoryContainerTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id")
+        self.container = InMemoryContainer(partition_key_path="/user", default_page_size=2)
+        self.container.seed([
+            { "id": "user::1", "user": "user", "name": "ann", "age": 31, "tags": ["a", "b"] },
+            { "id": "user::2", "user": "user", "name": "bob", "age": 25, "tags": ["b"] },
+            { "id": "user::3", "user": "user", "name": "cid", "age": 40 },
+            { "id": "account::1", "user": "account", "balance": 10 }
+        ])
+
+        self.db_service = DbService(self.db_options)
+        self.db_service.container = self.container
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.container = None
+        self.db_service = None
+
+    # Asserts the service reads, upserts and deletes through the in-memory container.
+    def test_in_memory_container_round_trips_items(self):
+        with self.assertLogs(level="INFO"):
+            self.db_service.upsert({ "id": "user::4", "user": "user", "name": "dee" })
+            item = json.loads(self.db_service.get("user::4", "user"))
+            self.db_service.delete("user::4", "user")
+            missing = self.db_service.get("user::4", "user")
+
+        self.assertEqual("dee", item["name"])
+        self.assertIn("_etag", item)
+        self.assertIsNone(missing)
+        self.assertEqual(4, len(self.container))
+
+    # Asserts parameters bound from the where params filter, order and project the results.
+    def test_in_memory_container_runs_parameterized_queries(self):
+        query = Query("SELECT c.name, c.age FROM c WHERE c.user = @user AND c.age >= @age ORDER BY c.age DESC", { "@user": "user", "@age": 30 })
+
+        with self.assertLogs(level="INFO"):
+            result = json.loads(self.db_service.query(query))
+
+        self.assertEqual([{ "name": "cid", "age": 40 }, { "name": "ann", "age": 31 }], result)
+
+    # Asserts the functions, value selects and limits of the supported dialect.
+    def test_in_memory_container_supports_sql_subset(self):
+        def run(query_str, parameters=None):
+            return list(self.container.query_items(query_str, parameters=parameters))
+
+        self.assertEqual([4], run("SELECT VALUE COUNT(1) FROM c"))
+        self.assertEqual(["user::1", "user::2"], run("SELECT VALUE c.id FROM c WHERE ARRAY_CONTAINS(c.tags, @tag)", [{ "name": "@tag", "value": "b" }]))
+        self.assertEqual(["bob"], run("SELECT VALUE c.name FROM c WHERE NOT IS_DEFINED(c.balance) ORDER BY c.age OFFSET 0 LIMIT 1"))
+        self.assertEqual(["ann", "cid"], run("SELECT TOP 2 VALUE c.name FROM c WHERE c.name IN ('ann', 'cid') OR STARTSWITH(c.id, 'account::') = false AND c.age > 100"))
+        self.assertEqual([], run("SELECT * FROM c WHERE c.age > 'thirty'"))
+
+    # Asserts queries are paged with continuation tokens.
+    def test_in_memory_container_pages_queries(self):
+        query = Query("SELECT * FROM c WHERE c.user = @user", { "@user": "user" })
+
+        with self.assertLogs(level="INFO"):
+            first, token = self.db_service.query_page(query)
+            second, last_token = self.db_service.query_page(query, continuation_token=token)
+
+        self.assertEqual(2, len(json.loads(first)))
+        self.assertEqual(1, len(json.loads(second)))
+        self.assertIsNotNone(token)
+        self.assertIsNone(last_token)
+
+    # Asserts injected 429s are retried by the bulk operations.
+    def test_in_memory_container_injects_throttling(self):
+        self.container = InMemoryContainer(partition_key_path="/user", throttle_rate=0.3, retry_after_ms=1, seed=7)
+        self.db_service.container = self.container
+
+        with self.assertLogs(level="INFO"):
+            result = self.db_service.upsert_many([{ "id": "bulk::{0}".format(i), "user": "bulk" } for i in range(20)])
+
+        self.assertEqual(20, len(result.succeeded))
+        self.assertGreater(self.container.throttled_count, 0)
+
+    # Asserts every operation reports its request charge.
+    def test_in_memory_container_reports_request_charge(self):
+        self.container.read_item("user::1", "user")
+
+        self.assertGreater(float(self.container.client_connection.last_response_headers["x-ms-request-charge"]), 0)
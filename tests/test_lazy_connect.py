@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions
+from tests.mocks.InMemoryContainer import InMemoryContainer
+from unittest.mock import Mock, patch
+
+class LazyConnectTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "users", partition_key_path="/user",
+                                    containers={ "accounts": "/account" }, share_client=False, lazy_connect=True)
+        self.containers = { "users": InMemoryContainer(partition_key_path="/user"), "accounts": InMemoryContainer(partition_key_path="/account") }
+        self.containers["users"].seed([{ "id": "user::1", "user": "user", "name": "Ann" }])
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.containers = None
+
+    def mock_containers(self, mock_cosmos_client: Mock) -> Mock:
+        db = mock_cosmos_client.return_value.get_database_client.return_value
+        db.get_container_client.side_effect = lambda container_id: Mock(wraps=self.containers[container_id])
+        return db
+
+    # Asserts importing the service does not import the SDK or the HTTP client.
+    def test_import_does_not_load_sdk(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run(
+            [sys.executable, "-c", "import json, sys, src.db_service.DbService; print(json.dumps(sorted(sys.modules)))"],
+            cwd=root, capture_output=True, text=True, check=True).stdout
+
+        modules = json.loads(output)
+        self.assertEqual([], [m for m in modules if m.startswith(("azure", "requests"))])
+
+    # Asserts concurrent first operations connect once, and logs how long connecting took.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_first_operations_connect_once(self, mock_cosmos_client):
+        self.mock_containers(mock_cosmos_client)
+        db_service = DbService(self.db_options)
+        results = list()
+
+        with self.assertLogs(level="INFO") as logs:
+            threads = [threading.Thread(target=lambda: results.append(db_service.get("user::1", "user"))) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join(5)
+
+        mock_cosmos_client.assert_called_once()
+        self.assertEqual(["Ann"] * 8, [json.loads(r)["name"] for r in results])
+        self.assertTrue(any("Connected to container users in" in line for line in logs.output))
+
+    # Asserts a service without lazy connection does not connect on its own.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_service_without_lazy_connect_does_not_connect(self, mock_cosmos_client):
+        self.db_options.lazy_connect = False
+        db_service = DbService(self.db_options)
+
+        self.assertIsNone(db_service.container)
+        mock_cosmos_client.assert_not_called()
+
+    # Asserts warming up connects and reads every container in the background.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_warmup_connects_in_background(self, mock_cosmos_client):
+        db = self.mock_containers(mock_cosmos_client)
+        db_service = DbService(self.db_options)
+
+        with self.assertLogs(level="INFO") as logs:
+            db_service.warmup(["accounts"]).join(5)
+
+        mock_cosmos_client.assert_called_once()
+        self.assertEqual(["users", "accounts"], [c.args[0] for c in db.get_container_client.call_args_list])
+        db_service.container.read.assert_called_once()
+        db_service.for_container("accounts").container.read.assert_called_once()
+        self.assertTrue(any("warmed up in" in line for line in logs.output))
+
+    # Asserts a failed warmup is logged instead of raised, and the first operation connects again.
+    @patch("src.db_service.DbService.CosmosClient")
+    def test_warmup_failure_is_logged(self, mock_cosmos_client):
+        mock_cosmos_client.side_effect = [Exception("network unreachable"), mock_cosmos_client.return_value]
+        self.mock_containers(mock_cosmos_client)
+        db_service = DbService(self.db_options)
+
+        with self.assertLogs(level="WARNING"):
+            db_service.warmup().join(5)
+
+        with self.assertLogs(level="INFO"):
+            result = db_service.get("user::1", "user")
+
+        self.assertEqual("Ann", json.loads(result)["name"])
+        self.assertEqual(2, mock_cosmos_client.call_count)
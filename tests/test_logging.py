@@ -0,0 +1,81 @@
+import logging
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, Query
+from src.db_service.LogPolicy import LogPolicy
+from src.db_service.Serialization import ReturnFormat
+from unittest.mock import Mock, patch
+
+class LoggingTests(unittest.TestCase):
+    def setUp(self) -> None:
+       self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id")
+       self.documents = [{ "id": "user::{0}".format(i), "password": "secret", "notes": "x" * 100 } for i in range(3)]
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.documents = None
+
+    # Creates a service writing to the given logger whose container returns the test documents.
+    def create_db_service(self, logger: logging.Logger) -> DbService:
+        mock_container = Mock()
+        mock_container.query_items.return_value = self.documents
+        mock_container.read_item.return_value = self.documents[0]
+
+        db_service = DbService(self.db_options, logger=logger)
+        db_service.container = mock_container
+
+        return db_service
+
+    # Asserts the service writes to the logger it was given.
+    def test_logging_uses_instance_logger(self):
+        db_service = self.create_db_service(logging.getLogger("test.instance"))
+
+        with self.assertLogs("test.instance", level="INFO") as logs:
+            db_service.get("user::0", "user")
+
+        self.assertTrue(all(r.name == "test.instance" for r in logs.records))
+
+    # Asserts documents and keys are left out of log records by default.
+    def test_logging_omits_payloads_and_keys_by_default(self):
+        db_service = self.create_db_service(logging.getLogger("test.default"))
+
+        with self.assertLogs("test.default", level="INFO") as logs:
+            db_service.query(Query("SELECT * FROM c WHERE c.id = @id", where_params={ "@id": "user::0" }))
+            db_service.get("user::0", "user")
+
+        output = "\n".join(logs.output)
+        self.assertIn("3 results retrieved: <3 documents>", output)
+        self.assertNotIn("secret", output)
+        self.assertNotIn("user::0", output)
+
+    # Asserts payloads are redacted and truncated when they are logged.
+    def test_logging_redacts_and_truncates_payloads(self):
+        self.db_options.log_policy = LogPolicy(log_payloads=True, max_payload_chars=50, log_keys=True, redacted_fields=["password"])
+        db_service = self.create_db_service(logging.getLogger("test.payloads"))
+
+        with self.assertLogs("test.payloads", level="INFO") as logs:
+            db_service.get("user::0", "user")
+
+        output = "\n".join(logs.output)
+        self.assertIn("user::0", output)
+        self.assertIn("***", output)
+        self.assertIn("more characters", output)
+        self.assertNotIn("secret", output)
+
+    # Asserts payloads are never formatted when the level is disabled.
+    @patch("src.db_service.LogPolicy.json.dumps")
+    def test_logging_is_lazy(self, mock_dumps):
+        logger = logging.getLogger("test.lazy")
+        logger.setLevel(logging.WARNING)
+        self.db_options.log_policy = LogPolicy(log_payloads=True)
+        db_service = self.create_db_service(logger)
+        db_service.container.upsert_item.return_value = self.documents[0]
+
+        db_service.get("user::0", "user", return_format=ReturnFormat.NATIVE)
+
+        with self.assertLogs(logger, level="WARNING"): # The query fans out to every partition.
+            db_service.query(Query("SELECT * FROM c"), return_format=ReturnFormat.NATIVE)
+
+        db_service.upsert(self.documents[0], return_format=ReturnFormat.NATIVE)
+
+        mock_dumps.assert_not_called()
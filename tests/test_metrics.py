@@ -0,0 +1,112 @@
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions
+from src.db_service.Metrics import Histogram, InMemoryMetricsSink, OpenTelemetryMetricsSink
+from src.db_service.Query import Query
+from tests.mocks.InMemoryContainer import InMemoryContainer
+from unittest.mock import Mock
+
+class MetricsTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.sink = InMemoryMetricsSink()
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", metrics_sink=self.sink)
+        self.container = InMemoryContainer(partition_key_path="/user", default_page_size=2)
+        self.container.seed([{ "id": "user::{0}".format(i), "user": "user", "age": 20 + i } for i in range(5)])
+
+    def tearDown(self) -> None:
+        self.sink = None
+        self.db_options = None
+        self.container = None
+
+    # Asserts point operations record their round trips, documents and request charge.
+    def test_metrics_records_point_operations(self):
+        db_service = DbService(self.db_options)
+        db_service.container = self.container
+
+        with self.assertLogs(level="INFO"):
+            db_service.upsert({ "id": "user::9", "user": "user" })
+            db_service.get("user::9", "user")
+            db_service.delete("user::9", "user")
+
+        for operation in ("get", "upsert", "delete"):
+            self.assertEqual(1, self.sink.histogram("round_trips", operation).sum)
+            self.assertGreater(self.sink.histogram("request_charge", operation).sum, 0)
+            self.assertGreater(self.sink.histogram("duration", operation).sum, 0)
+
+        self.assertGreater(self.sink.histogram("response_bytes", "get").sum, 0)
+        self.assertEqual(1, self.sink.histogram("documents", "get").sum)
+
+    # Asserts queries are labelled by fingerprint and record every page.
+    def test_metrics_records_queries_by_fingerprint(self):
+        db_service = DbService(self.db_options)
+        db_service.container = self.container
+
+        young = Query("SELECT * FROM c WHERE c.age < 23")
+        everyone = Query("SELECT * FROM c WHERE c.age < 30")
+
+        with self.assertLogs(level="INFO"):
+            db_service.query(young)
+            db_service.query(everyone)
+
+        self.assertEqual(young.fingerprint(), everyone.fingerprint())
+        self.assertEqual("SELECT * FROM c WHERE c.age < ?", self.sink.statements[young.fingerprint()])
+
+        pages = self.sink.histogram("pages", "query", young.fingerprint())
+        self.assertEqual(2, pages.count)
+        self.assertEqual(5, pages.sum)
+        self.assertEqual(8, self.sink.histogram("documents", "query", young.fingerprint()).sum)
+        self.assertEqual(5, self.sink.histogram("round_trips", "query", young.fingerprint()).sum)
+
+        top = self.sink.top("request_charge", 1)
+        self.assertEqual(("query", young.fingerprint()), top[0][:2])
+
+    # Asserts a failed get is counted as an error.
+    def test_metrics_records_errors(self):
+        db_service = DbService(self.db_options)
+        db_service.container = self.container
+
+        with self.assertLogs(level="WARNING"):
+            result = db_service.get("missing", "user")
+
+        self.assertIsNone(result)
+        self.assertEqual(1, self.sink.errors("get"))
+
+    # Asserts no response hook is passed to the database without a metrics sink.
+    def test_metrics_disabled_without_sink(self):
+        db_service = DbService(DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id"))
+        db_service.container = Mock()
+        db_service.container.read_item.return_value = { "id": "user::1" }
+
+        with self.assertLogs(level="INFO"):
+            db_service.get("user::1", "user")
+
+        db_service.container.read_item.assert_called_once_with(item="user::1", partition_key="user")
+
+    # Asserts the OpenTelemetry sink records every measurement with the operation as an attribute.
+    def test_metrics_records_into_open_telemetry_meter(self):
+        meter = Mock()
+        db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", metrics_sink=OpenTelemetryMetricsSink(meter))
+        db_service = DbService(db_options)
+        db_service.container = self.container
+
+        with self.assertLogs(level="INFO"):
+            db_service.get("user::1", "user")
+
+        names = [c.args[0] for c in meter.create_histogram.call_args_list]
+        self.assertIn("db_service.request_charge", names)
+        self.assertEqual(6, len(names))
+
+        record = meter.create_histogram.return_value.record
+        self.assertEqual({ "db.operation": "get" }, record.call_args.kwargs["attributes"])
+
+    # Asserts histogram percentiles are estimated from the buckets.
+    def test_metrics_histogram_percentiles(self):
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.record(value)
+
+        self.assertEqual(100, histogram.count)
+        self.assertEqual(50, histogram.percentile(50))
+        self.assertEqual(100, histogram.percentile(99))
+        self.assertEqual(50.5, histogram.mean)
@@ -0,0 +1,125 @@
+import itertools
+import json
+import threading
+import time
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, Query
+from src.db_service.ParallelQuery import ParallelQuery, get_order, sort_key
+from tests.mocks.InMemoryContainer import InMemoryContainer
+from unittest.mock import Mock
+
+class ParallelQueryTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", partition_key_path="/user",
+                                    max_degree_of_parallelism=4, prefetch_pages=1)
+        self.container = InMemoryContainer(partition_key_path="/user", default_page_size=3, feed_range_count=4)
+        self.container.seed([{ "id": "user::{0}".format(i), "user": "user{0}".format(i % 10), "age": i % 7 } for i in range(40)])
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.container = None
+
+    # Asserts the ordering is parsed and queries that cannot be merged are refused.
+    def test_parallel_query_gets_order(self):
+        self.assertEqual([], get_order("SELECT * FROM c WHERE c.age > 1"))
+        self.assertEqual([(("age",), True), (("name", "first"), False)], get_order("SELECT * FROM c ORDER BY c.age DESC, c.name[\"first\"] ASC"))
+        self.assertIsNone(get_order("SELECT TOP 5 * FROM c ORDER BY c.age"))
+        self.assertIsNone(get_order("SELECT VALUE COUNT(1) FROM c"))
+        self.assertIsNone(get_order("SELECT * FROM c ORDER BY LOWER(c.name)"))
+
+    # Asserts documents sort in the database's order of types and the direction of each term.
+    def test_parallel_query_sorts_like_database(self):
+        documents = [{ "a": "x" }, { "a": 2 }, {}, { "a": None }, { "a": True }, { "a": 1, "b": 2 }, { "a": 1, "b": 1 }]
+
+        self.assertEqual([{}, { "a": None }, { "a": True }, { "a": 1, "b": 2 }, { "a": 1, "b": 1 }, { "a": 2 }, { "a": "x" }],
+                         sorted(documents, key=sort_key([(("a",), False), (("b",), True)])))
+
+    # Asserts a query fanning out reads every feed range and returns every document once.
+    def test_query_reads_feed_ranges_in_parallel(self):
+        db_service = DbService(self.db_options)
+        db_service.container = Mock(wraps=self.container)
+
+        with self.assertLogs(level="INFO"):
+            result = json.loads(db_service.query(Query("SELECT * FROM c WHERE c.age > 2")))
+
+        feed_ranges = [c.kwargs["feed_range"]["index"] for c in db_service.container.query_items.call_args_list]
+        self.assertEqual([0, 1, 2, 3], sorted(feed_ranges))
+
+        self.assertEqual(sorted(d["id"] for d in self.container.query_items("SELECT * FROM c WHERE c.age > 2")),
+                         sorted(d["id"] for d in result))
+
+    # Asserts streamed queries read several feed ranges at once, and ordered pages are merged in the order of the query.
+    def test_query_pages_reads_feed_ranges_in_parallel(self):
+        db_service = DbService(self.db_options)
+        db_service.container = self.container
+        lock = threading.Lock()
+        in_flight = [0, 0]
+        request = self.container._request
+
+        def tracked_request() -> None:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+
+            time.sleep(0.01)
+            request()
+
+            with lock:
+                in_flight[0] -= 1
+
+        self.container._request = tracked_request
+
+        with self.assertLogs(level="INFO"):
+            streamed = list(db_service.query_iter(Query("SELECT * FROM c WHERE c.age > 2")))
+            pages = list(db_service.query_pages(Query("SELECT * FROM c ORDER BY c.age, c.id", max_item_count=15)))
+
+        self.assertGreater(in_flight[1], 1)
+        self.assertEqual(sorted(d["id"] for d in self.container.query_items("SELECT * FROM c WHERE c.age > 2")),
+                         sorted(d["id"] for d in streamed))
+        self.assertEqual([15, 15, 10], [len(p) for p in pages])
+        documents = [d for p in pages for d in p]
+        self.assertEqual(sorted(documents, key=lambda d: (d["age"], d["id"])), documents)
+
+    # Asserts the results of every feed range are merged in the order of the query.
+    def test_query_merges_ordered_results(self):
+        db_service = DbService(self.db_options)
+        db_service.container = self.container
+
+        with self.assertLogs(level="INFO"):
+            result = json.loads(db_service.query(Query("SELECT * FROM c ORDER BY c.age DESC, c.id")))
+
+        self.assertEqual(40, len(result))
+        self.assertEqual(sorted(result, key=lambda d: (-d["age"], d["id"])), result)
+
+    # Asserts feed ranges read at most the prefetched pages ahead of the caller.
+    def test_parallel_query_bounds_prefetch(self):
+        produced = [0] * 3
+        lock = threading.Lock()
+
+        def read_range(feed_range: int):
+            while True:
+                with lock:
+                    produced[feed_range] += 1
+
+                yield [feed_range]
+
+        parallel = ParallelQuery(read_range, range(3), max_degree_of_parallelism=2, prefetch_pages=2)
+        documents = parallel.documents()
+        consumed = list(itertools.islice(documents, 6))
+        documents.close()
+
+        for feed_range in range(3):
+            self.assertLessEqual(produced[feed_range], consumed.count(feed_range) + 2)
+
+    # Asserts an error reading a feed range is raised to the caller.
+    def test_parallel_query_raises_range_errors(self):
+        def read_range(feed_range: int):
+            if feed_range == 1:
+                raise KeyError("range gone")
+
+            yield [feed_range]
+
+        with self.assertRaises(KeyError):
+            list(ParallelQuery(read_range, range(3), max_degree_of_parallelism=3).documents())
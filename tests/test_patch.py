@@ -0,0 +1,106 @@
+import json
+import unittest
+
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from src.db_service.Concurrency import Conflict
+from src.db_service.DbService import DbService, DbOptions
+from src.db_service.Patch import Patch, validate_patch_operations
+from tests.mocks.InMemoryContainer import InMemoryContainer
+from unittest.mock import Mock
+
+class PatchTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", partition_key_path="/user")
+        self.container = InMemoryContainer(partition_key_path="/user")
+        self.container.seed([{ "id": "account::{0}".format(i), "user": "user", "balance": i * 10, "tags": ["a"], "note": "x" } for i in range(3)])
+        self.db_service = DbService(self.db_options)
+        self.db_service.container = self.container
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.container = None
+        self.db_service = None
+
+    def read(self, id: str) -> dict:
+        return self.container.read_item(id, "user")
+
+    # Asserts the builders create the operations of the partial update API and invalid operations are refused.
+    def test_patch_builds_and_validates_operations(self):
+        self.assertEqual({ "op": "incr", "path": "/balance", "value": 5 }, Patch.incr("/balance", 5))
+        self.assertEqual({ "op": "move", "from": "/a", "path": "/b" }, Patch.move("/a", "/b"))
+
+        with self.assertRaises(TypeError):
+            validate_patch_operations(None)
+
+        for operations in ([], [Patch.set("/a", 1)] * 11, [{ "op": "merge", "path": "/a" }], [Patch.set("a", 1)],
+                           [{ "op": "set", "path": "/a" }], [Patch.incr("/a", "1")]):
+            with self.assertRaises(ValueError):
+                validate_patch_operations(operations)
+
+    # Asserts the operations are applied to the stored item and the patched item is returned.
+    def test_patch_applies_operations(self):
+        with self.assertLogs(level="INFO"):
+            result = self.db_service.patch("account::1", "user", [
+                Patch.incr("/balance", 5),
+                Patch.set("/status", "active"),
+                Patch.add("/tags/-", "b"),
+                Patch.remove("/note")])
+
+        expected = { "balance": 15, "status": "active", "tags": ["a", "b"] }
+        self.assertEqual(expected, { k: v for k, v in json.loads(result).items() if k in expected })
+        self.assertEqual(expected, { k: v for k, v in self.read("account::1").items() if k in expected })
+        self.assertNotIn("note", self.read("account::1"))
+
+    # Asserts only the operations are sent to the database, with the filter predicate when given.
+    def test_patch_sends_operations_and_filter_predicate(self):
+        self.db_service.container = Mock(wraps=self.container)
+        operations = [Patch.incr("/balance", -5)]
+
+        with self.assertLogs(level="INFO"):
+            self.db_service.patch("account::1", "user", operations, filter_predicate="FROM c WHERE c.balance >= 5")
+
+        kwargs = self.db_service.container.patch_item.call_args.kwargs
+        self.assertEqual(("account::1", "user", operations, "FROM c WHERE c.balance >= 5"),
+                         (kwargs["item"], kwargs["partition_key"], kwargs["patch_operations"], kwargs["filter_predicate"]))
+
+    # Asserts a patch whose filter predicate does not match is not applied and returns a conflict.
+    def test_patch_returns_conflict_when_predicate_fails(self):
+        with self.assertLogs(level="WARNING"):
+            result = self.db_service.patch("account::0", "user", [Patch.incr("/balance", -5)], filter_predicate="FROM c WHERE c.balance >= 5")
+
+        self.assertIsInstance(result, Conflict)
+        self.assertEqual(0, self.read("account::0")["balance"])
+
+    # Asserts patching a missing item raises and invalid operations raise before the database is called.
+    def test_patch_raises_on_missing_item_and_invalid_operations(self):
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(CosmosResourceNotFoundError):
+                self.db_service.patch("account::9", "user", [Patch.set("/balance", 1)])
+
+        requests = self.container.request_count
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(ValueError):
+                self.db_service.patch("account::1", "user", [{ "op": "merge", "path": "/balance" }])
+
+        self.assertEqual(requests, self.container.request_count)
+
+    # Asserts patch_many applies the patches of a partition in one batch and reports items that fail the predicate.
+    def test_patch_many_batches_patches(self):
+        self.db_service.container = Mock(wraps=self.container)
+        patches = [("account::{0}".format(i), "user", [Patch.incr("/balance", -10)]) for i in range(3)]
+
+        with self.assertLogs(level="INFO"):
+            result = self.db_service.patch_many(patches[1:])
+
+        self.assertEqual(1, self.db_service.container.execute_item_batch.call_count)
+        self.assertEqual(2, len(result.succeeded))
+        self.assertEqual([0, 10], [self.read("account::{0}".format(i))["balance"] for i in (1, 2)])
+
+        with self.assertLogs(level="WARNING"):
+            result = self.db_service.patch_many(patches, filter_predicate="FROM c WHERE c.balance >= 10")
+
+        self.assertEqual(["account::2"], [r.id for r in result.succeeded])
+        self.assertEqual(["account::0", "account::1"], sorted(r.id for r in result.failed))
+        self.assertEqual([0, 0, 0], [self.read("account::{0}".format(i))["balance"] for i in range(3)])
@@ -0,0 +1,83 @@
+import json
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, Query
+from src.db_service.PreparedQuery import PreparedQuery
+from src.db_service.Query import find_partition_key_source
+from tests.mocks.InMemoryContainer import InMemoryContainer
+from unittest.mock import patch
+
+class PreparedQueryTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id")
+
+    def tearDown(self) -> None:
+        self.db_options = None
+
+    # Asserts the parameters, statement and fingerprint are found once when the query is prepared.
+    def test_prepared_query_compiles_template(self):
+        prepared = PreparedQuery("SELECT * FROM c\n WHERE c.age > @age AND c.name = 'a@b' AND c.min <= @age AND c.user = @user")
+
+        self.assertEqual(("@age", "@user"), prepared.parameter_names)
+        self.assertEqual("SELECT * FROM c WHERE c.age > @age AND c.name = ? AND c.min <= @age AND c.user = @user", prepared.statement)
+        self.assertEqual(Query(prepared.query_str).fingerprint(), prepared.fingerprint)
+
+    # Asserts a bound query matches the same query built by hand.
+    def test_prepared_query_binds_values(self):
+        prepared = PreparedQuery("SELECT * FROM c WHERE c.age > @age AND c.user = @user", max_item_count=10)
+        where_params = { "@user": "user", "@age": 30 }
+        query = prepared.bind(where_params)
+        expected = Query(prepared.query_str, where_params, max_item_count=10)
+
+        self.assertEqual([{ "name": "@age", "value": 30 }, { "name": "@user", "value": "user" }], query.build_where_params())
+        self.assertEqual(expected.cache_key(), query.cache_key())
+        self.assertEqual(expected.fingerprint(), query.fingerprint())
+        self.assertEqual(10, query.build_query_options()["max_item_count"])
+
+    # Asserts binding raises when a parameter is missing or unknown.
+    def test_prepared_query_raises_on_mismatched_parameters(self):
+        prepared = PreparedQuery("SELECT * FROM c WHERE c.age > @age")
+
+        with self.assertRaises(ValueError):
+            prepared.bind({})
+
+        with self.assertRaises(ValueError):
+            prepared.bind({ "@age": 1, "@name": "a" })
+
+        with self.assertRaises(ValueError):
+            PreparedQuery(" ")
+
+        self.assertIsNone(PreparedQuery("SELECT * FROM c").bind().build_where_params())
+
+    # Asserts bound queries are executed by the service.
+    def test_query_executes_prepared_query(self):
+        db_service = DbService(self.db_options)
+        db_service.container = InMemoryContainer(partition_key_path="/user")
+        db_service.container.seed([{ "id": "user::{0}".format(i), "user": "user", "age": 20 + i } for i in range(5)])
+
+        prepared = PreparedQuery("SELECT * FROM c WHERE c.age >= @age")
+
+        with self.assertLogs(level="INFO"):
+            older = json.loads(db_service.query(prepared.bind({ "@age": 23 })))
+            everyone = json.loads(db_service.query(prepared.bind({ "@age": 0 })))
+
+        self.assertEqual(["user::3", "user::4"], sorted(d["id"] for d in older))
+        self.assertEqual(5, len(everyone))
+
+    # Asserts the partition key a prepared query is routed by is found once and looked up by every bound query.
+    def test_prepared_query_routes_by_bound_partition_key(self):
+        prepared = PreparedQuery("SELECT * FROM c WHERE c.user = @user AND c.kind = 'budget' AND c.age > @age")
+        literal = PreparedQuery("SELECT * FROM c WHERE c.kind = 'budget' AND c.age > @age")
+
+        with patch("src.db_service.PreparedQuery.find_partition_key_source", wraps=find_partition_key_source) as find:
+            first = prepared.bind({ "@user": "a", "@age": 1 }).build_query_options("/user")
+            second = prepared.bind({ "@user": "b", "@age": 2 }).build_query_options("/user")
+            kind = literal.bind({ "@age": 1 }).build_query_options("/kind")
+            scoped = prepared.bind({ "@user": "a", "@age": 1 }, partition_key="c").build_query_options("/user")
+
+        self.assertEqual(["a", "b", "budget", "c"], [first["partition_key"], second["partition_key"], kind["partition_key"], scoped["partition_key"]])
+        self.assertEqual(2, find.call_count)
+        self.assertEqual((None, None), prepared.partition_key_route("/age"))
+        self.assertEqual(Query(prepared.query_str, { "@user": "a" }).find_partition_key("/user"),
+                         prepared.bind({ "@user": "a", "@age": 1 }).find_partition_key("/user"))
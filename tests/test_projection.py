@@ -0,0 +1,81 @@
+import json
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, Query
+from src.db_service.PreparedQuery import PreparedQuery
+from tests.mocks.InMemoryContainer import InMemoryContainer
+
+class ProjectionTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", partition_key_path="/user")
+        self.container = InMemoryContainer(partition_key_path="/user")
+        self.container.seed([{ "id": "txn::{0}".format(i), "user": "user", "amount": i, "metadata": "x" * 1000 } for i in range(3)])
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.container = None
+
+    # Asserts the fields replace the '*' of the query string.
+    def test_query_builds_projection_from_fields(self):
+        self.assertEqual("SELECT TOP 5 u.id, u.amount FROM users u WHERE u.amount > 1",
+                         Query("SELECT TOP 5 * FROM users u WHERE u.amount > 1", fields=["id", "amount"]).query_str)
+        self.assertEqual("SELECT c.id FROM c", PreparedQuery("SELECT * FROM c", fields=["id"]).bind().query_str)
+
+    # Asserts fields are refused for query strings not selecting '*' and names that are not properties.
+    def test_query_raises_on_invalid_fields(self):
+        with self.assertRaises(ValueError):
+            Query("SELECT c.id FROM c", fields=["amount"])
+
+        with self.assertRaises(ValueError):
+            Query("SELECT * FROM c", fields=["amount; DROP"])
+
+        with self.assertRaises(ValueError):
+            Query("SELECT * FROM c", fields=[])
+
+    # Asserts a query with fields returns only those properties.
+    def test_query_returns_projected_documents(self):
+        db_service = DbService(self.db_options)
+        db_service.container = self.container
+
+        with self.assertLogs(level="INFO"):
+            result = json.loads(db_service.query(Query("SELECT * FROM c WHERE c.amount >= 1", fields=["id", "amount"])))
+
+        self.assertEqual([{ "id": "txn::1", "amount": 1 }, { "id": "txn::2", "amount": 2 }], sorted(result, key=lambda d: d["id"]))
+
+    # Asserts get returns only the fields of an item, and None if the item is missing.
+    def test_get_returns_projected_item(self):
+        db_service = DbService(self.db_options)
+        db_service.container = self.container
+
+        with self.assertLogs(level="INFO"):
+            result = db_service.get("txn::1", "user", fields=["amount"])
+
+        with self.assertLogs(level="WARNING"):
+            missing = db_service.get("txn::9", "user", fields=["amount"])
+
+        self.assertEqual({ "amount": 1 }, json.loads(result))
+        self.assertIsNone(missing)
+
+    # Asserts get_many returns only the fields of every item, keyed by id.
+    def test_get_many_returns_projected_items(self):
+        db_service = DbService(self.db_options)
+        db_service.container = self.container
+
+        with self.assertLogs(level="INFO"):
+            result = db_service.get_many([("txn::0", "user"), ("txn::2", "user"), ("txn::9", "user")], fields=["amount"])
+
+        self.assertEqual({ "amount": 0 }, json.loads(result["txn::0"]))
+        self.assertEqual({ "amount": 2 }, json.loads(result["txn::2"]))
+        self.assertIsNone(result["txn::9"])
+
+    # Asserts invalid fields raise before the database is called.
+    def test_get_raises_on_invalid_fields(self):
+        db_service = DbService(self.db_options)
+        db_service.container = self.container
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(ValueError):
+                db_service.get("txn::1", "user", fields=["a b"])
+
+        self.assertEqual(0, self.container.request_count)
@@ -2,6 +2,7 @@ import json
 import unittest
 
 from src.db_service.DbService import DbService, DbOptions, Query
+from tests.mocks.InMemoryContainer import InMemoryContainer
 from tests.mocks.User import User
 from unittest.mock import Mock
 
@@ -99,3 +100,48 @@ class QueryTests(unittest.TestCase):
         result = query.build_where_params()
 
         self.assertEqual(1, len(result))
+
+    # Asserts an explicit partition key is passed to the database instead of fanning out.
+    def test_query_passes_partition_key(self):
+        mock_container = Mock()
+        mock_container.query_items.return_value = [User("test1", "testing").__dict__]
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        with self.assertLogs(level="INFO") as logs:
+            db_service.query(Query("SELECT * FROM c WHERE c.age > 30", partition_key="user"))
+
+        mock_container.query_items.assert_called_once_with("SELECT * FROM c WHERE c.age > 30", partition_key="user")
+        self.assertFalse(any(r.levelname == "WARNING" for r in logs.records))
+
+    # Asserts the partition key is found from an equality filter on the partition key path.
+    def test_query_finds_partition_key(self):
+        self.assertEqual("a", Query("SELECT * FROM c WHERE c.user = @user AND c.age > 1", { "@user": "a" }).find_partition_key("/user"))
+        self.assertEqual("it's", Query("SELECT * FROM users u WHERE u[\"user\"] = 'it\\'s'").find_partition_key("/user"))
+        self.assertEqual(7, Query("SELECT * FROM c WHERE (c.tenant.id = 7) ORDER BY c.age").find_partition_key("/tenant/id"))
+        self.assertIsNone(Query("SELECT * FROM c WHERE c.user = 'a' OR c.age > 1").find_partition_key("/user"))
+        self.assertIsNone(Query("SELECT * FROM c WHERE c.user != 'a'").find_partition_key("/user"))
+        self.assertIsNone(Query("SELECT * FROM c WHERE c.username = 'a'").find_partition_key("/user"))
+        self.assertIsNone(Query("SELECT * FROM c WHERE c.User = 'a'").find_partition_key("/user"))
+        self.assertIsNone(Query("SELECT * FROM c WHERE C.user = 'a'").find_partition_key("/user"))
+        self.assertTrue(Query("SELECT * FROM c WHERE c.active = TRUE").find_partition_key("/active"))
+        self.assertIsNone(Query("SELECT * FROM c").find_partition_key("/user"))
+
+    # Asserts a query filtering on the partition key is routed to its partition and a fan out is logged once.
+    def test_query_routes_to_single_partition(self):
+        db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", partition_key_path="/user")
+        db_service = DbService(db_options)
+        container = InMemoryContainer(partition_key_path="/user")
+        container.seed([{ "id": "user::{0}".format(i), "user": "user{0}".format(i % 2) } for i in range(4)])
+        db_service.container = Mock(wraps=container)
+
+        with self.assertLogs(level="INFO") as logs:
+            result = db_service.query(Query("SELECT * FROM c WHERE c.user = @user", { "@user": "user1" }))
+            db_service.query(Query("SELECT * FROM c WHERE c.id = 'user::1'"))
+            db_service.query(Query("SELECT * FROM c WHERE c.id = 'user::2'"))
+
+        self.assertEqual(2, len(json.loads(result)))
+        self.assertEqual("user1", db_service.container.query_items.call_args_list[0].kwargs["partition_key"])
+        self.assertNotIn("partition_key", db_service.container.query_items.call_args_list[1].kwargs)
+        self.assertEqual(1, len([r for r in logs.records if "fans out" in r.getMessage()]))
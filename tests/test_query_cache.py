@@ -0,0 +1,118 @@
+import json
+import time
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, Query
+from src.db_service.QueryCache import QueryCache
+from unittest.mock import Mock
+
+class QueryCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+       self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id",
+           partition_key_path="/user", query_cache_max_bytes=1024)
+       self.documents = [{ "id": "category::1", "user": "user::1" }, { "id": "category::2", "user": "user::1" }]
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.documents = None
+
+    # Creates a service whose container returns the test documents.
+    def create_db_service(self) -> DbService:
+        mock_container = Mock()
+        mock_container.query_items.return_value = self.documents
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        return db_service
+
+    # Creates the categories query, optionally opted in to the cache.
+    def create_query(self, query_str: str="SELECT * FROM c WHERE c.user = @user", cache_ttl: float=60) -> Query:
+        return Query(query_str=query_str, where_params={ "@user": "user::1" }, cache_ttl=cache_ttl, cache_tags=["categories"])
+
+    # Asserts equivalent queries are served from the cache.
+    def test_query_cache_serves_equivalent_queries(self):
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            first = db_service.query(self.create_query())
+            second = db_service.query(self.create_query("SELECT *  FROM c\n WHERE c.user = @user"))
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.documents, json.loads(second))
+        db_service.container.query_items.assert_called_once()
+        self.assertEqual(1, db_service.query_cache.stats()["hits"])
+
+    # Asserts queries that do not opt in are never cached.
+    def test_query_cache_ignores_queries_without_ttl(self):
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            db_service.query(self.create_query(cache_ttl=None))
+            db_service.query(self.create_query(cache_ttl=None))
+
+        self.assertEqual(2, db_service.container.query_items.call_count)
+        self.assertEqual(0, len(db_service.query_cache))
+
+    # Asserts results expire after their ttl.
+    def test_query_cache_expires_results(self):
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            db_service.query(self.create_query(cache_ttl=0.01))
+            time.sleep(0.02)
+            db_service.query(self.create_query(cache_ttl=0.01))
+
+        self.assertEqual(2, db_service.container.query_items.call_count)
+
+    # Asserts results can be invalidated by tag or partition key.
+    def test_query_cache_invalidates_by_tag_and_partition(self):
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            db_service.query(self.create_query())
+            self.assertEqual(0, db_service.invalidate_queries(partition_key="user::2"))
+            self.assertEqual(1, db_service.invalidate_queries(partition_key="user::1"))
+
+            db_service.query(self.create_query())
+            self.assertEqual(1, db_service.invalidate_queries(tag="categories"))
+
+        self.assertEqual(0, len(db_service.query_cache))
+
+    # Asserts results that are empty or do not select the partition key are invalidated by the partition they are routed to.
+    def test_query_cache_invalidates_by_routed_partition(self):
+        db_service = self.create_db_service()
+        db_service.container.query_items.side_effect = [[{ "id": "category::1" }], [], [{ "id": "category::2" }]]
+
+        with self.assertLogs(level="INFO"):
+            db_service.query(self.create_query("SELECT c.id FROM c WHERE c.user = @user"))
+            db_service.query(self.create_query("SELECT * FROM c WHERE c.user = @user AND c.name = 'none'"))
+            db_service.query(Query("SELECT c.id FROM c", cache_ttl=60, partition_key="user::1"))
+
+            self.assertEqual(0, db_service.invalidate_queries(partition_key="user::2"))
+            self.assertEqual(3, db_service.invalidate_queries(partition_key="user::1"))
+
+        self.assertEqual(0, len(db_service.query_cache))
+
+    # Asserts the cache stays within its byte bound.
+    def test_query_cache_evicts_to_stay_within_bytes(self):
+        cache = QueryCache(100)
+
+        cache.put(("a",), "a" * 60, 60, 60)
+        cache.put(("b",), "b" * 60, 60, 60)
+        cache.put(("c",), "c" * 200, 200, 60)
+
+        self.assertIsNone(cache.get(("a",)))
+        self.assertIsNotNone(cache.get(("b",)))
+        self.assertIsNone(cache.get(("c",)))
+        self.assertEqual(60, cache.size)
+        self.assertEqual(1, cache.evictions)
+
+    # Asserts the cache key does not depend on the order of the where parameters.
+    def test_query_cache_key_is_canonical(self):
+        first = Query("SELECT * FROM c WHERE c.a = @a AND c.b = @b", where_params={ "@a": 1, "@b": 2 })
+        second = Query(" SELECT * FROM c WHERE c.a = @a   AND c.b = @b ", where_params={ "@b": 2, "@a": 1 })
+        third = Query("SELECT * FROM c WHERE c.a = @a AND c.b = @b", where_params={ "@a": 1, "@b": 3 })
+
+        self.assertEqual(first.cache_key(), second.cache_key())
+        self.assertNotEqual(first.cache_key(), third.cache_key())
@@ -0,0 +1,115 @@
+import io
+import json
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, Query
+from src.db_service.JsonArrayEncoder import JsonArrayEncoder
+from tests.mocks.User import User
+from unittest.mock import Mock
+
+class QueryIterTests(unittest.TestCase):
+    def setUp(self) -> None:
+       self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id")
+       self.pages = [
+           [User("test1", "testing").__dict__, User("test2", "testing").__dict__],
+           [User("test3", "testing").__dict__]
+       ]
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.pages = None
+
+    # Creates a service whose container returns the pages lazily.
+    def create_db_service(self) -> DbService:
+        item_paged = Mock()
+        item_paged.by_page.return_value = iter(self.pages)
+
+        mock_container = Mock()
+        mock_container.query_items.return_value = item_paged
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        return db_service
+
+    # Asserts documents are yielded one at a time across pages.
+    def test_query_iter_yields_documents(self):
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            result = list(db_service.query_iter(Query(query_str="SELECT * FROM users")))
+
+        self.assertEqual(3, len(result))
+        self.assertEqual("test3", User(**result[2]).user)
+        db_service.container.query_items.assert_called_once()
+
+    # Asserts the first page is available before later pages are requested.
+    def test_query_pages_yields_pages_lazily(self):
+        db_service = self.create_db_service()
+        pages = db_service.query_pages(Query(query_str="SELECT * FROM users"))
+
+        with self.assertLogs(level="INFO"):
+            first = next(pages)
+
+        self.assertEqual(2, len(first))
+
+        with self.assertLogs(level="INFO"):
+            remaining = list(pages)
+
+        self.assertEqual(1, len(remaining))
+
+    # Asserts a TypeError is raised if the query object given is invalid.
+    def test_query_iter_raises_type_error(self):
+        db_service = DbService(self.db_options)
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(TypeError):
+                list(db_service.query_iter(None))
+
+    # Asserts an Exception is raised if an unexpected error occurs.
+    def test_query_pages_raises_exception(self):
+        mock_container = Mock()
+        mock_container.query_items.side_effect = Exception()
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(Exception):
+                list(db_service.query_pages(Query(query_str="SELECT * FROM users")))
+
+    # Asserts the query is streamed as a JSON array into a text sink.
+    def test_query_to_stream_writes_json_array(self):
+        db_service = self.create_db_service()
+        sink = io.StringIO()
+
+        with self.assertLogs(level="INFO"):
+            count = db_service.query_to_stream(Query(query_str="SELECT * FROM users"), sink)
+
+        self.assertEqual(3, count)
+        self.assertEqual(3, len(json.loads(sink.getvalue())))
+
+    # Asserts the encoder writes bytes to socket-like sinks and an empty array when there is no data.
+    def test_json_array_encoder_writes_to_socket(self):
+        sent = list()
+        socket = Mock(spec=["sendall"])
+        socket.sendall.side_effect = sent.append
+
+        encoder = JsonArrayEncoder(socket)
+        count = encoder.write_all(iter([]))
+
+        self.assertEqual(0, count)
+        self.assertEqual(b"[]", b"".join(sent))
+
+    # Asserts the encoder writes bytes to binary file-like sinks.
+    def test_json_array_encoder_writes_to_binary_sink(self):
+        sink = io.BytesIO()
+
+        JsonArrayEncoder(sink).write_all(iter(self.pages[0]))
+
+        self.assertEqual(self.pages[0], json.loads(sink.getvalue()))
+
+    # Asserts a TypeError is raised if the sink cannot be written to.
+    def test_json_array_encoder_raises_type_error(self):
+        with self.assertRaises(TypeError):
+            JsonArrayEncoder(object())
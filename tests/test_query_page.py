@@ -0,0 +1,108 @@
+import json
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, Query
+from unittest.mock import Mock
+
+class Pager(object):
+    """
+    Stand-in for the SDK's page iterator, paging a list with offsets as continuation tokens.
+    """
+
+    def __init__(self, items, page_size, continuation_token):
+        self.items = items
+        self.page_size = page_size
+        self.offset = int(continuation_token or 0)
+        self.continuation_token = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.offset >= len(self.items):
+            raise StopIteration
+
+        page = self.items[self.offset:self.offset + self.page_size]
+        self.offset += self.page_size
+        self.continuation_token = str(self.offset) if self.offset < len(self.items) else None
+
+        return iter(page)
+
+class QueryPageTests(unittest.TestCase):
+    def setUp(self) -> None:
+       self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id")
+       self.documents = [{ "id": "transaction::{0}".format(i) } for i in range(5)]
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.documents = None
+
+    # Creates a service whose container pages the test documents by the requested page size.
+    def create_db_service(self) -> DbService:
+        def query_items(query_str, **kwargs):
+            item_paged = Mock()
+            item_paged.by_page.side_effect = lambda token: Pager(self.documents, kwargs.get("max_item_count", 100), token)
+            return item_paged
+
+        mock_container = Mock()
+        mock_container.query_items.side_effect = query_items
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        return db_service
+
+    # Asserts pages can be walked with continuation tokens.
+    def test_query_page_walks_pages(self):
+        db_service = self.create_db_service()
+        query = Query("SELECT * FROM c", max_item_count=2)
+
+        pages = list()
+        token = None
+        with self.assertLogs(level="INFO"):
+            while True:
+                items, token = db_service.query_page(query, continuation_token=token)
+                pages.append(json.loads(items))
+
+                if token is None:
+                    break
+
+        self.assertEqual([2, 2, 1], [len(p) for p in pages])
+        self.assertEqual("transaction::4", pages[2][0]["id"])
+        self.assertEqual(2, db_service.container.query_items.call_args.kwargs["max_item_count"])
+
+    # Asserts the page size given overrides the query's max item count.
+    def test_query_page_uses_page_size(self):
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            items, token = db_service.query_page(Query("SELECT * FROM c", max_item_count=2), page_size=4)
+
+        self.assertEqual(4, len(json.loads(items)))
+        self.assertEqual("4", token)
+
+    # Asserts an empty page returns None.
+    def test_query_page_returns_none_when_empty(self):
+        self.documents = list()
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            items, token = db_service.query_page(Query("SELECT * FROM c"), page_size=4)
+
+        self.assertIsNone(items)
+        self.assertIsNone(token)
+
+    # Asserts invalid parameters raise.
+    def test_query_page_raises_on_invalid_parameters(self):
+        db_service = DbService(self.db_options)
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(TypeError):
+                db_service.query_page(None)
+
+        with self.assertLogs(level="ERROR"):
+            with self.assertRaises(ValueError):
+                db_service.query_page(Query("SELECT * FROM c"), page_size=0)
+
+        with self.assertRaises(ValueError):
+            Query("SELECT * FROM c", max_item_count=0)
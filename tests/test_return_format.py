@@ -0,0 +1,93 @@
+import json
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, Query
+from src.db_service.Serialization import ReturnFormat, dumps_bytes, from_bytes
+from tests.mocks.User import User
+from unittest.mock import Mock
+
+class ReturnFormatTests(unittest.TestCase):
+    def setUp(self) -> None:
+       self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id")
+       self.user = User("test", "testing").__dict__
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.user = None
+
+    # Creates a service whose container returns the test user.
+    def create_db_service(self) -> DbService:
+        mock_container = Mock()
+        mock_container.read_item.return_value = self.user
+        mock_container.query_items.return_value = [self.user]
+        mock_container.upsert_item.return_value = self.user
+
+        db_service = DbService(self.db_options)
+        db_service.container = mock_container
+
+        return db_service
+
+    # Asserts documents are returned as native objects when requested per call.
+    def test_return_format_native_per_call(self):
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            self.assertIs(self.user, db_service.get("user::test", "user", return_format=ReturnFormat.NATIVE))
+            self.assertEqual([self.user], db_service.query(Query("SELECT * FROM users"), return_format=ReturnFormat.NATIVE))
+            self.assertIs(self.user, db_service.upsert(self.user, return_format=ReturnFormat.NATIVE))
+
+    # Asserts the db options' return format applies to every call.
+    def test_return_format_bytes_from_options(self):
+        self.db_options.return_format = ReturnFormat.BYTES
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            result = db_service.get("user::test", "user")
+
+        self.assertIsInstance(result, bytes)
+        self.assertEqual(self.user, json.loads(result))
+
+        db_service.container.read_items.return_value = [dict(self.user, id="user::test")]
+
+        with self.assertLogs(level="INFO"):
+            result = db_service.get_many([("user::test", "user")])
+
+        self.assertIsInstance(result["user::test"], bytes)
+
+    # Asserts the default return format stays a JSON string.
+    def test_return_format_defaults_to_str(self):
+        db_service = self.create_db_service()
+
+        with self.assertLogs(level="INFO"):
+            result = db_service.query(Query("SELECT * FROM users"))
+
+        self.assertEqual(json.dumps([self.user]), result)
+
+    # Asserts bytes can be converted to every return format.
+    def test_from_bytes_converts_to_every_format(self):
+        data = dumps_bytes(self.user)
+
+        self.assertEqual(self.user, from_bytes(data, ReturnFormat.NATIVE))
+        self.assertEqual(self.user, json.loads(from_bytes(data, ReturnFormat.STR)))
+        self.assertIs(data, from_bytes(data, ReturnFormat.BYTES))
+
+    # Asserts native documents served from the caches are copies the caller can change.
+    def test_return_format_native_from_caches_are_copies(self):
+        self.db_options.cache_max_size = 10
+        self.db_options.query_cache_max_bytes = 1024
+        db_service = self.create_db_service()
+        query = Query("SELECT * FROM users", cache_ttl=60)
+
+        with self.assertLogs(level="INFO"):
+            db_service.get("user::test", "user", return_format=ReturnFormat.NATIVE)["name"] = "changed"
+            db_service.query(query, return_format=ReturnFormat.NATIVE).append({ "id": "user::other" })
+
+            item = db_service.get("user::test", "user", return_format=ReturnFormat.NATIVE)
+            documents = db_service.query(query, return_format=ReturnFormat.NATIVE)
+            text = db_service.query(query)
+
+        self.assertEqual(self.user, item)
+        self.assertEqual([self.user], documents)
+        self.assertEqual([self.user], json.loads(text))
+        self.assertEqual(1, db_service.container.read_item.call_count)
+        self.assertEqual(1, db_service.container.query_items.call_count)
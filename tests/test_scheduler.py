@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions
+from src.db_service.Scheduler import Priority, Scheduler
+from tests.mocks.InMemoryContainer import InMemoryContainer
+
+class SchedulerTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.release = threading.Event()
+        self.threads = list()
+
+    def tearDown(self) -> None:
+        self.release.set()
+
+        for thread in self.threads:
+            thread.join(5)
+
+    def start(self, target) -> None:
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def wait_for(self, predicate) -> None:
+        deadline = time.monotonic() + 5
+        while not predicate():
+            if time.monotonic() > deadline:
+                self.fail("Timed out waiting for the scheduler.")
+
+            time.sleep(0.001)
+
+    # Asserts a waiting interactive request is served before bulk work queued earlier.
+    def test_scheduler_serves_interactive_before_bulk(self):
+        scheduler = Scheduler(max_concurrency=1)
+        order = list()
+        self.assertEqual(1, scheduler.lane_concurrency[Priority.BULK]) # No slot is left to keep for interactive requests.
+
+        self.start(lambda: scheduler.run(self.release.wait, Priority.BULK))
+        self.wait_for(lambda: scheduler.stats()["bulk"]["running"] == 1)
+
+        self.start(lambda: scheduler.run(lambda: order.append("bulk"), Priority.BULK))
+        self.wait_for(lambda: scheduler.stats()["bulk"]["queued"] == 1)
+
+        self.start(lambda: scheduler.run(lambda: order.append("interactive"), Priority.INTERACTIVE))
+        self.wait_for(lambda: scheduler.stats()["interactive"]["queued"] == 1)
+
+        self.release.set()
+        self.wait_for(lambda: len(order) == 2)
+
+        self.assertEqual(["interactive", "bulk"], order)
+        self.assertGreater(scheduler.stats()["interactive"]["wait"]["max"], 0)
+
+    # Asserts bulk requests leave a slot free for interactive requests.
+    def test_scheduler_reserves_slot_for_interactive(self):
+        scheduler = Scheduler(max_concurrency=2)
+
+        self.start(lambda: scheduler.run(self.release.wait, Priority.BULK))
+        self.wait_for(lambda: scheduler.stats()["bulk"]["running"] == 1)
+
+        with self.assertRaises(TimeoutError):
+            scheduler.run(lambda: None, Priority.BULK, timeout=0.05)
+
+        self.assertEqual("done", scheduler.run(lambda: "done", Priority.INTERACTIVE, timeout=0.05))
+
+    # Asserts requests are rejected once their lane's queue is full.
+    def test_scheduler_rejects_when_queue_is_full(self):
+        scheduler = Scheduler(max_concurrency=1, max_queue_size=1)
+
+        self.start(lambda: scheduler.run(self.release.wait))
+        self.wait_for(lambda: scheduler.stats()["interactive"]["running"] == 1)
+
+        self.start(lambda: scheduler.run(lambda: None))
+        self.wait_for(lambda: scheduler.stats()["interactive"]["queued"] == 1)
+
+        with self.assertRaises(queue.Full):
+            scheduler.run(lambda: None)
+
+        stats = scheduler.stats()["interactive"]
+        self.assertEqual(1, stats["rejected"])
+        self.assertEqual(1, stats["max_queued"])
+
+    # Asserts invalid limits raise.
+    def test_scheduler_raises_on_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            Scheduler(max_concurrency=0)
+
+        with self.assertRaises(ValueError):
+            Scheduler(max_queue_size=0)
+
+    # Asserts the service schedules its requests in the lane of each operation.
+    def test_db_service_schedules_requests_by_priority(self):
+        db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", partition_key_path="/user", max_concurrency=2)
+        db_service = DbService(db_options)
+        db_service.container = InMemoryContainer(partition_key_path="/user")
+
+        with self.assertLogs(level="INFO"):
+            db_service.upsert_many([{ "id": "user::{0}".format(i), "user": "user" } for i in range(3)])
+            db_service.get("user::1", "user")
+            db_service.get("user::2", "user", priority=Priority.BULK)
+
+        stats = db_service.scheduler.stats()
+        self.assertEqual(1, stats["interactive"]["wait"]["count"])
+        self.assertEqual(2, stats["bulk"]["wait"]["count"])
+        self.assertEqual(0, stats["bulk"]["running"])
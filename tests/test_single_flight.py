@@ -0,0 +1,186 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from src.db_service.AsyncDbService import AsyncDbService
+from src.db_service.DbService import DbService, DbOptions
+from src.db_service.Query import Query
+from src.db_service.SingleFlight import AsyncSingleFlight, SingleFlight
+from tests.mocks.InMemoryContainer import InMemoryContainer
+from unittest.mock import AsyncMock, Mock
+
+class SingleFlightTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", coalesce_reads=True)
+
+    def tearDown(self) -> None:
+        self.db_options = None
+
+    def run_concurrently(self, target, count: int) -> list:
+        results = [None] * count
+
+        def run(i: int) -> None:
+            try:
+                results[i] = target()
+
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join(5)
+
+        return results
+
+    def wait_for(self, predicate) -> None:
+        deadline = time.monotonic() + 5
+        while not predicate():
+            if time.monotonic() > deadline:
+                self.fail("Timed out waiting for the callers.")
+
+            time.sleep(0.001)
+
+    # Asserts concurrent calls with the same key share one call and its result.
+    def test_single_flight_coalesces_concurrent_calls(self):
+        single_flight = SingleFlight()
+        operation = Mock(return_value="result")
+
+        def run() -> str:
+            self.wait_for(lambda: single_flight.coalesced == 4)
+            return operation()
+
+        results = self.run_concurrently(lambda: single_flight.do(("key",), run), 5)
+
+        self.assertEqual(["result"] * 5, results)
+        operation.assert_called_once()
+        self.assertEqual({ "executed": 1, "coalesced": 4 }, single_flight.stats())
+
+    # Asserts the error of a call is raised to every call coalesced into it and the key is freed afterwards.
+    def test_single_flight_shares_errors(self):
+        single_flight = SingleFlight()
+
+        def run() -> str:
+            self.wait_for(lambda: single_flight.coalesced == 2)
+            raise KeyError("missing")
+
+        results = self.run_concurrently(lambda: single_flight.do(("key",), run), 3)
+
+        self.assertTrue(all(isinstance(r, KeyError) for r in results))
+        self.assertEqual("again", single_flight.do(("key",), lambda: "again"))
+        self.assertEqual(2, single_flight.executed)
+
+    # Asserts concurrent identical gets make one request and each caller gets the item.
+    def test_get_coalesces_concurrent_reads(self):
+        db_service = DbService(self.db_options)
+        db_service.container = InMemoryContainer(partition_key_path="/user", latency=0.05)
+        db_service.container.seed([{ "id": "user::1", "user": "user" }])
+
+        with self.assertLogs(level="INFO"):
+            results = self.run_concurrently(lambda: db_service.get("user::1", "user"), 8)
+
+        self.assertEqual(["user::1"] * 8, [json.loads(r)["id"] for r in results])
+        self.assertLess(db_service.container.request_count, 8)
+        self.assertEqual(8, db_service.single_flight.executed + db_service.single_flight.coalesced)
+
+    # Asserts concurrent identical queries make one request, while different queries do not share.
+    def test_query_coalesces_concurrent_identical_queries(self):
+        db_service = DbService(self.db_options)
+        db_service.container = Mock()
+        released = threading.Event()
+
+        def query_items(query, **kwargs):
+            released.wait(5)
+            return [{ "id": "user::1", "query": query }]
+
+        db_service.container.query_items.side_effect = query_items
+
+        def query(query_str: str) -> str:
+            return db_service.query(Query(query_str))
+
+        with self.assertLogs(level="INFO"):
+            threads = [threading.Thread(target=query, args=(q,)) for q in ["SELECT * FROM c"] * 4 + ["SELECT * FROM u"]]
+            for thread in threads:
+                thread.start()
+
+            self.wait_for(lambda: db_service.single_flight.coalesced == 3)
+            released.set()
+
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(2, db_service.container.query_items.call_count)
+        self.assertEqual(2, db_service.single_flight.executed)
+
+    # Asserts reads are not coalesced unless it is enabled.
+    def test_single_flight_disabled_by_default(self):
+        db_service = DbService(DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id"))
+
+        self.assertIsNone(db_service.single_flight)
+
+
+class AsyncSingleFlightTests(unittest.IsolatedAsyncioTestCase):
+
+    # Asserts concurrent identical async gets make one request and each caller gets the item.
+    async def test_async_get_coalesces_concurrent_reads(self):
+        db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", coalesce_reads=True)
+        db_service = AsyncDbService(db_options)
+        db_service.container = Mock()
+
+        async def read_item(item, partition_key):
+            await asyncio.sleep(0.01)
+            return { "id": item }
+
+        db_service.container.read_item = AsyncMock(side_effect=read_item)
+
+        with self.assertLogs(level="INFO"):
+            results = await asyncio.gather(*[db_service.get("user::1", "user") for _ in range(5)], db_service.get("user::2", "user"))
+
+        self.assertEqual(["user::1"] * 5 + ["user::2"], [json.loads(r)["id"] for r in results])
+        self.assertEqual(2, db_service.container.read_item.await_count)
+        self.assertEqual({ "executed": 2, "coalesced": 4 }, db_service.single_flight.stats())
+
+    # Asserts the error of an async call is raised to every call coalesced into it.
+    async def test_async_single_flight_shares_errors(self):
+        single_flight = AsyncSingleFlight()
+
+        async def run():
+            await asyncio.sleep(0.01)
+            raise KeyError("missing")
+
+        results = await asyncio.gather(*[single_flight.do(("key",), run) for _ in range(3)], return_exceptions=True)
+
+        self.assertTrue(all(isinstance(r, KeyError) for r in results))
+        self.assertEqual(1, single_flight.executed)
+
+    # Asserts cancelling the caller that started an async call does not cancel it for the calls coalesced into it.
+    async def test_async_single_flight_survives_first_caller_cancelled(self):
+        single_flight = AsyncSingleFlight()
+        release = asyncio.Event()
+        runs = list()
+
+        async def run():
+            runs.append(1)
+            await release.wait()
+            return "item"
+
+        first = asyncio.ensure_future(single_flight.do(("key",), run))
+        await asyncio.sleep(0)
+        others = [asyncio.ensure_future(single_flight.do(("key",), run)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(["item", "item"], await asyncio.gather(*others))
+        self.assertTrue(first.cancelled())
+        self.assertEqual(1, len(runs))
+        self.assertEqual({ "executed": 1, "coalesced": 2 }, single_flight.stats())
+        self.assertEqual("item", await single_flight.do(("key",), run))
+        self.assertEqual(2, len(runs))
@@ -0,0 +1,152 @@
+import json
+import unittest
+
+from src.db_service.DbService import DbService, DbOptions, CosmosHttpResponseError
+from src.db_service.Throttling import RateLimiter
+from tests.mocks.InMemoryContainer import InMemoryContainer
+from unittest.mock import Mock, patch
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        self.slept += seconds
+
+class ThrottlingTests(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id")
+        self.clock = FakeClock()
+
+    def tearDown(self) -> None:
+        self.db_options = None
+        self.clock = None
+
+    def throttled(self, retry_after_ms: str="100") -> CosmosHttpResponseError:
+        error = CosmosHttpResponseError(status_code=429, message="throttled")
+        error.headers = { "x-ms-retry-after-ms": retry_after_ms }
+        return error
+
+    # Asserts requests wait until the bucket has paid off the charges spent.
+    def test_rate_limiter_paces_request_units(self):
+        limiter = RateLimiter(100, clock=self.clock, sleep=self.clock.sleep)
+
+        limiter.acquire()
+        limiter.consume(300)
+        limiter.acquire()
+
+        self.assertAlmostEqual(2.0, self.clock.slept, places=3)
+
+    # Asserts a 429 pauses callers for the retry-after, halves the rate and the rate recovers over time.
+    def test_rate_limiter_backs_off_on_throttling(self):
+        limiter = RateLimiter(100, clock=self.clock, sleep=self.clock.sleep, recovery_seconds=10.0)
+
+        limiter.on_throttled(0.5)
+        limiter.acquire()
+
+        self.assertGreaterEqual(self.clock.slept, 0.5)
+        self.assertLess(limiter.rate, 100)
+        self.assertEqual(1, limiter.throttled_count)
+
+        self.clock.sleep(10.0)
+        limiter.consume(0)
+
+        self.assertEqual(100, limiter.rate)
+
+    # Asserts the rate limiter requires a positive rate.
+    def test_rate_limiter_raises_on_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+
+    # Asserts a throttled get is retried after the retry-after.
+    @patch("src.db_service.Throttling.time.sleep")
+    def test_get_retries_throttled_request(self, mock_sleep):
+        db_service = DbService(self.db_options)
+        db_service.container = Mock()
+        db_service.container.read_item.side_effect = [self.throttled("250"), { "id": "user::1" }]
+
+        with self.assertLogs(level="WARNING"):
+            result = db_service.get("user::1", "user")
+
+        self.assertEqual({ "id": "user::1" }, json.loads(result))
+        mock_sleep.assert_called_once_with(0.25)
+
+    # Asserts a get still throttled after every retry raises instead of reporting the item missing.
+    @patch("src.db_service.Throttling.time.sleep")
+    def test_get_raises_when_still_throttled(self, mock_sleep):
+        db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", throttle_max_retries=1)
+        db_service = DbService(db_options)
+        db_service.container = Mock()
+        db_service.container.read_item.side_effect = self.throttled()
+
+        with self.assertLogs(level="WARNING"):
+            with self.assertRaises(CosmosHttpResponseError):
+                db_service.get("user::1", "user")
+
+        self.assertEqual(2, db_service.container.read_item.call_count)
+
+    # Asserts the service paces its requests to the request units per second and backs off on 429s.
+    def test_db_service_paces_requests_with_rate_limiter(self):
+        db_options = DbOptions("test_endpoint", "test_key", "test_db_id", "test_container_id", ru_per_second=10)
+        db_service = DbService(db_options)
+        db_service.rate_limiter = RateLimiter(10, clock=self.clock, sleep=self.clock.sleep)
+        db_service.container = InMemoryContainer(partition_key_path="/user", throttle_rate=0.2, retry_after_ms=50, seed=3)
+
+        with self.assertLogs(level="INFO"):
+            for i in range(20):
+                db_service.upsert({ "id": "user::{0}".format(i), "user": "user" })
+
+        # 20 upserts of 5 RU each at 10 RU/s, less the first second's burst.
+        self.assertGreaterEqual(self.clock.slept, 9.0)
+        self.assertGreater(db_service.rate_limiter.throttled_count, 0)
+        self.assertEqual(20, len(db_service.container))
+
+    # Asserts responses the SDK retried after 429s back the rate limiter off, and unthrottled responses do not.
+    def test_db_service_backs_off_on_sdk_throttle_retries(self):
+        db_service = DbService(self.db_options)
+        db_service.rate_limiter = RateLimiter(100, clock=self.clock, sleep=self.clock.sleep)
+        db_service.container = Mock()
+        responses = [{ "x-ms-request-charge": "1" },
+                     { "x-ms-request-charge": "1", "x-ms-throttle-retry-count": "2", "x-ms-throttle-retry-wait-time-ms": "300" }]
+
+        def read_item(item, partition_key, response_hook=None, **kwargs) -> dict:
+            response_hook(responses.pop(0), None)
+            return { "id": item, "user": partition_key }
+
+        db_service.container.read_item.side_effect = read_item
+
+        with self.assertLogs(level="INFO"):
+            db_service.get("user::1", "user")
+            self.assertEqual((100, 0), (db_service.rate_limiter.rate, db_service.rate_limiter.throttled_count))
+
+            db_service.get("user::2", "user")
+
+        self.assertEqual(50, db_service.rate_limiter.rate)
+        self.assertEqual(1, db_service.rate_limiter.throttled_count)
+
+        db_service.rate_limiter.acquire()
+        self.assertAlmostEqual(0.3, self.clock.slept, places=3)
+
+    # Asserts the request units of batched point reads and of their query fallback are charged to the rate limiter.
+    def test_get_many_charges_rate_limiter(self):
+        db_service = DbService(self.db_options)
+        db_service.rate_limiter = Mock(wraps=RateLimiter(1000, clock=self.clock, sleep=self.clock.sleep))
+        db_service.container = InMemoryContainer(partition_key_path="/user")
+        db_service.container.seed([{ "id": "user::{0}".format(i), "user": "user" } for i in range(3)])
+        keys = [("user::{0}".format(i), "user") for i in range(3)]
+
+        with self.assertLogs(level="INFO"):
+            db_service.get_many(keys)
+            self.assertEqual(1, db_service.rate_limiter.consume.call_count)
+
+            db_service.get_many(keys, fields=["user"])
+            self.assertEqual(2, db_service.rate_limiter.consume.call_count)
+
+        self.assertTrue(all(c.args[0] > 0 for c in db_service.rate_limiter.consume.call_args_list))